@@ -0,0 +1,376 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmarks dos caminhos quentes do jogo, com baselines em JSON.
+
+Casos, para o banco distribuído e para bancos sintéticos (--tamanhos):
+
+- normalizar: a original (NFKD), a de tabela (translate), a com LRU e o lote
+- carregar: JSON (Banco.de_json) e binário (carregar_banco, mmap), como
+  no terminal e na thread de carga do Tk
+- sortear: filtrar_nivel + sortear_palavra sobre (tema, nível) aleatórios
+- revelar: Partida + tentar_letra até o fim da rodada (o laço de
+  jogar_partida), com os campos pré-calculados e sem eles (esquema 1)
+- gera_banco: o build completo (banco distribuído) ou a ingestão do
+  corpus (sintéticos), mais o empacotamento do binário
+
+Os bancos sintéticos saem de um corpus CSV determinístico (--semente)
+passado pelo próprio gera_banco.ingerir, numa pasta temporária; o banco
+distribuído é copiado para lá com o binário regravado, então os casos de
+carga nunca caem no JSON por um .bin velho.
+
+Cada caso é aquecido uma vez e medido --repeticoes vezes, cada medida
+longa o bastante para sair do ruído do relógio (timeit.autorange) e colada
+a uma medida de uma carga fixa de referência (Python puro). Ficam a
+mediana do tempo ("us", microssegundos por operação) e a mediana das
+razões tempo/referência de cada par ("rel"). `comparar` usa "rel" por
+padrão, para a velocidade da máquina no momento (CPU dividida, frequência)
+não aparecer como regressão; --absoluto compara os tempos crus.
+
+`normalizar.lru` é medido com o cache cheio da amostra e
+`normalizar.lru_frio` com o cache vazio a cada chamada, para não depender
+do que rodou antes.
+
+    python bench_forca.py rodar --saida bench/atual.json
+    python bench_forca.py rodar --tamanhos 10000,100000,1000000 --saida bench/atual.json
+    python bench_forca.py comparar bench/baseline.json bench/atual.json --limite 20
+
+`comparar` sai com erro se algum caso ficar mais lento que a baseline
+além de --limite %, ou se um caso da baseline não aparecer na execução
+atual. Com --tolerar-ruido a tolerância de cada caso passa a ser o maior
+entre --limite e o ruído medido nas duas execuções (intervalo
+interquartil das razões); sem ele o ruído só é mostrado.
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import timeit
+from pathlib import Path
+
+from forca_banco import Banco, BancoBinario, caminho_binario, empacotar_binario
+from forca_motor import Partida
+from forca_normalizacao import _normalizar, normalizar, normalizar_lote, normalizar_nfkd
+from forca_prototipo import carregar_banco, filtrar_nivel, sortear_palavra
+from forca_sorteio import Sorteador
+
+RAIZ = Path(__file__).resolve().parent
+BANCO_ARQUIVO = RAIZ / "banco_palavras.json"
+PASTA_BENCH = RAIZ / "bench"
+ARQ_BASELINE = PASTA_BENCH / "baseline.json"
+TAMANHOS = (10_000, 100_000)
+LIMITE = 20.0  # % de piora tolerada em `comparar`
+REPETICOES = 7
+CHAMADAS_REFERENCIA = 25  # ~10-20 ms de carga de referência por medida
+MEDIDA_MIN = 0.2  # segundos por medida com `preparar` (como timeit.autorange)
+MEDIDA_LONGA = 1.0  # segundos por chamada a partir dos quais bastam 3 medidas
+AMOSTRA = 20_000  # palavras/sorteios/rodadas por medida
+LETRAS_FREQ = "AEOSRINDMUTCLPVGHQBFZJXKWY"
+CONSOANTES = "bcdfglmnprstvz"
+VOGAIS = {"a": "aáãâ", "e": "eéê", "i": "ií", "o": "oóõô", "u": "uú"}
+SILABAS = [c + v for c in CONSOANTES for v in VOGAIS]
+N_TEMAS = 20
+
+
+def carga_referencia():
+    """Trabalho fixo em Python puro (laços, dict, str): mede a máquina, não o jogo."""
+    d = {}
+    for i in range(2_000):
+        d[str(i)] = i * i
+    return sum(len(k) for k in d) + sum(d.values())
+
+
+_REFERENCIA = timeit.Timer(carga_referencia)
+
+
+def _referencia():
+    """Segundos por chamada da carga de referência, medidos agora."""
+    return _REFERENCIA.timeit(CHAMADAS_REFERENCIA) / CHAMADAS_REFERENCIA
+
+
+def medir(f, ops, repeticoes, preparar=None):
+    """Mede `f` (que faz `ops` operações): {"us": µs/op, "rel": relativo}.
+
+    Cada uma das `repeticoes` medidas vem colada a uma da carga de
+    referência; "us" é a mediana dos tempos e "rel" a mediana das razões
+    tempo/referência de cada par, que desconta a velocidade da máquina
+    naquele momento. Com `preparar`, cada chamada de `f` vem logo depois de
+    preparar() (estado conhecido, ex.: cache vazio), que fica fora do tempo.
+    """
+    if preparar is not None:
+        def medida():
+            gasto = chamadas = 0
+            while gasto < MEDIDA_MIN:  # só f() entra na conta
+                preparar()
+                t = time.perf_counter()
+                f()
+                gasto += time.perf_counter() - t
+                chamadas += 1
+            return gasto / chamadas
+        preparar()
+        f()  # aquecimento
+    else:
+        timer = timeit.Timer(f)
+        number, gasto = timer.autorange()  # também serve de aquecimento
+        if gasto / number >= MEDIDA_LONGA:
+            repeticoes = min(repeticoes, 3)  # ex.: JSON de 1M palavras; o ruído já é pequeno
+
+        def medida():
+            return timer.timeit(number) / number
+    tempos, razoes = [], []
+    for _ in range(repeticoes):
+        ref = _referencia()
+        t = medida() / ops
+        tempos.append(t)
+        razoes.append(t / ref)
+    rel = statistics.median(razoes)
+    q1, _, q3 = statistics.quantiles(razoes, n=4) if len(razoes) > 1 else (rel, rel, rel)
+    return {"us": statistics.median(tempos) * 1e6, "rel": rel, "ruido": round((q3 - q1) / rel * 100, 1)}
+
+
+# ===== bancos sintéticos =====
+
+def corpus_sintetico(n, caminho, semente=0):
+    """CSV tema,palavra com n palavras distintas (sílabas = dígitos do índice)."""
+    rng = random.Random(semente)
+    base = len(SILABAS)
+    with open(caminho, "w", encoding="utf-8", newline="") as f:
+        f.write("tema,palavra\n")
+        for i in range(n):
+            silabas, k = [], i
+            while k or len(silabas) < 3:
+                k, d = divmod(k, base)
+                silabas.append(SILABAS[d])
+            # acento numa sílaba (não muda a forma normalizada) e, às vezes, um composto
+            j = rng.randrange(len(silabas))
+            silabas[j] = silabas[j][0] + rng.choice(VOGAIS[silabas[j][1]])
+            palavra = "".join(silabas)
+            if i % 50 == 0:
+                palavra = palavra[:4] + "-de-" + palavra[4:]
+            f.write(f"tema{i % N_TEMAS:02d},{palavra}\n")
+
+
+def preparar_sintetico(n, pasta, semente, repeticoes):
+    """Gera o banco de n palavras pelo gera_banco; devolve (caminho do JSON, tempos)."""
+    import gera_banco
+    corpus = pasta / f"corpus_{n}.csv"
+    saida = pasta / f"banco_{n}.json"
+    corpus_sintetico(n, corpus, semente)
+    gravadas = gera_banco.ingerir(corpus, saida)["gravadas"]
+    tempos = {"gera_banco.ingerir": medir(lambda: gera_banco.ingerir(corpus, saida), gravadas, repeticoes)}
+    dados = json.loads(saida.read_text(encoding="utf-8"))
+    tempos["gera_banco.binario"] = medir(lambda: empacotar_binario(dados), len(dados["palavras"]), repeticoes)
+    gravar_binario(saida, dados)
+    return saida, tempos
+
+
+def gravar_binario(caminho_json, dados=None):
+    """Regrava o .bin ao lado do JSON (mais novo que ele, como o gera_banco deixa)."""
+    if dados is None:
+        dados = json.loads(Path(caminho_json).read_text(encoding="utf-8"))
+    caminho_binario(caminho_json).write_bytes(empacotar_binario(dados))
+
+
+def copiar_distribuido(pasta):
+    """Cópia do banco distribuído na pasta temporária, com o binário regravado."""
+    destino = pasta / "banco_distribuido.json"
+    shutil.copyfile(BANCO_ARQUIVO, destino)
+    gravar_binario(destino)
+    return destino
+
+
+def build_distribuido(pasta, repeticoes):
+    """gera_banco completo (sem cache) numa pasta de trabalho; µs por palavra."""
+    import gera_banco
+
+    def build():
+        with contextlib.redirect_stdout(io.StringIO()):
+            gera_banco.main(["--completo"])
+    cwd = os.getcwd()
+    os.chdir(pasta)
+    try:
+        return medir(build, 200, repeticoes)
+    finally:
+        os.chdir(cwd)
+
+
+# ===== casos =====
+
+def casos_banco(caminho_json, repeticoes, semente=0):
+    """Tempos (µs/op) dos caminhos do jogo sobre um banco já gerado."""
+    r = {}
+    rng = random.Random(semente)
+    dados = json.loads(Path(caminho_json).read_text(encoding="utf-8"))
+    palavras = [it["palavra_exibida"] for it in dados["palavras"]]
+    amostra = palavras if len(palavras) <= AMOSTRA else rng.sample(palavras, AMOSTRA)
+    n = len(amostra)
+
+    r["normalizar.original"] = medir(lambda: [normalizar_nfkd(p) for p in amostra], n, repeticoes)
+    r["normalizar.tabela"] = medir(lambda: [_normalizar(p) for p in amostra], n, repeticoes)
+    # LRU em estado conhecido: cheio com a amostra (acertos) e vazio (faltas)
+    normalizar.cache_clear()
+    for p in amostra:
+        normalizar(p)
+    r["normalizar.lru"] = medir(lambda: [normalizar(p) for p in amostra], n, repeticoes)
+    r["normalizar.lru_frio"] = medir(lambda: [normalizar(p) for p in amostra], n, repeticoes,
+                                     preparar=normalizar.cache_clear)
+    r["normalizar.lote"] = medir(lambda: normalizar_lote(amostra), n, repeticoes)
+
+    r["carregar.json"] = medir(lambda: Banco.de_json(caminho_json), 1, repeticoes)
+    r["carregar.binario"] = medir(lambda: carregar_banco(caminho_json), 1, repeticoes)
+
+    banco = carregar_banco(caminho_json)
+    if not isinstance(banco, BancoBinario):
+        print(f"[ERRO] {caminho_binario(caminho_json)} ausente ou mais velho que o JSON; "
+              "carregar.binario mediria o JSON.")
+        sys.exit(1)
+    filtros = [(rng.choice(banco.temas), rng.choice(("A", "B", "C", "TODOS"))) for _ in range(AMOSTRA)]
+    filtros = [(t, nv) for t, nv in filtros if filtrar_nivel(banco, t, nv)]
+
+    def sortear():
+        s = Sorteador(banco, semente)
+        for t, nv in filtros:
+            sortear_palavra(banco, s, t, nv)
+    r["sortear"] = medir(sortear, len(filtros), repeticoes)
+
+    itens = [banco.item(rng.randrange(len(banco))) for _ in range(min(AMOSTRA, len(banco)))]
+    antigos = [{k: v for k, v in it.items() if k not in ("letras", "mascaras", "modelo")} for it in itens]
+
+    def revelar(lista):
+        for it in lista:
+            p = Partida(it, max_erros=len(LETRAS_FREQ))
+            for letra in LETRAS_FREQ:
+                p.tentar_letra(letra)
+                if p.terminada:
+                    break
+    r["revelar"] = medir(lambda: revelar(itens), len(itens), repeticoes)
+    r["revelar.esquema1"] = medir(lambda: revelar(antigos), len(antigos), repeticoes)
+    return r
+
+
+def rodar(tamanhos, repeticoes, semente):
+    resultados = {}
+    with tempfile.TemporaryDirectory(prefix="bench_forca_") as tmp:
+        tmp = Path(tmp)
+        print(f"== distribuído ({BANCO_ARQUIVO.name})")
+        r = casos_banco(copiar_distribuido(tmp), repeticoes, semente)
+        r["gera_banco.completo"] = build_distribuido(tmp, repeticoes)
+        resultados["distribuido"] = r
+        mostrar(r)
+        for n in tamanhos:
+            print(f"== sintético {n}")
+            caminho, r = preparar_sintetico(n, tmp, semente, repeticoes)
+            r.update(casos_banco(caminho, repeticoes, semente))
+            resultados[str(n)] = r
+            mostrar(r)
+    return {
+        "criado": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "maquina": {"python": platform.python_version(), "plataforma": platform.platform(),
+                    "cpus": os.cpu_count()},
+        "repeticoes": repeticoes,
+        "semente": semente,
+        "resultados": resultados,
+    }
+
+
+def mostrar(r):
+    for caso, m in r.items():
+        print(f"  {caso:<22} {m['us']:12.3f} µs/op  ({m['rel']:.4g} x referência)")
+
+
+# ===== comparação =====
+
+def comparar(base, atual, limite=LIMITE, absoluto=False, tolerar_ruido=False):
+    """Lista de (banco, caso, base µs, atual µs, variação %, tolerância %, ruído %) e quantas falhas.
+
+    A variação é a da razão com a carga de referência ("rel"); com
+    `absoluto`, a dos tempos crus. A tolerância é `limite`; com
+    `tolerar_ruido`, o maior entre ele e o ruído das duas execuções (soma
+    dos intervalos interquartis). Falha o caso que piora além da tolerância
+    e o da baseline que falta na execução atual (atual µs e variação None).
+    """
+    campo = "us" if absoluto else "rel"
+    linhas, falhas = [], 0
+    for banco, casos in base["resultados"].items():
+        for caso, antes in casos.items():
+            if not isinstance(antes, dict):
+                continue  # arquivo de um formato antigo
+            m = atual["resultados"].get(banco, {}).get(caso)
+            if not isinstance(m, dict):
+                falhas += 1
+                linhas.append((banco, caso, antes["us"], None, None, limite, None))
+                continue
+            ruido = antes.get("ruido", 0) + m.get("ruido", 0)
+            var = (m[campo] / antes[campo] - 1) * 100
+            tolerancia = max(limite, ruido) if tolerar_ruido else limite
+            falhas += var > tolerancia
+            linhas.append((banco, caso, antes["us"], m["us"], var, tolerancia, ruido))
+    return linhas, falhas
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Benchmarks dos caminhos quentes do jogo da forca.")
+    sub = ap.add_subparsers(dest="comando", required=True)
+    p = sub.add_parser("rodar", help="mede e grava o JSON de resultados")
+    p.add_argument("--tamanhos", default=",".join(map(str, TAMANHOS)),
+                   help="bancos sintéticos, separados por vírgula (ex.: 10000,100000,1000000; vazio = nenhum)")
+    p.add_argument("--repeticoes", type=int, default=REPETICOES, help="medidas por caso (vale a mediana)")
+    p.add_argument("--semente", type=int, default=0)
+    p.add_argument("--saida", default=str(PASTA_BENCH / "atual.json"))
+    p.add_argument("--baseline", action="store_true", help=f"grava também em {ARQ_BASELINE.relative_to(RAIZ)}")
+    c = sub.add_parser("comparar", help="compara resultados com a baseline")
+    c.add_argument("base", nargs="?", default=str(ARQ_BASELINE))
+    c.add_argument("atual", nargs="?", default=str(PASTA_BENCH / "atual.json"))
+    c.add_argument("--limite", type=float, default=LIMITE, help="piora tolerada, em %% (padrão: %(default)s)")
+    c.add_argument("--absoluto", action="store_true", help="não desconta a carga de referência")
+    c.add_argument("--tolerar-ruido", action="store_true",
+                   help="aceita piora dentro do ruído medido, quando ele passa de --limite")
+    args = ap.parse_args(argv)
+
+    if args.comando == "rodar":
+        try:
+            tamanhos = [int(t) for t in args.tamanhos.split(",") if t.strip()]
+        except ValueError:
+            print(f"[ERRO] --tamanhos inválido: {args.tamanhos}")
+            sys.exit(1)
+        res = rodar(tamanhos, args.repeticoes, args.semente)
+        texto = json.dumps(res, ensure_ascii=False, indent=2)
+        for destino in [Path(args.saida)] + ([ARQ_BASELINE] if args.baseline else []):
+            destino.parent.mkdir(parents=True, exist_ok=True)
+            destino.write_text(texto, encoding="utf-8")
+            print(f"Resultados salvos em: {destino.resolve()}")
+        return
+
+    try:
+        base = json.loads(Path(args.base).read_text(encoding="utf-8"))
+        atual = json.loads(Path(args.atual).read_text(encoding="utf-8"))
+    except (OSError, ValueError) as e:
+        print(f"[ERRO] {e}")
+        sys.exit(1)
+    linhas, falhas = comparar(base, atual, args.limite, args.absoluto, args.tolerar_ruido)
+    if not args.absoluto:
+        print("Variação da razão com a carga de referência (--absoluto para os tempos crus).")
+    print(f"{'banco':<12} {'caso':<22} {'base':>12} {'atual':>12} {'variação':>9} {'tolerância':>10} {'ruído':>7}")
+    for banco, caso, antes, us, var, tolerancia, ruido in linhas:
+        if us is None:
+            print(f"{banco:<12} {caso:<22} {antes:12.3f} {'-':>12} {'-':>9} {tolerancia:9.1f}% {'-':>7}  <-- FALTOU")
+            continue
+        marca = "  <-- PIOROU" if var > tolerancia else ""
+        print(f"{banco:<12} {caso:<22} {antes:12.3f} {us:12.3f} {var:+8.1f}% {tolerancia:9.1f}% {ruido:6.1f}%{marca}")
+    if not linhas:
+        print("[AVISO] A baseline não tem casos.")
+    if falhas:
+        print(f"[ERRO] {falhas} caso(s) mais lento(s) que a baseline além da tolerância ou ausente(s) da execução atual.")
+        sys.exit(1)
+    print(f"OK: nenhum caso piorou além de {args.limite:g}%" + (" (ou do ruído medido)." if args.tolerar_ruido else "."))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+"""
+Mede o ganho de velocidade de forca_normalizacao sobre a normalização
+original (NFKD).
+
+    python bench_normalizacao.py
+
+A paridade com a original (todo o Unicode, marcas combinantes, ligaduras,
+palavras do banco, lote e LRU) fica nos testes:
+
+    python -m pytest tests/test_normalizacao.py
+"""
+import argparse
+import json
+import timeit
+from pathlib import Path
+
+from forca_normalizacao import normalizar, normalizar_lote, normalizar_nfkd, _normalizar
+
+BANCO_ARQUIVO = "banco_palavras.json"
+
+
+def palavras_do_banco():
+    p = Path(BANCO_ARQUIVO)
+    if not p.exists():
+        return ["CÃO", "CARRINHO-DE-MÃO", "GIZ DE CERA", "MAÇÃ", "PÊSSEGO"]
+    return [it["palavra_exibida"] for it in json.loads(p.read_text(encoding="utf-8"))["palavras"]]
+
+
+def benchmark(repeticoes=5):
+    palavras = palavras_do_banco()
+    letras = [ch for p in palavras for ch in p]
+
+    def medir(f):
+        return min(timeit.repeat(f, number=1, repeat=repeticoes))
+
+    casos = [
+        ("palavras, original", lambda: [normalizar_nfkd(p) for p in palavras]),
+        ("palavras, translate", lambda: [_normalizar(p) for p in palavras]),
+        ("palavras, LRU", lambda: [normalizar(p) for p in palavras]),
+        ("palavras, lote", lambda: normalizar_lote(palavras)),
+        ("caracteres, original", lambda: [normalizar_nfkd(c) for c in letras]),
+        ("caracteres, LRU", lambda: [normalizar(c) for c in letras]),
+    ]
+    base = {}
+    for nome, f in casos:
+        t = medir(f)
+        grupo = nome.split(",")[0]
+        base.setdefault(grupo, t)
+        print(f"{nome:<24} {t * 1e3:8.3f} ms  {base[grupo] / t:6.1f}x")
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--repeticoes", type=int, default=5, help="repetições de cada medida (vale a menor)")
+    args = ap.parse_args(argv)
+    benchmark(args.repeticoes)
+
+
+if __name__ == "__main__":
+    main()
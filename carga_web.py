@@ -0,0 +1,248 @@
+# -*- coding: utf-8 -*-
+"""
+Gerador de carga para o servidor da versão web (forca_web.py).
+
+Simula N jogadores simultâneos, cada um numa conexão keep-alive: sorteia
+tema/nível, chuta letras com tempo de pensar configurável e, em taxas
+realistas, pede dica e arrisca a palavra inteira ('!'). No fim mostra
+vazão e latência p50/p95/p99 por rota e, com --json, grava tudo para
+comparar execuções.
+
+    python carga_web.py --iniciar --jogadores 2000 --duracao 30 --json carga.json
+
+Com --iniciar o servidor sobe com --sem-eventos --sem-progresso: as
+rodadas sintéticas não podem ir para o eventos.bin/progresso.sqlite3 de
+verdade (a análise e o --nivel-por-dados do gera_banco leem esses
+arquivos). --com-registros mede o servidor gravando os dois, numa pasta
+temporária apagada no fim.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from array import array
+
+LETRAS_FREQ = "AEOSRINDMUTCLPVGHQBFZJXKWY"
+ROTAS = ("rodada", "letra", "dica", "chute")
+
+
+class Cliente:
+    """Conexão HTTP/1.1 keep-alive mínima para POST com JSON."""
+
+    def __init__(self, host, porta):
+        self.host, self.porta = host, porta
+        self.reader = self.writer = None
+
+    async def abrir(self):
+        self.reader, self.writer = await asyncio.open_connection(self.host, self.porta)
+
+    async def post(self, rota, dados):
+        corpo = json.dumps(dados).encode("utf-8")
+        self.writer.write(
+            f"POST /api/{rota} HTTP/1.1\r\nHost: {self.host}\r\n"
+            f"Content-Type: application/json\r\nContent-Length: {len(corpo)}\r\n\r\n".encode("latin-1") + corpo
+        )
+        linha = await self.reader.readline()
+        if not linha:
+            raise ConnectionError("conexão fechada pelo servidor")
+        status = int(linha.split()[1])
+        tamanho = 0
+        while True:
+            h = await self.reader.readline()
+            if h in (b"\r\n", b""):
+                break
+            if h[:15].lower() == b"content-length:":
+                tamanho = int(h[15:])
+        resposta = json.loads(await self.reader.readexactly(tamanho)) if tamanho else {}
+        return status, resposta
+
+    def fechar(self):
+        if self.writer:
+            self.writer.close()
+
+
+class Medidor:
+    def __init__(self):
+        self.latencias = {r: array("d") for r in ROTAS}
+        self.erros = {r: 0 for r in ROTAS}
+        self.rodadas = self.vitorias = 0
+
+    def relatorio(self, segundos):
+        saida = {"segundos": segundos, "rodadas": self.rodadas, "vitorias": self.vitorias, "rotas": {}}
+        total = 0
+        for rota, lat in self.latencias.items():
+            if not lat:
+                continue
+            ordenadas = sorted(lat)
+            n = len(ordenadas)
+            total += n
+
+            def pct(p):
+                return ordenadas[min(n - 1, int(p * n))] * 1e3
+
+            saida["rotas"][rota] = {
+                "requisicoes": n, "erros": self.erros[rota], "por_s": n / segundos,
+                "p50_ms": pct(0.50), "p95_ms": pct(0.95), "p99_ms": pct(0.99), "max_ms": ordenadas[-1] * 1e3,
+            }
+        saida["requisicoes"] = total
+        saida["por_s"] = total / segundos if segundos else 0
+        return saida
+
+
+async def jogador(host, porta, filtros, args, medidor, fim, rng):
+    c = Cliente(host, porta)
+    try:
+        await c.abrir()
+    except OSError:
+        medidor.erros["rodada"] += 1
+        return
+    sessao = None
+
+    async def chamar(rota, dados):
+        t0 = time.perf_counter()
+        status, r = await c.post(rota, dados)
+        medidor.latencias[rota].append(time.perf_counter() - t0)
+        if status != 200:
+            medidor.erros[rota] += 1
+        return status, r
+
+    async def pensar():
+        if args.pensar > 0:
+            await asyncio.sleep(rng.expovariate(1000 / args.pensar))
+
+    try:
+        while time.monotonic() < fim:
+            tema, nivel = rng.choice(filtros)
+            status, r = await chamar("rodada", {"tema": tema, "nivel": nivel, "sessao": sessao})
+            if status != 200:
+                sessao = None
+                continue
+            sessao, e = r["sessao"], r["estado"]
+            medidor.rodadas += 1
+            usadas = set()
+            while e["resultado"] is None and time.monotonic() < fim:
+                await pensar()
+                sorteio = rng.random()
+                if sorteio < args.prob_dica and e["dica"] is None:
+                    _, r = await chamar("dica", {"sessao": sessao})
+                elif sorteio < args.prob_dica + args.prob_chute:
+                    palpite = "".join(ch if ch != "_" else rng.choice(LETRAS_FREQ) for ch in e["reveladas"])
+                    _, r = await chamar("chute", {"sessao": sessao, "palavra": palpite})
+                else:
+                    # letras mais comuns primeiro, com um pouco de acaso
+                    livres = [l for l in LETRAS_FREQ if l not in usadas]
+                    letra = livres[min(int(rng.expovariate(0.4)), len(livres) - 1)]
+                    usadas.add(letra)
+                    _, r = await chamar("letra", {"sessao": sessao, "letra": letra})
+                e = r.get("estado", e)
+            if e["resultado"] is True:
+                medidor.vitorias += 1
+    except (ConnectionError, asyncio.IncompleteReadError, OSError):
+        pass
+    finally:
+        c.fechar()
+
+
+async def obter_filtros(host, porta):
+    """(tema, nível) com palavras no banco do servidor: filtro vazio dá 404, que contaria como erro."""
+    reader, writer = await asyncio.open_connection(host, porta)
+    writer.write(f"GET /api/temas HTTP/1.1\r\nHost: {host}\r\nConnection: close\r\n\r\n".encode("latin-1"))
+    dados = await reader.read()
+    writer.close()
+    r = json.loads(dados.split(b"\r\n\r\n", 1)[1])
+    por_tema = r.get("filtros") or {t: r["niveis"] for t in r["temas"]}  # servidor antigo: todos
+    return [(t, n) for t, niveis in por_tema.items() for n in niveis]
+
+
+async def executar(args):
+    filtros = await obter_filtros(args.host, args.porta)
+    medidor = Medidor()
+    inicio = time.monotonic()
+    fim = inicio + args.duracao
+    rng = random.Random(args.semente)
+    tarefas = []
+    for k in range(args.jogadores):
+        tarefas.append(asyncio.create_task(
+            jogador(args.host, args.porta, filtros, args, medidor, fim, random.Random(rng.random()))))
+        if args.rampa and k % 100 == 99:
+            await asyncio.sleep(args.rampa / (args.jogadores / 100))
+    await asyncio.gather(*tarefas)
+    return medidor.relatorio(time.monotonic() - inicio)
+
+
+def esperar_porta(host, porta, limite=10.0):
+    import socket
+    fim = time.monotonic() + limite
+    while time.monotonic() < fim:
+        try:
+            with socket.create_connection((host, porta), timeout=0.2):
+                return True
+        except OSError:
+            time.sleep(0.05)
+    return False
+
+
+def mostrar(res):
+    print(f"{res['rodadas']} rodadas ({res['vitorias']} vitórias), {res['requisicoes']} requisições "
+          f"em {res['segundos']:.1f}s = {res['por_s']:,.0f} req/s")
+    print(f"{'rota':<8} {'req':>9} {'req/s':>9} {'erros':>6} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+    for rota, r in res["rotas"].items():
+        print(f"{rota:<8} {r['requisicoes']:>9} {r['por_s']:>9,.0f} {r['erros']:>6} "
+              f"{r['p50_ms']:>8.2f} {r['p95_ms']:>8.2f} {r['p99_ms']:>8.2f} {r['max_ms']:>8.2f}")
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Gerador de carga para forca_web.py.")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--porta", type=int, default=8000)
+    ap.add_argument("--iniciar", action="store_true", help="sobe um forca_web.py local nessa porta")
+    ap.add_argument("--com-registros", action="store_true",
+                    help="com --iniciar, o servidor grava eventos e progresso (numa pasta temporária)")
+    ap.add_argument("--jogadores", type=int, default=1000)
+    ap.add_argument("--duracao", type=float, default=20.0, help="segundos de carga")
+    ap.add_argument("--pensar", type=float, default=300.0, help="tempo médio de pensar entre palpites (ms)")
+    ap.add_argument("--prob-dica", type=float, default=0.05, help="chance de pedir dica a cada jogada")
+    ap.add_argument("--prob-chute", type=float, default=0.03, help="chance de arriscar a palavra ('!')")
+    ap.add_argument("--rampa", type=float, default=1.0, help="segundos para conectar todos os jogadores")
+    ap.add_argument("--semente", type=int, default=0)
+    ap.add_argument("--json", help="grava o resultado neste arquivo")
+    args = ap.parse_args(argv)
+
+    servidor = pasta = None
+    if args.iniciar:
+        cmd = [sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)), "forca_web.py"),
+               "--host", args.host, "--porta", str(args.porta)]
+        if args.com_registros:
+            pasta = tempfile.TemporaryDirectory(prefix="carga_web_")
+            cmd += ["--eventos", os.path.join(pasta.name, "eventos.bin"),
+                    "--progresso", os.path.join(pasta.name, "progresso.sqlite3")]
+        else:
+            cmd += ["--sem-eventos", "--sem-progresso"]
+        servidor = subprocess.Popen(cmd, stdout=subprocess.DEVNULL)
+        if not esperar_porta(args.host, args.porta):
+            servidor.terminate()
+            print("[ERRO] O servidor não subiu a tempo.")
+            sys.exit(1)
+    try:
+        res = asyncio.run(executar(args))
+    finally:
+        if servidor:
+            servidor.terminate()
+            servidor.wait()
+        if pasta:
+            pasta.cleanup()
+
+    res["parametros"] = {k: v for k, v in vars(args).items() if k not in ("json", "iniciar")}
+    mostrar(res)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(res, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,6 @@
 // Config
-const ARQUIVO_BANCO = "banco_palavras.json";
+const ARQUIVO_MANIFESTO = "banco/manifesto.json"; // temas/niveis/contagens + nome de cada shard
+const ARQUIVO_BANCO = "banco_palavras.json";      // banco inteiro (so se nao houver manifesto)
 const MAX_ERROS = 6;
 
 const $ = (s) => document.querySelector(s);
@@ -19,14 +20,31 @@ const teclado = $("#teclado");
 // Estado
 let bancoPorTema = {};
 let temas = [];
-let usados = new Set(); // "tema|palavra"
+let manifesto = null;
+let carregandoTemas = new Map(); // tema -> Promise do shard
+let sacolas = new Map(); // "tema|nivel" -> {base, restantes}
 let itemAtual = null;
 let exibida = "";
 let alvo = "";
 let reveladas = [];
+let caracteres = [];     // exibida, um caractere por posicao
+let posicoes = new Map(); // letra -> mascara das posicoes em exibida
 let tentadas = new Set();
 let erros = 0;
 let dicaMostrada = false;
+// Modo servidor (forca_web.py): a palavra fica no servidor, aqui so o tabuleiro
+let modoServidor = false;
+let sessao = null;
+// Progresso e log de eventos (so no modo servidor): index.html?jogador=Nome&faixa=6-7
+const parametros = new URLSearchParams(location.search);
+const jogador = parametros.get("jogador") || null;
+const faixa = parametros.get("faixa") || null;
+// Palavra do dia (index.html?dia): mesma permutacao de forca_dia.py, com HMAC-SHA256
+const modoDia = parametros.has("dia");
+const CHAVE_DIA = parametros.get("chave") || "forca-palavra-do-dia"; // CHAVE_PADRAO de forca_dia.py
+const EPOCA_DIA = Date.UTC(2024, 0, 1);
+const RODADAS_DIA = 4;
+let chaveHmac = null;
 
 // Util
 function normalizar(txt){
@@ -36,7 +54,6 @@ function normalizar(txt){
     .toUpperCase()
     .replace(/[^A-Z]/g,"");
 }
-function keyTemaPalavra(tema, palavra){ return tema + "|" + palavra; }
 
 // Desenho
 function resetDesenho(){
@@ -67,51 +84,212 @@ function atualizarTentadas(){
 }
 function infoStatus(msg){ statusEl.textContent = msg || ""; }
 
-// Banco
+// Servidor
+async function api(rota, dados){
+  const resp = await fetch("api/" + rota, {
+    method: "POST",
+    headers: {"Content-Type": "application/json"},
+    body: JSON.stringify(dados || {}),
+  });
+  const r = await resp.json();
+  if (!resp.ok) throw new Error(r.erro || resp.statusText);
+  return r;
+}
+function aplicarEstado(e){
+  itemAtual = { dica: e.dica };
+  exibida = e.palavra || "";
+  reveladas = e.reveladas;
+  tentadas = new Set(e.tentadas);
+  erros = e.erros;
+  dicaMostrada = e.dica != null;
+  resetDesenho();
+  desenharParte(erros);
+  atualizarPalavra(false);
+  atualizarDica(false);
+  atualizarTentadas();
+}
+function preencherTemas(){
+  temaSelect.innerHTML = "";
+  for (const t of [...temas, "ALEATORIO"]){
+    const opt = document.createElement("option");
+    opt.value = t; opt.textContent = t;
+    temaSelect.appendChild(opt);
+  }
+  temaSelect.value = temas[0];
+}
+async function conectarServidor(){
+  try {
+    const resp = await fetch("api/temas");
+    if (!resp.ok) return false;
+    temas = (await resp.json()).temas;
+    return true;
+  } catch (e) {
+    return false; // sem servidor (ex.: GitHub Pages): joga com o banco estatico
+  }
+}
+
+// Banco: no boot so o manifesto; o shard de cada tema vem quando o tema e escolhido
 async function carregarBanco(){
+  modoServidor = await conectarServidor();
+  if (modoServidor){ preencherTemas(); return; }
+  try {
+    const resp = await fetch(ARQUIVO_MANIFESTO);
+    if (!resp.ok) throw new Error(resp.status);
+    manifesto = await resp.json();
+    temas = Object.keys(manifesto.temas).sort();
+  } catch (e) {
+    await carregarBancoInteiro();
+  }
+  preencherTemas();
+}
+async function carregarBancoInteiro(){
   const resp = await fetch(ARQUIVO_BANCO);
   const data = await resp.json();
-  const palavras = data.palavras || [];
   bancoPorTema = {};
-  for (const it of palavras){
+  for (const it of data.palavras || []){
     (bancoPorTema[it.tema] ||= []).push(it);
   }
   temas = Object.keys(bancoPorTema).sort();
-  temaSelect.innerHTML = "";
-  for (const t of [...temas, "ALEATORIO"]){
-    const opt = document.createElement("option");
-    opt.value = t; opt.textContent = t;
-    temaSelect.appendChild(opt);
+}
+function carregarTema(tema){
+  if (bancoPorTema[tema] || !manifesto || !manifesto.temas[tema]) return Promise.resolve();
+  if (!carregandoTemas.has(tema)){
+    const p = fetch("banco/" + manifesto.temas[tema].arquivo)
+      .then(resp => { if (!resp.ok) throw new Error("Falha ao baixar o tema " + tema); return resp.json(); })
+      .then(shard => {
+        // [palavra_exibida, nivel, indice da dica, forma, letras, mascaras, modelo]
+        bancoPorTema[tema] = shard.palavras.map(([palavra_exibida, nivel, d, forma_normalizada, letras, mascaras, modelo]) =>
+          ({ tema, palavra_exibida, nivel, dica: shard.dicas[d], forma_normalizada, letras, mascaras, modelo }));
+      })
+      .catch(e => { carregandoTemas.delete(tema); throw e; });
+    carregandoTemas.set(tema, p);
   }
-  temaSelect.value = temas[0];
+  return carregandoTemas.get(tema);
 }
 
-// Filtro e sorteio
+// Filtro e sorteio: uma sacola embaralhada por (tema, nivel), sem repeticao ate esvaziar
 function filtrar(tema, nivel){
-  let base = bancoPorTema[tema] || [];
-  if (nivel !== "TODOS"){ base = base.filter(x => (x.nivel||"A") === nivel); }
-  let elegiveis = base.filter(x => !usados.has(keyTemaPalavra(x.tema, x.palavra_exibida)));
-  if (!elegiveis.length){
-    [...usados].forEach(k => { if (k.startsWith(tema + "|")) usados.delete(k); });
-    elegiveis = base;
+  const chave = tema + "|" + nivel;
+  let sacola = sacolas.get(chave);
+  if (!sacola){
+    let base = (bancoPorTema[tema] || []).slice();
+    if (nivel !== "TODOS"){ base = base.filter(x => (x.nivel||"A") === nivel); }
+    sacola = { base, restantes: 0 };
+    sacolas.set(chave, sacola);
   }
-  return elegiveis;
+  return sacola;
+}
+function sortear(sacola){
+  const b = sacola.base;
+  if (!sacola.restantes){ sacola.restantes = b.length; } // vazia: reembaralha
+  const j = Math.floor(Math.random()*sacola.restantes);
+  const n = --sacola.restantes;
+  const escolhido = b[j]; b[j] = b[n]; b[n] = escolhido;
+  return escolhido;
 }
-function novaPalavra(auto){
-  const temaSel = (temaSelect.value === "ALEATORIO") ? temas[Math.floor(Math.random()*temas.length)] : temaSelect.value;
+// Feistel com cycle-walking sobre [0, n); igual a forca_dia._permutar
+async function permutarDia(x, n, rotulo){
+  chaveHmac ||= await crypto.subtle.importKey("raw", new TextEncoder().encode(CHAVE_DIA),
+                                               { name: "HMAC", hash: "SHA-256" }, false, ["sign"]);
+  const bits = Math.max(1, (n - 1).toString(2).length);
+  const h = (bits + 1) >> 1, base = 2 ** h;
+  for (;;){
+    let esq = Math.floor(x / base), dir = x % base;
+    for (let r = 0; r < RODADAS_DIA; r++){
+      const msg = new TextEncoder().encode(`${rotulo}|${r}|${dir}`);
+      const f = new DataView(await crypto.subtle.sign("HMAC", chaveHmac, msg)).getUint32(0) % base;
+      [esq, dir] = [dir, esq ^ f];
+    }
+    x = esq * base + dir;
+    if (x < n) return x;
+  }
+}
+function diasDesdeEpoca(){
+  const d = new Date(); // data local, como date.today()
+  return Math.round((Date.UTC(d.getFullYear(), d.getMonth(), d.getDate()) - EPOCA_DIA) / 86400000);
+}
+// Dia (desde a EPOCA) em que a palavra/tema entra no sorteio; sem data no manifesto, desde sempre
+function entradaDia(tipo, chave){
+  const d = manifesto?.dia?.[tipo]?.[chave];
+  return d ? Math.round((Date.parse(d) - EPOCA_DIA) / 86400000) : null;
+}
+// Item do dia entre itens (ordem do banco); igual a forca_dia.do_dia
+async function doDia(itens, entradas, tema, nivel){
+  const dia = diasDesdeEpoca();
+  const mudancas = [...new Set(entradas.filter(d => d !== null && d > 0))].sort((a, b) => a - b);
+  let ciclo = 0, inicio = 0;
+  for (const prox of [...mudancas, null]){
+    if (prox !== null && inicio >= prox) continue; // nenhum ciclo comeca neste trecho
+    const lista = mudancas.length ? itens.filter((x, k) => entradas[k] === null || entradas[k] <= inicio) : itens;
+    if (!lista.length){
+      if (prox === null || dia < prox) return null;
+      inicio = prox;
+      continue;
+    }
+    const n = lista.length;
+    const c = Math.floor((dia - inicio) / n), d = dia - inicio - c * n;
+    if (prox === null || inicio + c * n < prox) return lista[await permutarDia(d, n, `${tema}|${nivel}|${ciclo + c}|${n}`)];
+    const k = Math.ceil((prox - inicio) / n); // ciclos que comecam antes de prox
+    ciclo += k;
+    inicio += k * n;
+  }
+  return null;
+}
+async function novaPalavraServidor(auto){
+  try {
+    const r = await api("rodada", { tema: temaSelect.value, nivel: nivelSelect.value || "TODOS", sessao, jogador, faixa,
+                                    dia: modoDia || undefined });
+    sessao = r.sessao;
+    aplicarEstado(r.estado);
+    teclado.querySelectorAll("button").forEach(b => b.classList.remove("good", "bad"));
+    infoStatus(auto ? "" : "Nova palavra selecionada. Boa sorte!");
+    habilitarTeclado(true);
+  } catch (e) {
+    if (sessao){ sessao = null; return novaPalavraServidor(auto); } // sessao expirou
+    infoStatus(e.message);
+  }
+}
+async function novaPalavra(auto){
+  if (modoServidor) return novaPalavraServidor(auto);
+  let temaSel = temaSelect.value;
+  if (temaSel === "ALEATORIO"){
+    temaSel = modoDia ? await doDia(temas, temas.map(t => entradaDia("temas", t)), "*", "TEMAS")
+                      : temas[Math.floor(Math.random()*temas.length)];
+    if (!temaSel){ infoStatus("Sem palavras para esse filtro."); return; }
+  }
   const nivelSel = nivelSelect.value || "TODOS";
-  const candidatos = filtrar(temaSel, nivelSel);
-  if (!candidatos.length){ infoStatus("Sem palavras para esse filtro."); return; }
-
-  itemAtual = candidatos[Math.floor(Math.random()*candidatos.length)];
-  exibida = (itemAtual.palavra_exibida || "").toUpperCase();
-  alvo = normalizar(exibida);
-
-  reveladas = Array.from(exibida).map(c => /[A-Z]/i.test(normalizar(c)) ? "_" : c);
+  if (!bancoPorTema[temaSel]){
+    infoStatus("Carregando palavras do tema...");
+    try { await carregarTema(temaSel); }
+    catch (e) { infoStatus(e.message); return; }
+  }
+  if (modoDia){
+    // lista do filtro na ordem do banco (a sacola e embaralhada no lugar)
+    const lista = (bancoPorTema[temaSel] || []).filter(x => nivelSel === "TODOS" || (x.nivel||"A") === nivelSel);
+    itemAtual = await doDia(lista, lista.map(x => entradaDia("palavras", `${temaSel}|${x.palavra_exibida}`)),
+                            temaSel, nivelSel);
+    if (!itemAtual){ infoStatus("Sem palavras para esse filtro."); return; }
+  } else {
+    const sacola = filtrar(temaSel, nivelSel);
+    if (!sacola.base.length){ infoStatus("Sem palavras para esse filtro."); return; }
+    itemAtual = sortear(sacola);
+  }
+  if (revelacaoValida(itemAtual)){
+    // banco do esquema 2: letras, mascaras e modelo ja vem do gera_banco
+    exibida = itemAtual.palavra_exibida;
+    alvo = itemAtual.forma_normalizada;
+    reveladas = Array.from(itemAtual.modelo);
+    posicoes = new Map(Array.from(itemAtual.letras, (l, k) => [l, itemAtual.mascaras[k]]));
+  } else {
+    exibida = (itemAtual.palavra_exibida || "").toUpperCase();
+    alvo = normalizar(exibida);
+    reveladas = Array.from(exibida).map(c => /[A-Z]/i.test(normalizar(c)) ? "_" : c);
+    posicoes = mapearPosicoes(exibida);
+  }
+  caracteres = Array.from(exibida);
   tentadas = new Set();
   erros = 0;
   dicaMostrada = false;
-  usados.add(keyTemaPalavra(itemAtual.tema, itemAtual.palavra_exibida));
 
   resetDesenho();
   atualizarPalavra(false);
@@ -121,6 +299,35 @@ function novaPalavra(auto){
   habilitarTeclado(true);
 }
 
+// Mesma conferencia de forca_banco._revelacao_valida: campos velhos de um
+// shard editado a mao caem no calculo abaixo em vez de revelar letras erradas
+function revelacaoValida(it){
+  const { palavra_exibida: e = "", forma_normalizada: forma, letras, mascaras, modelo } = it;
+  if (!letras || !mascaras || !modelo || mascaras.length !== letras.length) return false;
+  const chars = Array.from(e), mod = Array.from(modelo);
+  if (forma !== normalizar(e) || e !== e.toUpperCase() || mod.length !== chars.length) return false;
+  const pos = new Map(Array.from(letras, (l, k) => [l, mascaras[k]]));
+  if (pos.size !== mascaras.length) return false;
+  let resto = mascaras.reduce((a, m) => a + m, 0), k = 0;
+  for (let i = 0; i < mod.length; i++){
+    if ((mod[i] === "_") !== /\p{L}/u.test(chars[i]) || (mod[i] !== "_" && mod[i] !== chars[i])) return false;
+    if (mod[i] !== "_") continue;
+    if (k >= forma.length || Math.floor((pos.get(forma[k]) || 0) / 2 ** i) % 2 !== 1) return false;
+    resto -= 2 ** i; // cada "_" na mascara da sua letra, sem sobra nem sobreposicao
+    k++;
+  }
+  return k === forma.length && resto === 0;
+}
+
+function mapearPosicoes(palavra){
+  const pos = new Map();
+  Array.from(palavra).forEach((c, i) => {
+    const l = normalizar(c);
+    if (l.length === 1) pos.set(l, (pos.get(l) || 0) + 2 ** i);
+  });
+  return pos;
+}
+
 // Teclado
 function montarTeclado(){
   teclado.innerHTML = "";
@@ -136,7 +343,23 @@ function montarTeclado(){
 function habilitarTeclado(status){
   teclado.querySelectorAll("button").forEach(b => b.disabled = !status);
 }
+async function tentarLetraServidor(ch, btn){
+  let r;
+  try { r = await api("letra", { sessao, letra: ch }); }
+  catch (e) { infoStatus(e.message); return; }
+  if (r.resultado === "repetida"){ infoStatus("Voce ja tentou essa letra."); return; }
+  if (r.resultado !== "acerto" && r.resultado !== "erro") return;
+  aplicarEstado(r.estado);
+  if (btn){ btn.classList.add(r.resultado === "acerto" ? "good" : "bad"); btn.disabled = true; }
+  infoStatus(r.resultado === "acerto" ? "Boa! Continue assim." : "Nao tem essa letra. Tente outra.");
+  fimServidor(r.estado);
+}
+function fimServidor(e){
+  if (e.resultado === true) vitoria();
+  else if (e.resultado === false) derrota();
+}
 function tentarLetra(ch, btn){
+  if (modoServidor) return tentarLetraServidor(ch, btn);
   const letra = normalizar(ch);
   if (!letra || letra.length !== 1) return;
   if (tentadas.has(letra)){ infoStatus("Voce ja tentou essa letra."); return; }
@@ -144,10 +367,11 @@ function tentarLetra(ch, btn){
   tentadas.add(letra);
   atualizarTentadas();
 
-  if (alvo.includes(letra)){
-    const chars = exibida.split("");
-    for (let i=0;i<chars.length;i++){
-      if (normalizar(chars[i]) === letra) reveladas[i] = chars[i];
+  const m = posicoes.get(letra);
+  if (m){
+    // bit i da mascara = posicao i (aritmetica, nao "&": pode passar de 32 bits)
+    for (let i = 0, r = m; r > 0; i++, r = Math.floor(r / 2)){
+      if (r % 2) reveladas[i] = caracteres[i];
     }
     if (btn){ btn.classList.add("good"); btn.disabled = true; }
     infoStatus("Boa! Continue assim.");
@@ -161,10 +385,20 @@ function tentarLetra(ch, btn){
     if (erros >= MAX_ERROS) derrota();
   }
 }
-function chutarPalavra(){
+async function chutarPalavra(){
   if (!itemAtual) return;
   const chute = prompt("Digite seu palpite para a palavra:");
   if (chute == null) return;
+  if (modoServidor){
+    let r;
+    try { r = await api("chute", { sessao, palavra: chute }); }
+    catch (e) { infoStatus(e.message); return; }
+    if (r.resultado === "terminada") return;
+    aplicarEstado(r.estado);
+    if (r.resultado !== "acerto") infoStatus("Quase! Nao foi desta vez.");
+    fimServidor(r.estado);
+    return;
+  }
   if (normalizar(chute) === alvo){ vitoria(); }
   else {
     erros++; infoStatus("Quase! Nao foi desta vez.");
@@ -172,7 +406,14 @@ function chutarPalavra(){
     if (erros >= MAX_ERROS) derrota();
   }
 }
-function mostrarDica(){ dicaMostrada = true; atualizarDica(true); }
+async function mostrarDica(){
+  if (modoServidor){
+    try { aplicarEstado((await api("dica", { sessao })).estado); }
+    catch (e) { infoStatus(e.message); }
+    return;
+  }
+  dicaMostrada = true; atualizarDica(true);
+}
 
 function vitoria(){
   habilitarTeclado(false);
@@ -189,6 +430,7 @@ function derrota(){
 
 // Eventos
 novaBtn.addEventListener("click", () => novaPalavra(false));
+temaSelect.addEventListener("change", () => { if (!modoServidor) carregarTema(temaSelect.value).catch(() => {}); }); // adianta o download
 dicaBtn.addEventListener("click", mostrarDica);
 chutarBtn.addEventListener("click", chutarPalavra);
 document.addEventListener("keydown", (e)=>{
@@ -0,0 +1,204 @@
+# -*- coding: utf-8 -*-
+"""
+Análise dos logs de eventos (forca_eventos) com NumPy, em fluxo.
+
+Os logs (um ou vários dias) são lidos em blocos de registros direto para
+um array estruturado e somados em acumuladores do tamanho do banco; a
+memória não depende do tamanho dos logs. O código de palavra de cada log
+é traduzido para o id no banco atual pela tabela de chaves (tema,
+palavra_exibida) do próprio log; eventos de palavras que saíram do banco
+contam como descartados.
+
+Por palavra, tema e nível: rodadas terminadas, taxa de vitória, erros
+médios (derrota = MAX_ERROS) e uso de dica (rodadas com dica / rodadas
+iniciadas). Por faixa etária: frequência das letras chutadas.
+
+`dificuldade` = erros médios + 0.5 * taxa de dica. O JSON de saída alimenta
+`gera_banco.py --nivel-por-dados`, que refaz os níveis pelos dados reais.
+
+    python forca_analise.py eventos.bin eventos-ontem.bin --saida analise.json
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - depende do ambiente
+    np = None
+
+from forca_eventos import CABECALHO, DICA, FAIXAS, FIM, INICIO, LETRA, REGISTRO, ler_cabecalho, ler_chaves
+
+BLOCO = 1 << 20  # registros por leitura (16 MiB)
+PESO_DICA = 0.5
+LETRAS = [chr(65 + k) for k in range(26)]
+
+
+def tipo_registro():
+    """dtype NumPy equivalente a forca_eventos.REGISTRO."""
+    return np.dtype([("rodada", "<u4"), ("palavra", "<u4"), ("tempo", "<u4"),
+                     ("tipo", "u1"), ("valor", "u1"), ("erros", "u1"), ("faixa", "u1")])
+
+
+class Acumulador:
+    """Somas por palavra e letras por faixa, alimentadas bloco a bloco."""
+
+    def __init__(self, n_palavras):
+        self.n = n_palavras
+        self.iniciadas = np.zeros(n_palavras, np.int64)
+        self.terminadas = np.zeros(n_palavras, np.int64)
+        self.vitorias = np.zeros(n_palavras, np.int64)
+        self.erros = np.zeros(n_palavras, np.int64)
+        self.dicas = np.zeros(n_palavras, np.int64)
+        self.letras = np.zeros((len(FAIXAS), 27), np.int64)
+        self.eventos = self.descartados = 0
+
+    def _contar(self, ids, pesos=None):
+        return np.bincount(ids, weights=pesos, minlength=self.n)[:self.n].astype(np.int64)
+
+    def traducao(self, ids):
+        """Array código do log -> id no banco (self.n = palavra fora do banco)."""
+        return np.array([self.n if i is None else i for i in ids] + [self.n], dtype=np.intp)
+
+    def somar(self, ev, traducao=None):
+        self.eventos += len(ev)
+        ids = ev["palavra"].astype(np.intp)
+        if traducao is not None:
+            ids = traducao[np.minimum(ids, len(traducao) - 1)]
+        validos = (ids < self.n) & (ev["faixa"] < len(FAIXAS))
+        if not validos.all():  # palavra fora do banco atual (ou banco diferente, no formato 1)
+            self.descartados += int((~validos).sum())
+            ev, ids = ev[validos], ids[validos]
+        tipo = ev["tipo"]
+        self.iniciadas += self._contar(ids[tipo == INICIO])
+        self.dicas += self._contar(ids[tipo == DICA])
+        fim = tipo == FIM
+        self.terminadas += self._contar(ids[fim])
+        self.vitorias += self._contar(ids[fim], ev["valor"][fim])
+        self.erros += self._contar(ids[fim], ev["erros"][fim])
+        letra = tipo == LETRA
+        chave = ev["faixa"][letra].astype(np.intp) * 27 + ev["valor"][letra]
+        self.letras += np.bincount(chave, minlength=self.letras.size).reshape(self.letras.shape)
+
+
+def ler_blocos(caminho, bloco=BLOCO):
+    """Gera arrays de eventos de até `bloco` registros."""
+    dt = tipo_registro()
+    assert dt.itemsize == REGISTRO.size
+    with open(caminho, "rb") as f:
+        f.seek(CABECALHO.size)
+        while True:
+            ev = np.fromfile(f, dtype=dt, count=bloco)
+            if not len(ev):
+                break
+            yield ev
+
+
+def _taxas(iniciadas, terminadas, vitorias, erros, dicas):
+    rodadas = max(int(terminadas), 1)
+    taxa_dica = float(dicas) / max(int(iniciadas), 1)
+    erros_medios = float(erros) / rodadas
+    return {
+        "rodadas": int(terminadas),
+        "vitorias": int(vitorias),
+        "taxa_vitoria": round(float(vitorias) / rodadas, 4),
+        "erros_medios": round(erros_medios, 4),
+        "taxa_dica": round(taxa_dica, 4),
+        "dificuldade": round(erros_medios + PESO_DICA * taxa_dica, 4),
+    }
+
+
+def relatorio(banco, ac):
+    itens = [banco.item(i) for i in range(len(banco))]
+    palavras = []
+    for i in np.flatnonzero(ac.iniciadas):
+        it = itens[i]
+        palavras.append({"tema": it["tema"], "palavra": it["palavra_exibida"], "nivel": it.get("nivel", "A"),
+                         **_taxas(ac.iniciadas[i], ac.terminadas[i], ac.vitorias[i], ac.erros[i], ac.dicas[i])})
+
+    def agrupar(chaves):
+        nomes = sorted(set(chaves))
+        pos = {nome: k for k, nome in enumerate(nomes)}
+        cod = np.array([pos[c] for c in chaves], dtype=np.intp)
+        somas = [np.bincount(cod, weights=a, minlength=len(nomes))
+                 for a in (ac.iniciadas, ac.terminadas, ac.vitorias, ac.erros, ac.dicas)]
+        return {nome: _taxas(*(s[k] for s in somas)) for k, nome in enumerate(nomes) if somas[0][k]}
+
+    letras = {}
+    for f, faixa in enumerate(FAIXAS):
+        total = int(ac.letras[f, 1:].sum())
+        if total:
+            letras[faixa] = {"chutes": total,
+                             "frequencia": {l: round(int(ac.letras[f, k + 1]) / total, 4)
+                                            for k, l in enumerate(LETRAS) if ac.letras[f, k + 1]}}
+    return {
+        "banco": banco.versao,
+        "eventos": ac.eventos,
+        "descartados": ac.descartados,
+        "palavras": palavras,
+        "temas": agrupar([it["tema"] for it in itens]),
+        "niveis": agrupar([it.get("nivel", "A") for it in itens]),
+        "letras_por_faixa": letras,
+    }
+
+
+def analisar(banco, logs, bloco=BLOCO):
+    from forca_banco import mapa_chaves
+    ac = Acumulador(len(banco))
+    ids = mapa_chaves(banco)
+    for caminho in logs:
+        chaves = ler_chaves(caminho)
+        traducao = None if chaves is None else ac.traducao([ids.get(c) for c in chaves])
+        for ev in ler_blocos(caminho, bloco):
+            ac.somar(ev, traducao)
+    return relatorio(banco, ac)
+
+
+def mostrar(res, top=10):
+    print(f"{res['eventos']} eventos, {len(res['palavras'])} palavras jogadas "
+          f"({res['descartados']} eventos descartados)")
+    for titulo, grupo in (("Tema", res["temas"]), ("Nível", res["niveis"])):
+        print(f"\n{titulo:<16} {'rodadas':>8} {'vitória':>8} {'erros':>6} {'dica':>6}")
+        for nome, r in grupo.items():
+            print(f"{nome:<16} {r['rodadas']:>8} {r['taxa_vitoria']:>8.1%} {r['erros_medios']:>6.2f} {r['taxa_dica']:>6.1%}")
+    print(f"\nPalavras mais difíceis (dificuldade = erros médios + {PESO_DICA} * taxa de dica):")
+    for p in sorted(res["palavras"], key=lambda p: -p["dificuldade"])[:top]:
+        print(f"  {p['palavra']:<20} {p['tema']:<12} nível {p['nivel']}  {p['dificuldade']:.2f} "
+              f"({p['rodadas']} rodadas)")
+    for faixa, r in res["letras_por_faixa"].items():
+        comuns = sorted(r["frequencia"].items(), key=lambda kv: -kv[1])[:8]
+        print(f"Faixa {faixa:<4} letras mais chutadas: " + " ".join(f"{l}:{v:.0%}" for l, v in comuns))
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Estatísticas de dificuldade a partir dos logs de eventos.")
+    ap.add_argument("logs", nargs="+", help="arquivos de log (forca_eventos)")
+    ap.add_argument("--banco", default="banco_palavras.json")
+    ap.add_argument("--saida", help="grava o resultado em JSON (entrada de gera_banco.py --nivel-por-dados)")
+    ap.add_argument("--bloco", type=int, default=BLOCO, help="registros por leitura")
+    args = ap.parse_args(argv)
+
+    if np is None:
+        print("[ERRO] A análise precisa do NumPy (pip install numpy).")
+        sys.exit(1)
+    from forca_banco import abrir_banco
+    banco = abrir_banco(args.banco)
+    for log in args.logs:
+        try:
+            versao = ler_cabecalho(log)
+        except (OSError, ValueError) as e:
+            print(f"[ERRO] {e}")
+            sys.exit(1)
+        if ler_chaves(log) is None and versao and banco.versao and versao != banco.versao[:20]:
+            print(f"[AVISO] {log} (formato 1) foi gravado com o banco {versao}; o atual é {banco.versao}.")
+
+    res = analisar(banco, args.logs, args.bloco)
+    mostrar(res)
+    if args.saida:
+        Path(args.saida).write_text(json.dumps(res, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"\nArquivo salvo em: {Path(args.saida).resolve()}")
+
+
+if __name__ == "__main__":
+    main()
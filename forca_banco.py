@@ -0,0 +1,465 @@
+# -*- coding: utf-8 -*-
+"""
+Acesso ao banco de palavras usado pelos front-ends.
+
+Duas implementações com a mesma interface (`temas`, `indices(tema, nivel)`,
+`item(i)`, `chave(i)`, `len()`):
+
+- `BancoBinario`: arquivo indexado gerado por `gera_banco.py`, aberto com
+  mmap. Só os registros sorteados são decodificados, então o tempo de
+  abertura e a memória não crescem com o tamanho do banco.
+- `Banco`: colunar em memória, montado a partir de `banco_palavras.json`
+  quando o binário não existe (ou está mais velho que o JSON).
+
+`chave(i)` = (tema, palavra_exibida) identifica a palavra entre versões do
+banco; o id do registro muda quando o banco é regerado.
+
+Esquema 2 (campo `esquema` do JSON, formato 2 do binário): cada item traz
+também `letras`, `mascaras` e `modelo` (forca_motor.campos_revelacao) e
+`item(i)` os devolve, para a Partida começar sem normalizar. Bancos do
+esquema 1 continuam legíveis; seus itens só não trazem esses campos.
+
+Layout do binário (little-endian):
+
+    cabeçalho   CABECALHO (ver abaixo)
+    strings     (n_strings + 1) x u32 com o início de cada string no blob,
+                seguido do blob UTF-8
+    registros   n_registros x REGISTRO (tema, nível, exibida, normalizada, dica,
+                letras, modelo, início das máscaras)
+    índices     n_temas x (nome u32 + 4 x (início u32, quantidade u32)),
+                seguido da lista de ids (u32) referenciada pelas entradas
+    máscaras    u64 por letra distinta, alinhadas em 8 (formato 2)
+"""
+import json
+import mmap
+import struct
+import sys
+from array import array
+from pathlib import Path
+
+from forca_normalizacao import normalizar
+
+NIVEIS = ("A", "B", "C")
+FILTROS = NIVEIS + ("TODOS",)
+
+ESQUEMA = 2  # campo "esquema" do JSON gerado
+
+MAGICO = b"FORCABIN"
+FORMATO = 2
+MAGICO_FORMATO = struct.Struct("<8sH")
+# mágico, formato, n_temas, n_registros, n_strings,
+# off_strings, off_blob, off_registros, off_indices, versao, idioma, fonte, off_mascaras
+CABECALHO = struct.Struct("<8sHHIIIIIIIIII")
+# tema, nível, (pad), exibida, normalizada, dica, letras, modelo, início das máscaras
+REGISTRO = struct.Struct("<HBxIIIIII")
+SEM_MASCARAS = 0xFFFFFFFF  # item sem campos pré-calculados
+LIMITE_MASCARA = 1 << 64
+# formato 1 (sem letras/máscaras/modelo), só leitura
+CABECALHO_V1 = struct.Struct("<8sHHIIIIIIIII")
+REGISTRO_V1 = struct.Struct("<HBxIII")
+ENTRADA_TEMA = struct.Struct("<I" + "II" * len(FILTROS))
+
+
+def _u32(buf):
+    """Visão u32 sem cópia; em máquinas big-endian cai para uma cópia invertida."""
+    if sys.byteorder == "little":
+        return memoryview(buf).cast("I")
+    a = array("I", bytes(buf))
+    a.byteswap()
+    return a
+
+
+def _revelacao_valida(it) -> bool:
+    """Campos pré-calculados presentes e coerentes com a palavra atual.
+
+    Refaz o tabuleiro a partir de `modelo` + `mascaras` e confere com
+    `palavra_exibida` e com `normalizar(palavra_exibida)`: uma entrada editada
+    à mão (palavra, forma ou campos velhos) volta ao cálculo do esquema 1 em
+    vez de revelar letras erradas.
+    """
+    letras, mascaras, modelo = it.get("letras"), it.get("mascaras"), it.get("modelo")
+    if letras is None or mascaras is None or modelo is None or len(mascaras) != len(letras):
+        return False
+    exibida = it["palavra_exibida"]
+    forma = it.get("forma_normalizada")
+    if forma != normalizar(exibida) or exibida != exibida.upper() or len(modelo) != len(exibida):
+        return False
+    if not (exibida.isalpha() and modelo.count("_") == len(modelo)) and any(
+            (m == "_") != c.isalpha() or (m != "_" and m != c) for m, c in zip(modelo, exibida)):
+        return False  # espaço/hífen fora do lugar
+    posicoes = dict(zip(letras, mascaras))
+    uniao = 0
+    for m in mascaras:
+        if not 0 < m < LIMITE_MASCARA:
+            return False
+        uniao |= m
+    # máscaras disjuntas, uma posição por letra da forma normalizada...
+    if len(posicoes) != len(letras) or uniao != sum(mascaras) or bin(uniao).count("1") != len(forma):
+        return False
+    # ...e cada "_" do modelo na máscara da sua própria letra
+    k = 0
+    for i, m in enumerate(modelo):
+        if m == "_":
+            if k >= len(forma) or not posicoes.get(forma[k], 0) >> i & 1:
+                return False
+            k += 1
+    return k == len(forma)
+
+
+def _nivel(it) -> int:
+    """Posição do nível do item em NIVEIS; ValueError com tema e palavra se não for um deles."""
+    nivel = it.get("nivel", "A")
+    if nivel not in NIVEIS:
+        raise ValueError(f"Nível {nivel!r} inválido em {it.get('tema')}/{it.get('palavra_exibida')} "
+                         f"(use {', '.join(NIVEIS)}).")
+    return NIVEIS.index(nivel)
+
+
+def caminho_binario(caminho_json) -> Path:
+    return Path(caminho_json).with_suffix(".bin")
+
+
+def escrever_binario(banco: dict, caminho):
+    """Grava `banco` (mesmo dicionário do JSON) no formato binário indexado."""
+    Path(caminho).write_bytes(empacotar_binario(banco))
+
+
+def empacotar_binario(banco: dict) -> bytes:
+    """Bytes do formato binário indexado para `banco`."""
+    palavras = banco.get("palavras", [])
+    strings, ids_str = [], {}
+
+    def sid(s):
+        i = ids_str.get(s)
+        if i is None:
+            i = ids_str[s] = len(strings)
+            strings.append(s)
+        return i
+
+    meta = [sid(banco.get(k, "")) for k in ("versao", "idioma", "fonte")]
+    temas = sorted({it["tema"] for it in palavras})
+    tema_id = {t: i for i, t in enumerate(temas)}
+    nome_tema = [sid(t) for t in temas]
+    por_filtro = {(t, f): [] for t in temas for f in FILTROS}
+
+    registros = bytearray()
+    mascaras = []
+    for i, it in enumerate(palavras):
+        n = _nivel(it)
+        nivel = NIVEIS[n]
+        ini = SEM_MASCARAS
+        if _revelacao_valida(it):
+            ini = len(mascaras)
+            mascaras += it["mascaras"]
+        registros += REGISTRO.pack(
+            tema_id[it["tema"]], n,
+            sid(it["palavra_exibida"]), sid(it.get("forma_normalizada", "")), sid(it.get("dica", "")),
+            sid(it.get("letras", "")), sid(it.get("modelo", "")), ini,
+        )
+        por_filtro[(it["tema"], nivel)].append(i)
+        por_filtro[(it["tema"], "TODOS")].append(i)
+
+    blob = bytearray()
+    inicios = []
+    for s in strings:
+        inicios.append(len(blob))
+        blob += s.encode("utf-8")
+    inicios.append(len(blob))
+
+    entradas = bytearray()
+    lista_ids = []
+    for t, nome in zip(temas, nome_tema):
+        campos = [nome]
+        for f in FILTROS:
+            ids = por_filtro[(t, f)]
+            campos += [len(lista_ids), len(ids)]
+            lista_ids += ids
+        entradas += ENTRADA_TEMA.pack(*campos)
+
+    return _montar_binario(len(temas), len(palavras), meta, array("I", inicios), blob, registros, entradas,
+                           array("I", lista_ids), struct.pack(f"<{len(mascaras)}Q", *mascaras))
+
+
+def _montar_binario(n_temas, n_registros, meta, inicios, blob, registros, entradas, lista_ids, mascaras):
+    """Dispõe as seções no layout do formato 2 (`inicios` e `lista_ids` como array u32 nativo)."""
+    if sys.byteorder != "little":
+        inicios, lista_ids = array("I", inicios), array("I", lista_ids)
+        inicios.byteswap()
+        lista_ids.byteswap()
+    off_strings = CABECALHO.size
+    off_blob = off_strings + 4 * len(inicios)
+    off_registros = off_blob + len(blob)
+    off_registros += -off_registros % 4  # alinhamento para as visões u32
+    off_indices = off_registros + len(registros)
+    off_mascaras = off_indices + len(entradas) + 4 * len(lista_ids)
+    off_mascaras += -off_mascaras % 8
+
+    saida = bytearray(CABECALHO.pack(
+        MAGICO, FORMATO, n_temas, n_registros, len(inicios) - 1,
+        off_strings, off_blob, off_registros, off_indices, *meta, off_mascaras,
+    ))
+    saida += inicios.tobytes()
+    saida += blob
+    saida += bytes(off_registros - len(saida))
+    saida += registros
+    saida += entradas
+    saida += lista_ids.tobytes()
+    saida += bytes(off_mascaras - len(saida))
+    saida += mascaras
+    return bytes(saida)
+
+
+def _somar(palavras, deslocamento, campos, largura):
+    """Soma `deslocamento` às palavras u32 nos `campos` de cada registro de `largura` palavras."""
+    for c in campos:
+        palavras[c::largura] = array("I", (x + deslocamento for x in palavras[c::largura]))
+
+
+def juntar_binarios(segmentos, metadados) -> bytes:
+    """Junta bancos binários de um tema cada (empacotar_binario dos itens do tema) num banco só.
+
+    Os segmentos entram na ordem dada e viram os temas do banco, com ids
+    em sequência; strings, registros, índices e máscaras de cada um são só
+    deslocados, sem decodificar nem validar os itens de novo. É o que
+    deixa o build incremental de gera_banco reaproveitar os temas que não
+    mudaram.
+    """
+    meta = [metadados.get(k, "") for k in ("versao", "idioma", "fonte")]
+    inicios, blob = array("I"), bytearray()
+    for s in meta:
+        inicios.append(len(blob))
+        blob += s.encode("utf-8")
+    registros, entradas, lista_ids, mascaras = bytearray(), bytearray(), array("I"), bytearray()
+    n_registros = 0
+    largura = REGISTRO.size // 4
+    for k, seg in enumerate(segmentos):
+        (magico, formato, n_temas, n, n_strings, off_strings, off_blob, off_reg, off_idx,
+         *_, off_masc) = CABECALHO.unpack_from(seg, 0)
+        if magico != MAGICO or formato != FORMATO or n_temas != 1:
+            raise ValueError(f"segmento {k}: não é um banco binário de um tema só")
+        mv = memoryview(seg)
+        ini_seg = array("I", _u32(mv[off_strings:off_blob]))
+        base_str, base_masc = len(inicios), len(mascaras) // 8
+        inicios.extend(array("I", (x + len(blob) for x in ini_seg[:-1])))
+        blob += mv[off_blob:off_blob + ini_seg[-1]]
+
+        reg = array("I", _u32(mv[off_reg:off_reg + n * REGISTRO.size]))
+        _somar(reg, k, (0,), largura)  # tema: 16 bits baixos da palavra 0, no segmento sempre 0
+        _somar(reg, base_str, range(1, largura - 1), largura)
+        reg[largura - 1::largura] = array("I", (x if x == SEM_MASCARAS else x + base_masc
+                                               for x in reg[largura - 1::largura]))
+        if sys.byteorder != "little":
+            reg.byteswap()
+        registros += reg.tobytes()
+
+        nome, *faixas = ENTRADA_TEMA.unpack_from(seg, off_idx)
+        off_ids = off_idx + ENTRADA_TEMA.size
+        n_ids = sum(faixas[1::2])
+        ids = array("I", _u32(mv[off_ids:off_ids + 4 * n_ids]))
+        _somar(ids, n_registros, (0,), 1)
+        faixas[::2] = [ini + len(lista_ids) for ini in faixas[::2]]
+        entradas += ENTRADA_TEMA.pack(nome + base_str, *faixas)
+        lista_ids.extend(ids)
+
+        fim_masc = len(seg)
+        mascaras += mv[off_masc:fim_masc]
+        n_registros += n
+    inicios.append(len(blob))
+    return _montar_binario(len(segmentos), n_registros, [0, 1, 2], inicios, blob, registros, entradas,
+                           lista_ids, bytes(mascaras))
+
+
+class BancoBinario:
+    """Banco indexado aberto com mmap; decodifica registros sob demanda."""
+
+    __slots__ = ("caminho", "versao", "idioma", "fonte", "temas", "esquema",
+                 "_mm", "_inicios", "_off_blob", "_off_reg", "_off_masc", "_registro", "_n", "_nomes", "_indices")
+
+    def __init__(self, caminho):
+        self.caminho = Path(caminho)
+        with open(self.caminho, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magico, formato = MAGICO_FORMATO.unpack_from(self._mm, 0)
+        if magico != MAGICO or formato not in (1, FORMATO):
+            raise ValueError(f"{caminho}: formato de banco binário desconhecido")
+        self.esquema = formato
+        if formato == 1:
+            self._registro = REGISTRO_V1
+            (_, _, n_temas, self._n, n_strings, off_strings, self._off_blob,
+             self._off_reg, off_idx, *meta) = CABECALHO_V1.unpack_from(self._mm, 0)
+            self._off_masc = None
+        else:
+            self._registro = REGISTRO
+            (_, _, n_temas, self._n, n_strings, off_strings, self._off_blob,
+             self._off_reg, off_idx, *meta, self._off_masc) = CABECALHO.unpack_from(self._mm, 0)
+
+        mv = memoryview(self._mm)
+        self._inicios = _u32(mv[off_strings:self._off_blob])
+        self.versao, self.idioma, self.fonte = (self._str(i) for i in meta)
+
+        self._nomes = []
+        self._indices = {}
+        off_ids = off_idx + ENTRADA_TEMA.size * n_temas
+        n_ids = 2 * self._n
+        ids = _u32(mv[off_ids:off_ids + 4 * n_ids])
+        for k in range(n_temas):
+            nome, *faixas = ENTRADA_TEMA.unpack_from(self._mm, off_idx + k * ENTRADA_TEMA.size)
+            tema = self._str(nome)
+            self._nomes.append(tema)
+            for f, (ini, qtd) in zip(FILTROS, zip(faixas[::2], faixas[1::2])):
+                self._indices[(tema, f)] = ids[ini:ini + qtd]
+        self.temas = sorted(self._nomes)
+
+    def __len__(self):
+        return self._n
+
+    def _str(self, i) -> str:
+        a = self._off_blob + self._inicios[i]
+        b = self._off_blob + self._inicios[i + 1]
+        return self._mm[a:b].decode("utf-8")
+
+    def indices(self, tema, nivel="TODOS"):
+        return self._indices.get((tema, nivel), ())
+
+    def chave(self, i):
+        tema, _, exibida, *_ = self._registro.unpack_from(self._mm, self._off_reg + i * self._registro.size)
+        return self._nomes[tema], self._str(exibida)
+
+    def item(self, i) -> dict:
+        tema, nivel, exibida, normalizada, dica, *revelacao = self._registro.unpack_from(
+            self._mm, self._off_reg + i * self._registro.size)
+        it = {
+            "id": i,
+            "tema": self._nomes[tema],
+            "palavra_exibida": self._str(exibida),
+            "forma_normalizada": self._str(normalizada),
+            "nivel": NIVEIS[nivel],
+            "dica": self._str(dica),
+        }
+        if revelacao and revelacao[2] != SEM_MASCARAS:
+            letras, modelo, ini = revelacao
+            it["letras"] = letras = self._str(letras)
+            it["mascaras"] = list(struct.unpack_from(f"<{len(letras)}Q", self._mm, self._off_masc + 8 * ini))
+            it["modelo"] = self._str(modelo)
+        return it
+
+
+class Banco:
+    """Banco em memória guardado por colunas.
+
+    Tema, nível e dica viram ids pequenos (`array`), palavras são strings
+    internadas e as dicas repetidas ficam uma vez só em `dicas`. Os índices
+    de cada (tema, nível), incluindo TODOS, são montados uma vez na carga.
+    As máscaras do esquema 2 ficam num único array u64; itens cujos campos
+    pré-calculados não batem com a palavra (JSON editado à mão) ficam sem
+    eles e a Partida os recalcula.
+    """
+
+    __slots__ = ("caminho", "versao", "idioma", "fonte", "temas", "dicas", "esquema",
+                 "_tema", "_nivel", "_exibida", "_normalizada", "_dica", "_indices", "_tema_nomes",
+                 "_letras", "_modelo", "_mascaras", "_ini_mascaras")
+
+    def __init__(self, palavras=(), versao="", idioma="", fonte="", caminho=None, esquema=1):
+        self.caminho = Path(caminho) if caminho else None
+        self.versao, self.idioma, self.fonte = versao, idioma, fonte
+        self.esquema = esquema
+        self.dicas = []
+        self._tema = array("H")
+        self._nivel = array("B")
+        self._dica = array("I")
+        self._exibida = []
+        self._normalizada = []
+        self._letras = []
+        self._modelo = []
+        self._mascaras = array("Q")
+        self._ini_mascaras = array("I")
+        nomes, ids_tema, ids_dica = [], {}, {}
+        indices = {}
+
+        for i, it in enumerate(palavras):
+            tema = it["tema"]
+            t = ids_tema.get(tema)
+            if t is None:
+                t = ids_tema[tema] = len(nomes)
+                nomes.append(sys.intern(tema))
+            dica = it.get("dica", "")
+            d = ids_dica.get(dica)
+            if d is None:
+                d = ids_dica[dica] = len(self.dicas)
+                self.dicas.append(dica)
+            n = _nivel(it)
+            nivel = NIVEIS[n]
+            self._tema.append(t)
+            self._nivel.append(n)
+            self._dica.append(d)
+            self._exibida.append(sys.intern(it["palavra_exibida"]))
+            self._normalizada.append(sys.intern(it.get("forma_normalizada", "")))
+            if _revelacao_valida(it):
+                self._ini_mascaras.append(len(self._mascaras))
+                self._mascaras.extend(it["mascaras"])
+                self._letras.append(sys.intern(it["letras"]))
+                self._modelo.append(sys.intern(it["modelo"]))
+            else:
+                self._ini_mascaras.append(SEM_MASCARAS)
+                self._letras.append("")
+                self._modelo.append("")
+            for f in (nivel, "TODOS"):
+                lista = indices.get((t, f))
+                if lista is None:
+                    lista = indices[(t, f)] = array("I")
+                lista.append(i)
+
+        self.temas = sorted(nomes)
+        self._indices = {(nomes[t], f): lista for (t, f), lista in indices.items()}
+        self._tema_nomes = nomes
+
+    @classmethod
+    def de_json(cls, caminho):
+        dados = json.loads(Path(caminho).read_text(encoding="utf-8"))
+        return cls(dados.get("palavras", []), dados.get("versao", ""),
+                   dados.get("idioma", ""), dados.get("fonte", ""), caminho, dados.get("esquema", 1))
+
+    def __len__(self):
+        return len(self._exibida)
+
+    def indices(self, tema, nivel="TODOS"):
+        return self._indices.get((tema, nivel), ())
+
+    def chave(self, i):
+        return self._tema_nomes[self._tema[i]], self._exibida[i]
+
+    def item(self, i) -> dict:
+        it = {
+            "id": i,
+            "tema": self._tema_nomes[self._tema[i]],
+            "palavra_exibida": self._exibida[i],
+            "forma_normalizada": self._normalizada[i],
+            "nivel": NIVEIS[self._nivel[i]],
+            "dica": self.dicas[self._dica[i]],
+        }
+        ini = self._ini_mascaras[i]
+        if ini != SEM_MASCARAS:
+            letras = it["letras"] = self._letras[i]
+            it["mascaras"] = self._mascaras[ini:ini + len(letras)].tolist()
+            it["modelo"] = self._modelo[i]
+        return it
+
+
+def mapa_chaves(banco) -> dict:
+    """chave (tema, palavra_exibida) -> id, para reencontrar palavras num banco regerado."""
+    return {banco.chave(i): i for i in range(len(banco))}
+
+
+def abrir_banco(caminho_json):
+    """Abre o binário ao lado do JSON quando existir e estiver atualizado; senão, o JSON."""
+    p = Path(caminho_json)
+    b = caminho_binario(p)
+    if b.exists() and (not p.exists() or b.stat().st_mtime >= p.stat().st_mtime):
+        banco = BancoBinario(b)
+    elif p.exists():
+        banco = Banco.de_json(p)
+    else:
+        raise FileNotFoundError(caminho_json)
+    if not len(banco):
+        raise ValueError("Banco vazio.")
+    return banco
@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+"""
+Índice posicional para responder "quais palavras do banco ainda cabem
+neste tabuleiro?".
+
+Para cada comprimento L (da `forma_normalizada`) guardamos bitsets (int do
+Python, um bit por palavra daquele comprimento):
+
+- `pos[L][p][letra]`: palavras com `letra` na posição p
+- `contem[L][letra]`: palavras que têm `letra` em alguma posição
+- `tema[L][tema]`: palavras do tema
+
+Uma consulta é um punhado de AND/NOT sobre esses bitsets (no máximo
+L x letras tentadas operações), sem reler nem renormalizar palavras.
+"""
+import string
+
+LETRAS = string.ascii_uppercase
+
+
+def _bitset(posicoes) -> int:
+    ba = bytearray(posicoes[-1] // 8 + 1)
+    for p in posicoes:
+        ba[p >> 3] |= 1 << (p & 7)
+    return int.from_bytes(ba, "little")
+
+
+class Candidatos:
+    """Resultado de uma consulta: quantidade, contagem por letra e ids."""
+
+    __slots__ = ("total", "contagens", "_bits", "_ids")
+
+    def __init__(self, bits, ids, contagens):
+        self._bits = bits
+        self._ids = ids
+        self.total = bits.bit_count()
+        self.contagens = contagens  # letra não tentada -> nº de candidatas com ela
+
+    def ids(self):
+        b = self._bits
+        while b:
+            bit = b & -b
+            yield self._ids[bit.bit_length() - 1]
+            b ^= bit
+
+    def melhor_letra(self):
+        """Letra não tentada presente em mais candidatas (None se nenhuma ajuda)."""
+        melhor = max(self.contagens.items(), key=lambda kv: (kv[1], -ord(kv[0])), default=None)
+        return melhor[0] if melhor and melhor[1] else None
+
+
+class IndiceCandidatos:
+    """Índice (comprimento, posição, letra) -> bitset, montado na primeira consulta."""
+
+    __slots__ = ("banco", "_ids", "_pos", "_contem", "_tema")
+
+    def __init__(self, banco):
+        self.banco = banco
+        self._ids = None
+
+    def _montar(self):
+        # primeiro as listas de posições, depois um int por lista (montar o
+        # bitset com "|=" a cada palavra seria quadrático em bancos grandes)
+        ids, pos, contem, tema = {}, {}, {}, {}
+        for i in range(len(self.banco)):
+            it = self.banco.item(i)
+            forma = it["forma_normalizada"]
+            L = len(forma)
+            lista = ids.setdefault(L, [])
+            k = len(lista)
+            lista.append(i)
+            por_pos = pos.get(L)
+            if por_pos is None:
+                por_pos = pos[L] = [{} for _ in range(L)]
+            c = contem.setdefault(L, {})
+            for p, letra in enumerate(forma):
+                por_pos[p].setdefault(letra, []).append(k)
+                bits_c = c.setdefault(letra, [])
+                if not bits_c or bits_c[-1] != k:
+                    bits_c.append(k)
+            tema.setdefault(L, {}).setdefault(it["tema"], []).append(k)
+
+        self._pos = {L: [{l: _bitset(v) for l, v in d.items()} for d in por_pos]
+                     for L, por_pos in pos.items()}
+        self._contem = {L: {l: _bitset(v) for l, v in d.items()} for L, d in contem.items()}
+        self._tema = {L: {t: _bitset(v) for t, v in d.items()} for L, d in tema.items()}
+        self._ids = ids
+
+    def preparar(self):
+        """Monta o índice agora (ex.: numa thread de fundo) em vez de na primeira consulta."""
+        if self._ids is None:
+            self._montar()
+        return self
+
+    def consultar(self, padrao: str, tentadas=(), tema=None) -> Candidatos:
+        """`padrao` normalizado com "_" nas posições escondidas (ex.: "_A_O")."""
+        if self._ids is None:
+            self._montar()
+        L = len(padrao)
+        ids = self._ids.get(L)
+        if not ids:
+            return Candidatos(0, (), {})
+        bits = (1 << len(ids)) - 1
+        if tema is not None:
+            bits &= self._tema[L].get(tema, 0)
+        por_pos = self._pos[L]
+        for p, ch in enumerate(padrao):
+            if not bits:
+                break
+            if ch != "_":
+                bits &= por_pos[p].get(ch, 0)
+            else:
+                # posição escondida não pode ter letra já tentada
+                for letra in tentadas:
+                    bits &= ~por_pos[p].get(letra, 0)
+        contem = self._contem[L]
+        contagens = {l: (bits & contem.get(l, 0)).bit_count() for l in LETRAS if l not in tentadas}
+        return Candidatos(bits, ids, contagens)
+
+    def sugerir_letra(self, padrao, tentadas=(), tema=None):
+        return self.consultar(padrao, tentadas, tema).melhor_letra()
@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+"""
+Palavra do dia: a mesma para todos em cada (data, tema, nível), sem estado
+compartilhado entre processos ou máquinas.
+
+Os dias contam a partir de EPOCA e são divididos em ciclos. Um ciclo que
+começa na data s usa as palavras do filtro (`banco.indices(tema, nivel)`)
+que já valiam em s, na ordem do banco, e dura n = quantas são; dentro do
+ciclo c, o dia d vira a posição π(d), onde π é uma permutação de [0, n)
+com chave:
+
+- rede de Feistel balanceada de RODADAS rodadas sobre o menor domínio
+  2^(2h) >= n, com HMAC-SHA256(CHAVE, "tema|nivel|ciclo|n|rodada|x") como
+  função de rodada (a versão estática em docs/app.js refaz o mesmo cálculo
+  com crypto.subtle);
+- cycle-walking: aplica π até cair em [0, n); como o domínio é < 4n, são
+  em média menos de 4 passos.
+
+Nenhuma palavra repete dentro de um ciclo e cada ciclo tem outra ordem.
+
+Histórico: o gera_banco grava ao lado do banco (banco_palavras.dia.json)
+a data a partir da qual cada palavra e cada tema entram no sorteio. Uma
+palavra nova entra MARGEM dias depois do build, então os dias que o
+servidor aceita (±1 pelo fuso) não mudam, e ela só conta no primeiro
+ciclo que começa depois disso: o ciclo corrente termina com as palavras
+que tinha e os dias passados ficam como foram. Palavras sem data (banco
+sem histórico) valem desde a EPOCA. Tirar uma palavra do banco ou mudar
+seu nível muda os filtros dela, e aí a sequência deles é refeita.
+
+A chave vem de --chave-dia ou da variável FORCA_CHAVE_DIA; réplicas com a
+mesma chave e o mesmo banco concordam sem conversar.
+"""
+import hashlib
+import hmac
+import json
+import os
+from datetime import date, timedelta
+from pathlib import Path
+
+EPOCA = date(2024, 1, 1)
+RODADAS = 4
+MARGEM = timedelta(days=2)  # palavra nova só entra depois de amanhã (ver docstring)
+CHAVE_PADRAO = "forca-palavra-do-dia"
+TEMA_ALEATORIO = "*"  # rótulo do sorteio do tema quando o jogador pede ALEATÓRIO
+SEM_HISTORICO = {"palavras": {}, "temas": {}}
+
+_historicos = {}  # caminho -> (mtime, histórico lido)
+
+
+def chave_do_dia(chave=None) -> bytes:
+    return (chave or os.environ.get("FORCA_CHAVE_DIA") or CHAVE_PADRAO).encode("utf-8")
+
+
+def dia_de(texto=None) -> date:
+    """Data de "AAAA-MM-DD" (ValueError se inválida); hoje se vazio."""
+    return date.fromisoformat(texto) if texto else date.today()
+
+
+def caminho_historico(caminho_banco) -> Path:
+    return Path(caminho_banco).with_suffix(".dia.json")
+
+
+def ler_historico(dados) -> dict:
+    """Histórico do JSON ({"palavras": {"tema|PALAVRA": data}, "temas": {tema: data}}) com as datas em date."""
+    return {k: {c: date.fromisoformat(d) for c, d in (dados.get(k) or {}).items()} for k in ("palavras", "temas")}
+
+
+def historico_do_banco(banco) -> dict:
+    """Histórico gravado ao lado do banco; relido só quando o arquivo muda."""
+    if banco.caminho is None:
+        return SEM_HISTORICO
+    caminho = caminho_historico(banco.caminho)
+    try:
+        marca = caminho.stat().st_mtime_ns
+    except OSError:
+        return SEM_HISTORICO
+    lido = _historicos.get(caminho)
+    if lido is None or lido[0] != marca:
+        try:
+            historico = ler_historico(json.loads(caminho.read_text(encoding="utf-8")))
+        except (OSError, ValueError, AttributeError) as e:
+            print(f"[AVISO] Histórico da palavra do dia ilegível ({caminho}): {e}")
+            historico = SEM_HISTORICO
+        lido = _historicos[caminho] = (marca, historico)
+    return lido[1]
+
+
+def _permutar(x, n, chave, rotulo):
+    bits = max(1, (n - 1).bit_length())
+    h = (bits + 1) // 2
+    mascara = (1 << h) - 1
+    while True:
+        esq, dir_ = x >> h, x & mascara
+        for r in range(RODADAS):
+            msg = f"{rotulo}|{r}|{dir_}".encode("utf-8")
+            f = int.from_bytes(hmac.new(chave, msg, hashlib.sha256).digest()[:4], "big") & mascara
+            esq, dir_ = dir_, esq ^ f
+        x = (esq << h) | dir_
+        if x < n:
+            return x
+
+
+def indice_do_dia(n, dia, tema, nivel, chave=None) -> int:
+    """Posição [0, n) do dia num filtro de tamanho fixo n (sem histórico)."""
+    ciclo, d = divmod((dia - EPOCA).days, n)
+    return _permutar(d, n, chave_do_dia(chave), f"{tema}|{nivel}|{ciclo}|{n}")
+
+
+def do_dia(itens, entradas, dia, tema, nivel, chave=None):
+    """Item do dia entre `itens` (ordem do banco), ou None se nenhum vale ainda.
+
+    `entradas[k]` é a data a partir da qual itens[k] conta (None: desde a
+    EPOCA). Percorre os trechos entre datas de entrada, O(datas distintas).
+    """
+    mudancas = sorted({d for d in entradas if d is not None and d > EPOCA})
+    ciclo, inicio = 0, EPOCA
+    for prox in mudancas + [None]:
+        if prox is not None and inicio >= prox:
+            continue  # nenhum ciclo começa neste trecho
+        lista = [x for x, d in zip(itens, entradas) if d is None or d <= inicio] if mudancas else itens
+        if not lista:
+            if prox is None or dia < prox:
+                return None
+            inicio = prox
+            continue
+        n = len(lista)
+        c, d = divmod((dia - inicio).days, n)
+        if prox is None or inicio + timedelta(days=c * n) < prox:
+            return lista[_permutar(d, n, chave_do_dia(chave), f"{tema}|{nivel}|{ciclo + c}|{n}")]
+        k = -(-(prox - inicio).days // n)  # ciclos que começam antes de prox
+        ciclo += k
+        inicio += timedelta(days=k * n)
+    return None
+
+
+def tema_do_dia(banco, dia=None, chave=None, historico=None):
+    """Tema para ALEATÓRIO no modo do dia (todos recebem o mesmo)."""
+    datas = (historico_do_banco(banco) if historico is None else historico)["temas"]
+    return do_dia(banco.temas, [datas.get(t) for t in banco.temas], dia or date.today(),
+                  TEMA_ALEATORIO, "TEMAS", chave)
+
+
+def palavra_do_dia(banco, tema, nivel="TODOS", dia=None, chave=None, historico=None):
+    """Id da palavra do dia no filtro (tema, nível), ou None se o filtro for vazio."""
+    ids = banco.indices(tema, nivel)
+    datas = (historico_do_banco(banco) if historico is None else historico)["palavras"]
+    entradas = [datas.get(f"{tema}|{banco.chave(i)[1]}") for i in ids] if datas else [None] * len(ids)
+    return do_dia(ids, entradas, dia or date.today(), tema, nivel, chave)
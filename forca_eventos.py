@@ -0,0 +1,435 @@
+# -*- coding: utf-8 -*-
+"""
+Registro binário dos eventos de jogo (só acrescenta) e replay de rodadas.
+
+Cada evento é um registro fixo de 16 bytes (REGISTRO):
+
+    rodada u32 | palavra u32 | tempo u32 | tipo u8 | valor u8 | erros u8 | faixa u8
+
+- `palavra` é o código da palavra na tabela de chaves do log
+  (`<log>.chaves`, uma linha JSON [tema, palavra_exibida] por código, na
+  ordem em que as palavras apareceram); `tempo` em segundos Unix; `erros`
+  depois do evento; `faixa` é a faixa etária do jogador (FAIXAS, 0 = não
+  informada).
+- `valor`: letra 1..26 (A..Z) em LETRA; 1/0 (acertou) em CHUTE e FIM.
+- INICIO abre a rodada; FIM só existe se ela terminou. Rodada largada no
+  meio (sair, nova palavra, sessão web expirada, Diario fechado) ganha um
+  ABANDONO, então toda rodada tem um registro de fim, exceto as que
+  estavam abertas quando o processo caiu.
+
+Os ids de rodada são sequenciais por arquivo, e o índice ao lado
+(`<log>.idx`) guarda o offset do INICIO de cada rodada em 8 bytes: achar a
+rodada N é um seek para (N-1)*8, sem reler o log. Depois do INICIO o
+replay lê para a frente só até o FIM ou ABANDONO daquela rodada (no
+servidor as rodadas se intercalam).
+
+Como em forca_progresso e forca_revisao, a palavra é identificada pela
+chave (tema, palavra_exibida), não pelo id do registro no banco: o id
+muda quando o banco é regerado ou recarregado com o jogo aberto, a chave
+não. Replay e análise reencontram cada palavra no banco atual pelo
+mapa de chaves. A versão do banco no cabeçalho é só informativa: a do
+banco em uso, atualizada quando o jogo recarrega o banco aberto
+(forca_recarga).
+
+Logs do formato 1 (id do registro no lugar do código) continuam legíveis;
+o Diario os renomeia para `<log>.v1` e começa um log novo.
+
+As escritas vão para um buffer e descem em blocos (a cada 64 KiB ou a cada
+segundo, e no fim de cada rodada). Um arquivo tem um único processo
+escritor: o Diario trava `<log>.trava` (flock exclusivo) ao abrir e um
+segundo escritor recebe LogOcupado em vez de duplicar ids de rodada. Se o
+processo cair, registros pela metade são descartados e o índice é
+completado a partir do log ao reabrir. As chaves novas descem antes do
+log, então um código gravado sempre tem a sua linha.
+
+    python forca_eventos.py eventos.bin             # resumo
+    python forca_eventos.py eventos.bin --rodada 42 # replay do tabuleiro
+"""
+import argparse
+import json
+import mmap
+import os
+import struct
+import sys
+import time
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows: sem trava, vale só a convenção de um escritor por log
+    fcntl = None
+
+from forca_motor import ACERTO, ERRO, Partida, normalizar
+
+ARQ_EVENTOS = "eventos.bin"
+MAGICO = b"FORCAEVT"
+FORMATO = 2
+FORMATOS_LEITURA = (1, 2)  # 1: `palavra` é o id do registro no banco
+CABECALHO = struct.Struct("<8sHH20s")
+REGISTRO = struct.Struct("<IIIBBBB")
+OFFSET = struct.Struct("<Q")
+LIMITE_BUFFER = 64 * 1024
+INTERVALO_FLUSH = 1.0
+LOTE_LEITURA = 4096  # registros por leitura no replay
+
+INICIO, LETRA, DICA, CHUTE, FIM, ABANDONO = range(6)
+TIPOS = ("INICIO", "LETRA", "DICA", "CHUTE", "FIM", "ABANDONO")
+FAIXAS = ("?", "3-5", "6-7", "8-9", "10+")
+
+
+def caminho_indice(caminho) -> Path:
+    p = Path(caminho)
+    return p.with_name(p.name + ".idx")
+
+
+def caminho_chaves(caminho) -> Path:
+    p = Path(caminho)
+    return p.with_name(p.name + ".chaves")
+
+
+def caminho_trava(caminho) -> Path:
+    p = Path(caminho)
+    return p.with_name(p.name + ".trava")
+
+
+class LogOcupado(OSError):
+    """Outro processo já grava nesse log de eventos."""
+
+
+def codigo_faixa(faixa) -> int:
+    return FAIXAS.index(faixa) if faixa in FAIXAS else 0
+
+
+class Diario:
+    """Escritor do log de eventos (um por arquivo)."""
+
+    def __init__(self, caminho=ARQ_EVENTOS, versao_banco=""):
+        self.caminho = Path(caminho)
+        self._trava = self._travar()
+        try:
+            self._abrir(versao_banco)
+        except BaseException:
+            self._trava.close()
+            raise
+
+    def _travar(self):
+        """Trava exclusiva do log (antes de qualquer recuperação que trunque arquivos)."""
+        trava = open(caminho_trava(self.caminho), "a")
+        if fcntl is not None:
+            try:
+                fcntl.flock(trava.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                trava.close()
+                raise LogOcupado(f"{self.caminho} já está sendo gravado por outro processo; "
+                                 "use outro arquivo de eventos (--eventos) ou --sem-eventos.") from None
+        return trava
+
+    def _abrir(self, versao_banco):
+        novo = not self.caminho.exists() or self.caminho.stat().st_size < CABECALHO.size
+        if not novo and formato_do_log(self.caminho) != FORMATO:
+            antigo = self.caminho.with_name(self.caminho.name + ".v1")
+            for p in (self.caminho, caminho_indice(self.caminho)):
+                if p.exists():
+                    p.replace(p.with_name(p.name.replace(self.caminho.name, antigo.name, 1)))
+            print(f"[AVISO] {self.caminho} era do formato 1 (ids do banco); movido para {antigo}.")
+            novo = True
+        if novo:
+            with open(self.caminho, "wb") as f:
+                f.write(CABECALHO.pack(MAGICO, FORMATO, REGISTRO.size, versao_banco.encode("utf-8")[:20]))
+            caminho_indice(self.caminho).write_bytes(b"")
+            caminho_chaves(self.caminho).write_bytes(b"")
+        self.versao_banco = ler_cabecalho(self.caminho)
+        chaves = self._recuperar_chaves()
+        self._codigos = {c: k for k, c in enumerate(chaves)}
+        self._n, self._rodadas = self._recuperar()
+        self._log = open(self.caminho, "ab", buffering=0)
+        self._idx = open(caminho_indice(self.caminho), "ab", buffering=0)
+        self._chaves = open(caminho_chaves(self.caminho), "ab", buffering=0)
+        self._buf, self._buf_idx, self._buf_chaves = bytearray(), bytearray(), bytearray()
+        self._ultimo_flush = time.monotonic()
+        self._abertas = {}  # id -> RodadaEventos ainda sem FIM/ABANDONO
+
+    def _recuperar_chaves(self):
+        """Lê a tabela de chaves, descartando uma linha pela metade no fim."""
+        p = caminho_chaves(self.caminho)
+        dados = p.read_bytes() if p.exists() else b""
+        completo = dados.rfind(b"\n") + 1
+        if completo != len(dados) or not p.exists():
+            p.write_bytes(dados[:completo])
+        return _decodificar_chaves(dados[:completo])
+
+    def _recuperar(self):
+        """Descarta registro pela metade no fim e completa o índice a partir do log."""
+        tam = self.caminho.stat().st_size
+        n = (tam - CABECALHO.size) // REGISTRO.size
+        if CABECALHO.size + n * REGISTRO.size != tam:
+            os.truncate(self.caminho, CABECALHO.size + n * REGISTRO.size)
+        pidx = caminho_indice(self.caminho)
+        if not pidx.exists():
+            pidx.write_bytes(b"")
+        rodadas = pidx.stat().st_size // OFFSET.size
+        os.truncate(pidx, rodadas * OFFSET.size)
+        if rodadas:
+            with open(pidx, "rb") as f:
+                f.seek((rodadas - 1) * OFFSET.size)
+                inicio = OFFSET.unpack(f.read(OFFSET.size))[0]
+        else:
+            inicio = CABECALHO.size
+        faltando = bytearray()
+        with open(self.caminho, "rb") as f:
+            f.seek(inicio)
+            pos = inicio
+            while True:
+                bloco = f.read(LOTE_LEITURA * REGISTRO.size)
+                if not bloco:
+                    break
+                for k, (rodada, _, _, tipo, _, _, _) in enumerate(REGISTRO.iter_unpack(bloco)):
+                    if tipo == INICIO and rodada > rodadas:
+                        faltando += OFFSET.pack(pos + k * REGISTRO.size)
+                        rodadas = rodada
+                pos += len(bloco)
+        if faltando:
+            with open(pidx, "ab") as f:
+                f.write(faltando)
+        return n, rodadas
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fechar()
+
+    def _gravar(self, rodada, palavra, tipo, valor, erros, faixa):
+        self._buf += REGISTRO.pack(rodada, palavra, int(time.time()), tipo, valor, erros, faixa)
+        self._n += 1
+        if (tipo in (FIM, ABANDONO) or len(self._buf) >= LIMITE_BUFFER
+                or time.monotonic() - self._ultimo_flush >= INTERVALO_FLUSH):
+            self.flush()
+
+    def codigo(self, item) -> int:
+        """Código da chave (tema, palavra_exibida) do item neste log; novo se preciso."""
+        chave = (item["tema"], item["palavra_exibida"])
+        k = self._codigos.get(chave)
+        if k is None:
+            k = self._codigos[chave] = len(self._codigos)
+            self._buf_chaves += (json.dumps(chave, ensure_ascii=False) + "\n").encode("utf-8")
+        return k
+
+    def trocar_banco(self, versao):
+        """Banco recarregado com o jogo aberto: desce o buffer e anota a versão nova no cabeçalho."""
+        self.flush()
+        if versao == self.versao_banco:
+            return
+        with open(self.caminho, "r+b") as f:
+            f.write(CABECALHO.pack(MAGICO, FORMATO, REGISTRO.size, versao.encode("utf-8")[:20]))
+        self.versao_banco = ler_cabecalho(self.caminho)
+
+    def rodada(self, partida, faixa=0):
+        """Abre uma rodada no log e devolve o gravador dela."""
+        self._rodadas += 1
+        self._buf_idx += OFFSET.pack(CABECALHO.size + self._n * REGISTRO.size)
+        r = RodadaEventos(self, self._rodadas, partida, faixa)
+        self._gravar(r.id, r.palavra, INICIO, 0, 0, faixa)
+        self._abertas[r.id] = r
+        return r
+
+    def flush(self):
+        # chaves antes do log e log antes do índice: nada aponta para o que não desceu
+        if self._buf_chaves:
+            self._chaves.write(self._buf_chaves)
+            self._buf_chaves.clear()
+        if self._buf:
+            self._log.write(self._buf)
+            self._buf.clear()
+        if self._buf_idx:
+            self._idx.write(self._buf_idx)
+            self._buf_idx.clear()
+        self._ultimo_flush = time.monotonic()
+
+    def fechar(self):
+        for r in list(self._abertas.values()):
+            r.abandonar()
+        self.flush()
+        self._log.close()
+        self._idx.close()
+        self._chaves.close()
+        self._trava.close()
+
+
+class RodadaEventos:
+    """Gravador de uma rodada; chame depois de aplicar cada jogada na Partida."""
+
+    __slots__ = ("diario", "id", "palavra", "partida", "faixa")
+
+    def __init__(self, diario, id, partida, faixa):
+        self.diario = diario
+        self.id = id
+        self.palavra = diario.codigo(partida.item)
+        self.partida = partida
+        self.faixa = faixa
+
+    def _gravar(self, tipo, valor=0):
+        p = self.partida
+        self.diario._gravar(self.id, self.palavra, tipo, valor, p.erros, self.faixa)
+        if tipo != FIM and p.terminada:
+            self.diario._gravar(self.id, self.palavra, FIM, int(p.resultado is True), p.erros, self.faixa)
+        if p.terminada or tipo == ABANDONO:
+            self.diario._abertas.pop(self.id, None)
+
+    def abandonar(self):
+        """Rodada largada sem terminar: grava ABANDONO (uma vez; nada se já terminou)."""
+        if self.id in self.diario._abertas and not self.partida.terminada:
+            self._gravar(ABANDONO)
+
+    def letra(self, palpite, resultado):
+        # só letras válidas e novas (ACERTO/ERRO) entram no log
+        if resultado in (ACERTO, ERRO):
+            self._gravar(LETRA, ord(normalizar(palpite)) - 64)
+
+    def dica(self):
+        self._gravar(DICA)
+
+    def chute(self, acertou):
+        self._gravar(CHUTE, int(acertou))
+
+
+# ===== leitura =====
+
+def _ler(caminho):
+    with open(caminho, "rb") as f:
+        magico, formato, tamanho, versao = CABECALHO.unpack(f.read(CABECALHO.size))
+    if magico != MAGICO or formato not in FORMATOS_LEITURA or tamanho != REGISTRO.size:
+        raise ValueError(f"{caminho}: não é um log de eventos compatível.")
+    return formato, versao.rstrip(b"\0").decode("utf-8")
+
+
+def ler_cabecalho(caminho) -> str:
+    """Versão do banco em uso na última gravação do log (informativa)."""
+    return _ler(caminho)[1]
+
+
+def formato_do_log(caminho) -> int:
+    return _ler(caminho)[0]
+
+
+def _decodificar_chaves(dados: bytes):
+    return [tuple(json.loads(linha)) for linha in dados.decode("utf-8").splitlines()]
+
+
+def ler_chaves(caminho):
+    """Tabela código -> (tema, palavra_exibida) do log; None nos logs do formato 1."""
+    if formato_do_log(caminho) == 1:
+        return None
+    p = caminho_chaves(caminho)
+    dados = p.read_bytes() if p.exists() else b""
+    return _decodificar_chaves(dados[:dados.rfind(b"\n") + 1])
+
+
+def ids_no_banco(chaves, banco):
+    """Lista código -> id do registro no `banco` (None se a palavra saiu dele)."""
+    from forca_banco import mapa_chaves
+    ids = mapa_chaves(banco)
+    return [ids.get(c) for c in chaves]
+
+
+def eventos_da_rodada(caminho, rodada):
+    """Eventos (tuplas de REGISTRO) da rodada, achada pelo índice."""
+    caminho = Path(caminho)
+    ler_cabecalho(caminho)
+    with open(caminho_indice(caminho), "rb") as f:
+        f.seek((rodada - 1) * OFFSET.size)
+        dados = f.read(OFFSET.size)
+    if rodada < 1 or len(dados) != OFFSET.size:
+        raise KeyError(rodada)
+    offset = OFFSET.unpack(dados)[0]
+    saida = []
+    with open(caminho, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        mv = memoryview(mm)
+        try:
+            passo = LOTE_LEITURA * REGISTRO.size
+            for pos in range(offset, len(mm), passo):
+                for ev in REGISTRO.iter_unpack(mv[pos:min(pos + passo, len(mm))]):
+                    if ev[0] == rodada:
+                        saida.append(ev)
+                        if ev[3] in (FIM, ABANDONO):
+                            return saida
+            return saida
+        finally:
+            mv.release()
+
+
+def reproduzir(banco, eventos, chaves=None):
+    """Refaz a partida evento a evento; gera (evento, partida) após cada um.
+
+    `chaves` é a tabela do log (ler_chaves); sem ela (formato 1), `palavra`
+    é tomado como id do registro no banco.
+    """
+    partida = None
+    ids = ids_no_banco(chaves, banco) if chaves is not None else None
+    for ev in eventos:
+        _, palavra, _, tipo, valor, erros, _ = ev
+        if tipo == INICIO:
+            if ids is not None:
+                if palavra >= len(ids) or ids[palavra] is None:
+                    raise ValueError(f"Palavra {chaves[palavra] if palavra < len(chaves) else palavra} "
+                                     "não está no banco atual.")
+                palavra = ids[palavra]
+            partida = Partida(banco.item(palavra))
+        elif tipo == LETRA:
+            partida.tentar_letra(chr(64 + valor))
+        elif tipo == DICA:
+            partida.pedir_dica()
+        elif tipo == CHUTE:
+            partida.chutar(partida.alvo if valor else "")
+        if partida.erros != erros:
+            raise ValueError(f"Replay divergiu do log (erros {partida.erros} != {erros}); banco diferente?")
+        yield ev, partida
+
+
+def resumo(caminho):
+    ler_cabecalho(caminho)
+    n = (Path(caminho).stat().st_size - CABECALHO.size) // REGISTRO.size
+    rodadas = caminho_indice(caminho).stat().st_size // OFFSET.size
+    return n, rodadas
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Replay e resumo do log de eventos do jogo.")
+    ap.add_argument("log", nargs="?", default=ARQ_EVENTOS)
+    ap.add_argument("--rodada", type=int, help="refaz o tabuleiro dessa rodada, evento a evento")
+    ap.add_argument("--banco", default="banco_palavras.json")
+    args = ap.parse_args(argv)
+
+    try:
+        versao = ler_cabecalho(args.log)
+    except (OSError, ValueError) as e:
+        print(f"[ERRO] {e}")
+        sys.exit(1)
+    if args.rodada is None:
+        n, rodadas = resumo(args.log)
+        print(f"{args.log}: {n} eventos, {rodadas} rodadas (banco {versao or '?'})")
+        return
+
+    from forca_banco import abrir_banco
+    banco = abrir_banco(args.banco)
+    chaves = ler_chaves(args.log)
+    if chaves is None and versao and banco.versao and versao != banco.versao[:20]:
+        print(f"[AVISO] Log gravado com o banco {versao}; o atual é {banco.versao}.")
+    try:
+        eventos = eventos_da_rodada(args.log, args.rodada)
+    except KeyError:
+        print(f"[ERRO] Rodada {args.rodada} não existe no log.")
+        sys.exit(1)
+    try:
+        for (_, _, tempo, tipo, valor, _, faixa), p in reproduzir(banco, eventos, chaves):
+            quando = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(tempo))
+            extra = chr(64 + valor) if tipo == LETRA else (valor if tipo in (CHUTE, FIM) else "")
+            print(f"{quando} {TIPOS[tipo]:<8} {extra!s:<2} {' '.join(p.reveladas)}  "
+                  f"erros={p.erros} tentadas={''.join(sorted(p.tentadas)) or '-'} faixa={FAIXAS[faixa]}")
+    except ValueError as e:
+        print(f"[ERRO] {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+"""
+Motor da partida de forca, sem entrada/saída.
+
+Usado pelo protótipo de terminal e pela versão Tkinter: cada front-end só
+lê o palpite, chama `Partida` e mostra o resultado do jeito que preferir.
+
+O mapa letra -> posições é montado uma vez por palavra (bitmask sobre
+`palavra_exibida`), então cada palpite é uma consulta de dicionário e a
+vitória é uma comparação de máscaras. Bancos do esquema 2 já trazem esse
+mapa pronto (`letras`, `mascaras`, `modelo`, ver `campos_revelacao`), e a
+partida começa sem normalizar nada; sem eles, o mapa é montado aqui.
+"""
+from forca_normalizacao import normalizar
+
+MAX_ERROS = 6  # cabeça, tronco, braço esq, braço dir, perna esq, perna dir
+ERROS_PARA_DICA = 2  # dica aparece sozinha a partir desse número de erros
+
+# resultados de Partida.tentar_letra
+INVALIDA = "invalida"
+REPETIDA = "repetida"
+ACERTO = "acerto"
+ERRO = "erro"
+
+
+def mapear_posicoes(exibida: str):
+    """Devolve ({letra: máscara de posições}, máscara das posições a descobrir,
+    forma normalizada de cada caractere)."""
+    posicoes = {}
+    alvo = 0
+    normas = []
+    for i, ch in enumerate(exibida):
+        letra = normalizar(ch)
+        normas.append(letra)
+        if not ch.isalpha():
+            continue  # espaço/hífen já aparecem revelados
+        alvo |= 1 << i
+        if len(letra) == 1:
+            posicoes[letra] = posicoes.get(letra, 0) | (1 << i)
+    return posicoes, alvo, tuple(normas)
+
+
+def campos_revelacao(exibida: str) -> dict:
+    """Campos pré-calculados por gera_banco: letras distintas (ordenadas), a
+    máscara de posições de cada uma e o modelo inicial de `reveladas`."""
+    posicoes, _, _ = mapear_posicoes(exibida)
+    letras = "".join(sorted(posicoes))
+    return {
+        "letras": letras,
+        "mascaras": [posicoes[l] for l in letras],
+        "modelo": "".join("_" if c.isalpha() else c for c in exibida),
+    }
+
+
+class Partida:
+    """Estado de uma rodada: palavra, letras reveladas, tentativas e erros."""
+
+    __slots__ = (
+        "item", "exibida", "alvo", "reveladas", "tentadas", "erros",
+        "dica_mostrada", "resultado", "max_erros", "_posicoes", "_mascara", "_mascara_alvo", "_normas",
+    )
+
+    def __init__(self, item, max_erros=MAX_ERROS):
+        self.item = item
+        self.max_erros = max_erros
+        self.tentadas = set()
+        self.erros = 0
+        self.dica_mostrada = False
+        self.resultado = None  # None = em andamento, True = vitória, False = derrota
+        self._mascara = 0
+        mascaras = item.get("mascaras")
+        if mascaras is not None:
+            # esquema 2: tudo pré-calculado por gera_banco
+            self.exibida = item["palavra_exibida"]
+            self.alvo = item["forma_normalizada"]
+            self.reveladas = list(item["modelo"])
+            self._posicoes = dict(zip(item["letras"], mascaras))
+            self._mascara_alvo = sum(1 << i for i, c in enumerate(item["modelo"]) if c == "_")
+            self._normas = None  # só para padrao(); montado na primeira consulta
+        else:
+            self.exibida = item["palavra_exibida"].upper()
+            self.alvo = normalizar(self.exibida)
+            self.reveladas = ["_" if c.isalpha() else c for c in self.exibida]
+            self._posicoes, self._mascara_alvo, self._normas = mapear_posicoes(self.exibida)
+
+    @property
+    def terminada(self) -> bool:
+        return self.resultado is not None
+
+    @property
+    def dica(self):
+        return self.item.get("dica")
+
+    @property
+    def dica_visivel(self) -> bool:
+        return self.dica_mostrada or self.erros >= ERROS_PARA_DICA
+
+    def padrao(self) -> str:
+        """Tabuleiro na forma normalizada, "_" onde falta descobrir (ex.: "_A_O")."""
+        if self._normas is None:
+            self._normas = mapear_posicoes(self.exibida)[2]
+        m = self._mascara
+        return "".join(
+            n if m >> i & 1 else "_" * len(n)
+            for i, n in enumerate(self._normas)
+        )
+
+    def pedir_dica(self):
+        self.dica_mostrada = True
+
+    def tentar_letra(self, palpite: str) -> str:
+        letra = normalizar(palpite)
+        if len(letra) != 1:
+            return INVALIDA
+        if letra in self.tentadas:
+            return REPETIDA
+        self.tentadas.add(letra)
+
+        m = self._posicoes.get(letra, 0)
+        if not m:
+            self._errar()
+            return ERRO
+        # revelar posições respeitando acentos na exibida
+        self._mascara |= m
+        while m:
+            bit = m & -m
+            i = bit.bit_length() - 1
+            self.reveladas[i] = self.exibida[i]
+            m ^= bit
+        if self._mascara == self._mascara_alvo:
+            self.resultado = True
+        return ACERTO
+
+    def chutar(self, chute: str) -> bool:
+        if normalizar(chute) == self.alvo:
+            self.resultado = True
+            return True
+        self._errar()
+        return False
+
+    def _errar(self):
+        self.erros += 1
+        if self.erros >= self.max_erros:
+            self.resultado = False
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+"""
+Normalização de palavras (sem acentos, maiúsculas, só A-Z) compartilhada
+por gera_banco.py e pelos front-ends.
+
+Mesmo resultado da versão original (NFKD -> remove marcas combinantes ->
+upper -> remove o que não for A-Z), mas:
+
+- caminho rápido com `str.translate` numa tabela pré-calculada para todo
+  o Latin-1 e Latin Extended-A/B (o português inteiro cabe aí); NFKD só
+  roda para os caracteres raros fora da tabela;
+- `normalizar` guarda as últimas palavras num LRU limitado;
+- `normalizar_lote` normaliza uma lista/fluxo de palavras com um único
+  `translate` sobre o lote.
+
+A equivalência caractere a caractere vale porque a NFKD, a remoção de
+marcas e o upper() atuam em cada caractere isoladamente (a reordenação
+canônica só mexe em marcas, que são descartadas).
+"""
+import re
+import unicodedata
+from functools import lru_cache
+
+TAMANHO_CACHE = 65536
+LIMITE_TABELA = 0x250  # Latin-1 + Latin Extended-A/B
+_SEP = "\x00"
+_NAO_AZ = re.compile(r"[^A-Z]")
+
+
+def normalizar_nfkd(txt: str) -> str:
+    """Implementação de referência (a original), usada fora da tabela."""
+    nfkd = unicodedata.normalize("NFKD", txt)
+    s = "".join(c for c in nfkd if not unicodedata.combining(c))
+    s = s.upper()
+    s = _NAO_AZ.sub("", s)  # remove espaços, hífens, etc.
+    return s
+
+
+def _montar_tabela():
+    tabela = {}
+    for cp in range(LIMITE_TABELA):
+        saida = normalizar_nfkd(chr(cp))
+        tabela[cp] = saida or None
+    return tabela
+
+
+_TABELA = _montar_tabela()
+_TABELA_LOTE = dict(_TABELA)
+_TABELA_LOTE[ord(_SEP)] = _SEP  # separador sobrevive no lote
+
+
+def _normalizar(txt: str) -> str:
+    s = txt.translate(_TABELA)
+    if s.isascii():
+        return s
+    return normalizar_nfkd(s)  # sobrou caractere fora da tabela
+
+
+@lru_cache(maxsize=TAMANHO_CACHE)
+def normalizar(txt: str) -> str:
+    return _normalizar(txt)
+
+
+def normalizar_lote(palavras) -> list:
+    """Normaliza várias palavras de uma vez (lista ou qualquer iterável)."""
+    palavras = list(palavras)
+    if not palavras:
+        return []
+    junto = _SEP.join(palavras)
+    if junto.count(_SEP) != len(palavras) - 1:  # alguma palavra tem o próprio separador
+        return [_normalizar(p) for p in palavras]
+    partes = junto.translate(_TABELA_LOTE).split(_SEP)
+    if not junto.isascii():
+        partes = [p if p.isascii() else normalizar_nfkd(p) for p in partes]
+    return partes
@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+"""
+Progresso dos jogadores (palavras vistas, vitórias/derrotas e dicas por
+palavra) guardado em SQLite no modo WAL.
+
+- As atualizações ficam num buffer em memória e vão para o banco em lote
+  (a cada `lote` rodadas ou `intervalo` segundos), num único UPSERT.
+- A chave primária (jogador, tema, palavra) é o próprio índice: carregar o
+  histórico de um jogador é uma busca por faixa, não uma varredura.
+- WAL permite leitores simultâneos (outros processos/conexões) enquanto
+  um escritor grava.
+
+As palavras são identificadas por (tema, palavra_exibida), que não mudam
+quando o banco é regerado.
+"""
+import sqlite3
+import threading
+import time
+
+ARQ_PROGRESSO = "progresso.sqlite3"
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS jogador (
+    id   INTEGER PRIMARY KEY,
+    nome TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS progresso (
+    jogador  INTEGER NOT NULL REFERENCES jogador(id),
+    tema     TEXT NOT NULL,
+    palavra  TEXT NOT NULL,
+    vistas   INTEGER NOT NULL DEFAULT 0,
+    vitorias INTEGER NOT NULL DEFAULT 0,
+    derrotas INTEGER NOT NULL DEFAULT 0,
+    dicas    INTEGER NOT NULL DEFAULT 0,
+    ultima   REAL,
+    PRIMARY KEY (jogador, tema, palavra)
+) WITHOUT ROWID;
+"""
+
+UPSERT = """
+INSERT INTO progresso (jogador, tema, palavra, vistas, vitorias, derrotas, dicas, ultima)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (jogador, tema, palavra) DO UPDATE SET
+    vistas   = vistas   + excluded.vistas,
+    vitorias = vitorias + excluded.vitorias,
+    derrotas = derrotas + excluded.derrotas,
+    dicas    = dicas    + excluded.dicas,
+    ultima   = excluded.ultima
+"""
+
+
+class Progresso:
+    """Loja de progresso por jogador com escrita em lote."""
+
+    def __init__(self, caminho=ARQ_PROGRESSO, lote=256, intervalo=2.0):
+        self.caminho = str(caminho)
+        self.lote = lote
+        self.intervalo = intervalo
+        self._con = sqlite3.connect(self.caminho, check_same_thread=False)
+        self._con.execute("PRAGMA journal_mode=WAL")
+        self._con.execute("PRAGMA synchronous=NORMAL")
+        self._con.executescript(ESQUEMA)
+        self._trava = threading.Lock()
+        self._ids = {}
+        self._pendente = {}  # (jogador, tema, palavra) -> [vistas, vitorias, derrotas, dicas, ultima]
+        self._ultimo_flush = time.monotonic()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fechar()
+
+    def _id(self, nome):
+        i = self._ids.get(nome)
+        if i is None:
+            self._con.execute("INSERT OR IGNORE INTO jogador (nome) VALUES (?)", (nome,))
+            i = self._ids[nome] = self._con.execute(
+                "SELECT id FROM jogador WHERE nome = ?", (nome,)).fetchone()[0]
+        return i
+
+    def registrar(self, jogador, tema, palavra, venceu, dicas=0):
+        """Acumula o resultado de uma rodada; grava quando o lote enche ou o tempo passa."""
+        with self._trava:
+            d = self._pendente.get((jogador, tema, palavra))
+            if d is None:
+                d = self._pendente[(jogador, tema, palavra)] = [0, 0, 0, 0, 0.0]
+            d[0] += 1
+            d[1 if venceu else 2] += 1
+            d[3] += int(dicas)
+            d[4] = time.time()
+            cheio = len(self._pendente) >= self.lote
+            vencido = time.monotonic() - self._ultimo_flush >= self.intervalo
+        if cheio or vencido:
+            self.flush()
+
+    def flush(self):
+        with self._trava:
+            pendente, self._pendente = self._pendente, {}
+            self._ultimo_flush = time.monotonic()
+            if not pendente:
+                return 0
+            with self._con:  # uma transação para o lote inteiro
+                linhas = [(self._id(j), t, p, *d) for (j, t, p), d in pendente.items()]
+                self._con.executemany(UPSERT, linhas)
+            return len(linhas)
+
+    def historico(self, jogador) -> dict:
+        """{(tema, palavra): [vistas, vitorias, derrotas, dicas]} do jogador, incluindo o buffer."""
+        with self._trava:
+            linhas = self._con.execute(
+                "SELECT p.tema, p.palavra, p.vistas, p.vitorias, p.derrotas, p.dicas "
+                "FROM progresso p JOIN jogador j ON j.id = p.jogador WHERE j.nome = ?", (jogador,)).fetchall()
+            hist = {(t, p): [v, vi, de, di] for t, p, v, vi, de, di in linhas}
+            for (j, t, p), d in self._pendente.items():
+                if j == jogador:
+                    h = hist.setdefault((t, p), [0, 0, 0, 0])
+                    for k in range(4):
+                        h[k] += d[k]
+        return hist
+
+    def vistas(self, jogador) -> set:
+        return set(self.historico(jogador))
+
+    def registrar_partida(self, jogador, partida):
+        """Atalho para uma forca_motor.Partida terminada."""
+        self.registrar(jogador, partida.item["tema"], partida.exibida,
+                       partida.resultado is True, int(partida.dica_mostrada))
+
+    def fechar(self):
+        self.flush()
+        self._con.close()
+
+
+def evitar_vistas(banco, vistas):
+    """Predicado para Sorteador.sortear(evitar=...): True se o id já foi visto."""
+    def evitar(i):
+        return banco.chave(i) in vistas
+    return evitar
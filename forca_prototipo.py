@@ -1,9 +1,19 @@
 # -*- coding: utf-8 -*-
-import json, random, unicodedata, re, sys
-from pathlib import Path
+import argparse, json, random, sys
+from contextlib import ExitStack
+
+from forca_banco import abrir_banco
+from forca_candidatos import IndiceCandidatos
+from forca_dia import dia_de, palavra_do_dia, tema_do_dia
+from forca_eventos import ARQ_EVENTOS, FAIXAS, Diario, LogOcupado, codigo_faixa
+from forca_progresso import ARQ_PROGRESSO, Progresso, evitar_vistas
+from forca_recarga import Vigia, trocar
+from forca_revisao import Revisao
+from forca_sorteio import Sorteador
+from forca_solver import ESTRATEGIAS, PALAVRA, Solver
+from forca_motor import Partida, ACERTO, ERRO, INVALIDA, REPETIDA, normalizar
 
 BANCO_ARQUIVO = "banco_palavras.json"
-MAX_ERROS = 6  # cabeça, tronco, braço esq, braço dir, perna esq, perna dir
 
 FORCA_FASES = [
     # 0 erros
@@ -78,30 +88,16 @@ FORCA_FASES = [
 """,
 ]
 
-def normalizar(txt: str) -> str:
-    nfkd = unicodedata.normalize("NFKD", txt)
-    s = "".join(c for c in nfkd if not unicodedata.combining(c))
-    s = s.upper()
-    s = re.sub(r"[^A-Z]", "", s)  # remove espaços, hífens, etc.
-    return s
-
 def carregar_banco(caminho=BANCO_ARQUIVO):
-    p = Path(caminho)
-    if not p.exists():
+    # binário indexado (mmap) se existir; senão o JSON
+    try:
+        return abrir_banco(caminho)
+    except FileNotFoundError:
         print(f"[ERRO] Arquivo {caminho} não encontrado.")
         sys.exit(1)
-    dados = json.loads(p.read_text(encoding="utf-8"))
-    palavras = dados.get("palavras", [])
-    # sanity check
-    if not palavras:
-        print("[ERRO] Banco vazio.")
+    except ValueError as e:  # vazio, JSON quebrado ou item inválido
+        print(f"[ERRO] {e}")
         sys.exit(1)
-    # agrupar por tema
-    por_tema = {}
-    for item in palavras:
-        tema = item["tema"]
-        por_tema.setdefault(tema, []).append(item)
-    return por_tema
 
 def escolher_opcao(titulo, opcoes):
     print(f"\n== {titulo} ==")
@@ -113,89 +109,205 @@ def escolher_opcao(titulo, opcoes):
             return opcoes[int(escolha) - 1]
         print("Ops! Digite um número válido.")
 
-def filtrar_nivel(lista, nivel_escolhido):
-    if nivel_escolhido == "TODOS":
-        return list(lista)
-    return [x for x in lista if x.get("nivel", "A") == nivel_escolhido]
+def filtrar_nivel(banco, tema, nivel_escolhido):
+    # ids dos registros; o banco já guarda os índices por (tema, nível)
+    return banco.indices(tema, nivel_escolhido)
 
-def sortear_palavra(lista, usados_ids):
-    elegiveis = [x for x in lista if (x.get("tema",""), x.get("palavra_exibida","")) not in usados_ids]
-    if not elegiveis:  # reset se esgotar
-        elegiveis = list(lista)
-        usados_ids.clear()
-    return random.choice(elegiveis)
+def sortear_palavra(banco, sorteador, tema, nivel, evitar=None):
+    # sacola por filtro: sem repetição até esgotar, depois reembaralha
+    i = sorteador.sortear(tema, nivel, evitar)
+    return None if i is None else banco.item(i)
 
-def mostrar_estado(palavra_exibida, reveladas, erros, tentadas, dica=None):
+def mostrar_estado(palavra_exibida, reveladas, erros, tentadas, dica=None, sugestao=None):
     print(FORCA_FASES[erros])
     print("Palavra:", " ".join(reveladas))
     print("Tentadas:", " ".join(sorted(tentadas)) if tentadas else "—")
     if dica:
         print("Dica:", dica)
+    if sugestao:
+        print("Dica esperta:", sugestao)
     print("Comandos: '?' para dica | '!' para chutar a palavra inteira | 'sair' para encerrar")
 
-def jogar_partida(item):
-    exibida = item["palavra_exibida"].upper()
-    alvo = normalizar(item["palavra_exibida"])
-    reveladas = ["_" if c.isalpha() else c for c in exibida]
-    tentadas = set()
-    erros = 0
-    dica_mostrada = False
+def dica_esperta(indice, partida):
+    # palavras do tema que ainda cabem no tabuleiro + letra mais comum entre elas
+    c = indice.consultar(partida.padrao(), partida.tentadas, partida.item.get("tema"))
+    letra = c.melhor_letra()
+    if not letra:
+        return None
+    return f"{c.total} palavra(s) do tema cabem aqui; tente a letra {letra}."
+
+def ler_teclado(prompt, partida):
+    return input(prompt)
+
+class JogadorAuto:
+    """Entrada de `jogar_partida` controlada pelo solver (modo --auto)."""
+
+    def __init__(self, solver):
+        self.solver = solver
+        self.partida = None  # última partida jogada (para o resumo)
+        self._chute = None
+
+    def __call__(self, prompt, partida):
+        self.partida = partida
+        if self._chute:
+            palpite, self._chute = self._chute, None
+        else:
+            tipo, valor = self.solver.proxima_jogada(partida.padrao(), partida.tentadas, partida.item.get("tema"))
+            if tipo == PALAVRA:
+                palpite, self._chute = "!", valor
+            else:
+                palpite = valor
+        print(prompt + palpite)
+        return palpite
+
+def jogar_partida(item, indice=None, entrada=ler_teclado, ao_terminar=None, diario=None, faixa=0):
+    # ao_terminar(partida) é chamado em vitória/derrota (não em 'sair');
+    # com diario (forca_eventos), cada jogada vai para o log de eventos
+    partida = Partida(item)
+    ev = diario.rodada(partida, faixa) if diario else None
+    r = _jogar(partida, indice, entrada, ev)
+    if ev and r == "sair":
+        ev.abandonar()
+    if ao_terminar and r != "sair":
+        ao_terminar(partida)
+    return r
 
+def _jogar(partida, indice, entrada, ev):
     while True:
         # mostra dica automática após 2 erros
-        dica_texto = item.get("dica") if (erros >= 2 or dica_mostrada) else None
-        mostrar_estado(exibida, reveladas, erros, tentadas, dica_texto)
+        dica_texto = partida.dica if partida.dica_visivel else None
+        sugestao = dica_esperta(indice, partida) if indice and dica_texto else None
+        mostrar_estado(partida.exibida, partida.reveladas, partida.erros, partida.tentadas, dica_texto, sugestao)
 
-        palpite = input("Letra ou comando: ").strip()
+        palpite = entrada("Letra ou comando: ", partida).strip()
         if palpite.lower() == "sair":
             return "sair"
         if palpite == "?":
-            dica_mostrada = True
+            nova = not partida.dica_mostrada
+            partida.pedir_dica()
+            if ev and nova:
+                ev.dica()
             continue
         if palpite == "!":
-            chute = input("Digite seu palpite para a palavra: ").strip()
-            if normalizar(chute) == alvo:
+            chute = entrada("Digite seu palpite para a palavra: ", partida).strip()
+            acertou = partida.chutar(chute)
+            if ev:
+                ev.chute(acertou)
+            if acertou:
                 return True
-            else:
-                print("Quase! Não foi dessa vez.")
-                erros += 1
+            print("Quase! Não foi dessa vez.")
         else:
             if not palpite:
                 print("Digite uma letra.")
                 continue
-            letra = normalizar(palpite)
-            if len(letra) != 1:
+            r = partida.tentar_letra(palpite)
+            if ev:
+                ev.letra(palpite, r)
+            if r == INVALIDA:
                 print("Digite apenas UMA letra (ou use '!' para chutar a palavra).")
                 continue
-            if letra in tentadas:
+            if r == REPETIDA:
                 print("Você já tentou essa letra.")
                 continue
-            tentadas.add(letra)
-
-            if letra in alvo:
-                # revelar posições respeitando acentos na exibida
-                for i, ch in enumerate(exibida):
-                    if normalizar(ch) == letra:
-                        reveladas[i] = ch
-                if "_" not in reveladas:
+            if r == ACERTO:
+                if partida.resultado:
                     return True
-                else:
-                    print("Boa! Continue assim.")
-            else:
-                erros += 1
+                print("Boa! Continue assim.")
+            elif r == ERRO:
                 print("Não tem essa letra. Tente outra.")
 
-        if erros >= MAX_ERROS:
-            print(FORCA_FASES[erros])
+        if partida.resultado is False:
+            print(FORCA_FASES[partida.erros])
             print("Puxa! Acabaram as chances.")
-            print(f"A palavra era: {exibida}")
+            print(f"A palavra era: {partida.exibida}")
             return False
 
-def loop_jogo():
-    banco_por_tema = carregar_banco()
-    temas = sorted(banco_por_tema.keys())
-    usados = set()  # (tema, palavra_exibida)
+def loop_jogo(semente=None, arq_estado=None, jogador=None, arq_progresso=ARQ_PROGRESSO, arq_revisao=None,
+              arq_eventos=ARQ_EVENTOS, faixa=0, dia=None, chave_dia=None):
+    banco = carregar_banco()
+    temas = list(banco.temas)
+    sorteador = Sorteador(banco, semente)
+    indice = IndiceCandidatos(banco)  # montado só na primeira dica
+    if arq_estado:
+        sorteador.carregar(arq_estado)
+    progresso = evitar = revisao = None
+    fins = []  # chamados com a partida terminada
+    if jogador:
+        # palavras já vistas por esse jogador ficam para depois
+        progresso = Progresso(arq_progresso)
+        vistas = progresso.vistas(jogador)
+        evitar = evitar_vistas(banco, vistas)
+
+        def registrar_progresso(partida):
+            vistas.add((partida.item["tema"], partida.exibida))
+            progresso.registrar_partida(jogador, partida)
+        fins.append(registrar_progresso)
+        print(f"Olá, {jogador}! Você já viu {len(vistas)} palavra(s).")
+    if dia:
+        # palavra do dia: a mesma para todos em (data, tema, nível), no lugar do sorteio
+        def sortear(tema, nivel):
+            recarregar()
+            i = palavra_do_dia(banco, tema, nivel, dia, chave_dia)
+            return None if i is None else banco.item(i)
+
+        def aleatorio(temas):
+            return tema_do_dia(banco, dia, chave_dia)
+        print(f"Palavra do dia ({dia.strftime('%d/%m/%Y')}).")
+    elif arq_revisao:
+        # modo adaptativo: palavras erradas voltam logo, as dominadas espaçam
+        revisao = Revisao(banco, sorteador, arq_revisao)
+
+        def sortear(tema, nivel):
+            recarregar()
+            i = revisao.proxima(tema, nivel)
+            return None if i is None else banco.item(i)
+
+        def registrar_revisao(partida):
+            revisao.registrar(partida.item, partida.resultado is True, partida.dica_mostrada)
+            revisao.salvar()
+        fins.append(registrar_revisao)
+        aleatorio = random.choice
+    else:
+        def sortear(tema, nivel):
+            recarregar()
+            return sortear_palavra(banco, sorteador, tema, nivel, evitar)
+        aleatorio = random.choice
+
+    # banco editado com o jogo aberto: o Vigia prepara o novo numa thread e
+    # ele entra no próximo sorteio, nunca no meio de uma partida
+    vigia = Vigia(BANCO_ARQUIVO, banco, preparar=lambda b: IndiceCandidatos(b).preparar()).iniciar()
+
+    def recarregar():
+        nonlocal banco, indice, evitar
+        r = vigia.pendente()
+        if r is None:
+            return
+        banco, indice = trocar(r, sorteador, revisao, diario), r.extras
+        temas[:] = banco.temas
+        if progresso:
+            evitar = evitar_vistas(banco, vistas)
 
+    def ao_terminar(partida):
+        for f in fins:
+            f(partida)
+    try:
+        diario = Diario(arq_eventos, banco.versao) if arq_eventos else None
+    except LogOcupado as e:
+        print(f"[ERRO] {e}")
+        sys.exit(1)
+
+    def jogar(item):
+        return jogar_partida(item, indice, ao_terminar=ao_terminar, diario=diario, faixa=faixa)
+    try:
+        _loop(temas, sorteador, arq_estado, sortear, jogar, aleatorio)
+    finally:
+        vigia.parar()
+        if progresso:
+            progresso.fechar()
+        if diario:
+            diario.fechar()
+
+def _loop(temas, sorteador, arq_estado, sortear, jogar, aleatorio=random.choice):
     print("\n🎉 Bem-vindo ao Jogo da Forca! (versão educativa 6+)")
     while True:
         tema = escolher_opcao("Escolha um tema", temas + ["ALEATÓRIO", "SAIR"])
@@ -203,18 +315,18 @@ def loop_jogo():
             print("Até logo! 👋")
             break
         if tema == "ALEATÓRIO":
-            tema = random.choice(temas)
+            tema = aleatorio(temas)
 
         niveis = ["A", "B", "C", "TODOS"]
         nivel = escolher_opcao("Escolha o nível", niveis)
 
-        lista_base = filtrar_nivel(banco_por_tema[tema], nivel)
-        if not lista_base:
+        item = sortear(tema, nivel)
+        if item is None:
             print("Não há palavras para esse filtro. Tente outra combinação.")
             continue
-
-        item = sortear_palavra(lista_base, usados)
-        resultado = jogar_partida(item)
+        if arq_estado:
+            sorteador.salvar(arq_estado)
+        resultado = jogar(item)
 
         if resultado == "sair":
             print("Jogo encerrado. Até a próxima! 👋")
@@ -225,13 +337,192 @@ def loop_jogo():
         else:
             print("Boa tentativa! Vamos para a próxima. 💪")
 
-        usados.add((item["tema"], item["palavra_exibida"]))
 
         de_novo = escolher_opcao("Jogar outra?", ["SIM", "NÃO"])
         if de_novo == "NÃO":
             print("Obrigado por jogar! 👋")
             break
 
+def jogar_automatico(estrategia, rodadas, tema=None, nivel="TODOS", semente=None):
+    # o computador joga contra si mesmo; ao final, um resumo das rodadas
+    banco = carregar_banco()
+    try:
+        solver = Solver(banco, estrategia)
+    except RuntimeError as e:
+        print(f"[ERRO] {e}")
+        sys.exit(1)
+    sorteador = Sorteador(banco, semente)
+    rng = random.Random(semente)
+    jogador = JogadorAuto(solver)
+    vitorias = erros = jogadas = 0
+    for _ in range(rodadas):
+        t = tema or rng.choice(banco.temas)
+        item = sortear_palavra(banco, sorteador, t, nivel)
+        if item is None:
+            print("Não há palavras para esse filtro. Tente outra combinação.")
+            return
+        print(f"\n== Rodada automática: {t} / nível {nivel} ==")
+        if jogar_partida(item, entrada=jogador) is True:
+            print(f"Acertou: {item['palavra_exibida']} 🎉")
+            vitorias += 1
+        jogadas += 1
+        erros += jogador.partida.erros
+    print(f"\nResumo ({estrategia}): {vitorias}/{jogadas} vitórias, {erros / jogadas:.2f} erros por rodada.")
+
+# ===== modo lote (sessões roteirizadas, sem terminal) =====
+# Uma sessão por linha, em JSON ou texto:
+#   {"tema": "animais", "nivel": "A", "palpites": ["a", "e", "?", "!gato"], "palavra": "GATO"}
+#   animais A a e ? !gato
+# "palavra" (opcional) fixa a palavra; sem ela, sorteia como o jogo normal
+# (ou, com --dia, usa a palavra do dia do tema/nível).
+# Cada sessão gera uma linha JSON com o resultado; nada de arte ASCII.
+
+def ler_roteiro(linha):
+    linha = linha.strip()
+    if linha.startswith("{"):
+        r = json.loads(linha)
+        if not isinstance(r, dict):
+            raise ValueError("esperado um objeto JSON")
+        tema, nivel = r.get("tema") or "ALEATÓRIO", r.get("nivel") or "TODOS"
+        palpites, palavra = r.get("palpites", []), r.get("palavra")
+        # tipos conferidos aqui: um valor errado vira a linha de erro, não derruba o lote
+        for campo, valor in (("tema", tema), ("nivel", nivel)):
+            if not isinstance(valor, str):
+                raise ValueError(f"'{campo}' deve ser texto")
+        if palavra is not None and not isinstance(palavra, str):
+            raise ValueError("'palavra' deve ser texto")
+        if not isinstance(palpites, list) or not all(isinstance(p, str) for p in palpites):
+            raise ValueError("'palpites' deve ser uma lista de textos")
+        return tema, nivel, palpites, palavra
+    partes = linha.split()
+    if len(partes) < 2:
+        raise ValueError("esperado 'tema nivel palpites...' ou um objeto JSON")
+    return partes[0], partes[1], partes[2:], None
+
+def jogar_roteiro(item, palpites):
+    # mesmas regras de jogar_partida, sem entrada nem saída
+    partida = Partida(item)
+    jogadas = invalidas = 0
+    for palpite in palpites:
+        if partida.terminada or palpite.lower() == "sair":
+            break
+        jogadas += 1
+        if palpite == "?":
+            partida.pedir_dica()
+        elif palpite.startswith("!"):
+            partida.chutar(palpite[1:])
+        elif partida.tentar_letra(palpite) in (INVALIDA, REPETIDA):
+            invalidas += 1
+    return {
+        "palavra": partida.exibida,
+        "resultado": partida.resultado,
+        "erros": partida.erros,
+        "reveladas": "".join(partida.reveladas),
+        "tentadas": "".join(sorted(partida.tentadas)),
+        "dica": partida.dica_mostrada,
+        "jogadas": jogadas,
+        "invalidas": invalidas,
+    }
+
+def modo_lote(entrada, saida, semente=None, lote=1000, dia=None, chave_dia=None):
+    banco = carregar_banco()
+    sorteador = Sorteador(banco, semente)
+    rng = random.Random(semente)
+    por_palavra = None  # (tema, forma normalizada) -> id, montado se alguma sessão fixar a palavra
+    buffer = []
+    try:
+        for n, linha in enumerate(entrada, 1):
+            if not linha.strip() or linha.lstrip().startswith("#"):
+                continue
+            try:
+                tema, nivel, palpites, palavra = ler_roteiro(linha)
+            except ValueError as e:
+                res = {"erro": f"linha inválida: {e}"}
+            else:
+                if tema in ("ALEATÓRIO", "ALEATORIO"):
+                    tema = tema_do_dia(banco, dia, chave_dia) if dia else rng.choice(banco.temas)
+                if palavra:
+                    if por_palavra is None:
+                        por_palavra = {}
+                        for i in range(len(banco)):
+                            it = banco.item(i)
+                            por_palavra[(it["tema"], normalizar(it["palavra_exibida"]))] = i
+                    i = por_palavra.get((tema, normalizar(palavra)))
+                    item = None if i is None else banco.item(i)
+                elif dia:
+                    i = palavra_do_dia(banco, tema, nivel, dia, chave_dia)
+                    item = None if i is None else banco.item(i)
+                else:
+                    item = sortear_palavra(banco, sorteador, tema, nivel)
+                if item is None:
+                    res = {"erro": "sem palavra para esse filtro"}
+                else:
+                    res = jogar_roteiro(item, palpites)
+                res = {"tema": tema, "nivel": nivel, **res}
+            buffer.append(json.dumps({"linha": n, **res}, ensure_ascii=False))
+            if len(buffer) >= lote:
+                saida.write("\n".join(buffer) + "\n")
+                buffer.clear()
+    finally:
+        # o que já foi jogado sai mesmo se uma linha derrubar o lote
+        if buffer:
+            saida.write("\n".join(buffer) + "\n")
+
+def inteiro_positivo(texto):
+    # tipo do argparse para contagens (--rodadas 0 dividiria por zero no resumo)
+    try:
+        n = int(texto)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"inteiro inválido: {texto!r}")
+    if n < 1:
+        raise argparse.ArgumentTypeError(f"deve ser pelo menos 1: {n}")
+    return n
+
 if __name__ == "__main__":
-    random.seed()  # semente do sistema
-    loop_jogo()
+    ap = argparse.ArgumentParser(description="Jogo da Forca no terminal.")
+    ap.add_argument("--semente", type=int, help="semente do sorteio (partidas reproduzíveis)")
+    ap.add_argument("--estado", help="arquivo JSON para salvar/restaurar a rotação de palavras")
+    ap.add_argument("--auto", nargs="?", const="informacao", choices=ESTRATEGIAS,
+                    help="o computador joga sozinho (solver; padrão: informacao)")
+    ap.add_argument("--rodadas", type=inteiro_positivo, default=10, help="rodadas no modo --auto")
+    ap.add_argument("--tema", help="tema fixo no modo --auto (padrão: aleatório)")
+    ap.add_argument("--nivel", default="TODOS", choices=["A", "B", "C", "TODOS"], help="nível no modo --auto")
+    ap.add_argument("--jogador", help="nome do jogador: guarda o progresso e evita palavras já vistas")
+    ap.add_argument("--progresso", default=ARQ_PROGRESSO, help="arquivo SQLite do progresso dos jogadores")
+    sorteio = ap.add_mutually_exclusive_group()  # a palavra do dia não passa pela agenda da revisão
+    sorteio.add_argument("--revisao", help="modo adaptativo (repetição espaçada); agenda salva neste arquivo JSON")
+    ap.add_argument("--eventos", help=f"log binário de eventos das partidas (padrão: {ARQ_EVENTOS})")
+    ap.add_argument("--sem-eventos", action="store_true", help="não grava o log de eventos")
+    ap.add_argument("--faixa", choices=FAIXAS[1:], help="faixa etária do jogador (vai para o log de eventos)")
+    ap.add_argument("--lote", metavar="ARQ",
+                    help="roda sessões roteirizadas deste arquivo ('-' = stdin) e escreve uma linha JSON por rodada")
+    ap.add_argument("--saida", help="arquivo para as linhas JSON do --lote (padrão: stdout)")
+    sorteio.add_argument("--dia", nargs="?", const="", metavar="AAAA-MM-DD",
+                    help="palavra do dia: a mesma para todos em cada tema/nível (sem data: hoje)")
+    ap.add_argument("--chave-dia", help="chave da palavra do dia (padrão: variável FORCA_CHAVE_DIA)")
+    args = ap.parse_args()
+    random.seed(args.semente)  # sem --semente: semente do sistema
+    dia = None
+    if args.dia is not None:
+        try:
+            dia = dia_de(args.dia)
+        except ValueError:
+            print(f"[ERRO] Data inválida: {args.dia} (use AAAA-MM-DD).")
+            sys.exit(1)
+    if args.lote:
+        # o lote não grava progresso, revisão, rotação nem eventos: recusa em vez de ignorar
+        sem_lote = [op for op, valor in (("--jogador", args.jogador), ("--revisao", args.revisao),
+                                         ("--estado", args.estado), ("--eventos", args.eventos),
+                                         ("--faixa", args.faixa)) if valor]
+        if sem_lote:
+            print(f"[ERRO] {', '.join(sem_lote)} não vale com --lote.")
+            sys.exit(1)
+        with ExitStack() as abertos:  # fecha só o que foi aberto aqui, nunca stdin/stdout
+            entrada = sys.stdin if args.lote == "-" else abertos.enter_context(open(args.lote, encoding="utf-8"))
+            saida = abertos.enter_context(open(args.saida, "w", encoding="utf-8")) if args.saida else sys.stdout
+            modo_lote(entrada, saida, args.semente, dia=dia, chave_dia=args.chave_dia)
+    elif args.auto:
+        jogar_automatico(args.auto, args.rodadas, args.tema, args.nivel, args.semente)
+    else:
+        loop_jogo(args.semente, args.estado, args.jogador, args.progresso, args.revisao,
+                  None if args.sem_eventos else args.eventos or ARQ_EVENTOS, codigo_faixa(args.faixa), dia, args.chave_dia)
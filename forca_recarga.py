@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+"""
+Recarga do banco de palavras com o jogo aberto.
+
+`Vigia` consulta numa thread o mtime/tamanho do JSON do banco e do binário
+ao lado. Quando mudam e ficam estáveis por uma consulta (gera_banco troca
+os arquivos um de cada vez), a thread confere o conteúdo (sha1 dos dois
+arquivos): regravar os mesmos bytes ou só tocar o arquivo não recarrega.
+Se mudou, a própria thread abre o banco novo e monta o que é caro:
+índices, o mapa de chaves estáveis e os extras do front-end (`preparar`,
+ex.: IndiceCandidatos). A `versao` do banco vai no aviso; conteúdo novo
+com a mesma versão recarrega assim mesmo, com um [AVISO] para o curador.
+
+O resultado fica pendente até o front-end pedi-lo com `pendente()` antes de
+sortear a próxima palavra e aplicá-lo com `trocar()`:
+
+- a partida em andamento fica com o item que já tem; nenhuma letra espera
+  pela recarga;
+- o Sorteador migra cada sacola pela chave (tema, palavra_exibida) no
+  próximo sorteio daquele filtro, e a Revisao reencontra os cartões pelo
+  mesmo mapa de chaves;
+- o Diario (forca_eventos) desce o que tem no buffer e passa a anotar a
+  versão nova no cabeçalho; os eventos já usam a mesma chave, então as
+  rodadas de antes e de depois da troca continuam legíveis.
+
+Um JSON inválido (curador no meio da edição) só gera aviso: o banco atual
+continua até o arquivo mudar de novo.
+"""
+import hashlib
+import threading
+from pathlib import Path
+
+from forca_banco import abrir_banco, caminho_binario, mapa_chaves
+
+INTERVALO_VIGIA = 2.0  # segundos entre consultas
+
+
+class Recarga:
+    """Banco novo pronto para a troca."""
+
+    __slots__ = ("banco", "chaves", "extras")
+
+    def __init__(self, banco, chaves, extras=None):
+        self.banco = banco
+        self.chaves = chaves
+        self.extras = extras
+
+
+class Vigia:
+    """Observa o arquivo do banco e prepara a recarga fora da thread do jogo."""
+
+    __slots__ = ("caminho", "versao", "intervalo", "preparar", "_assinatura", "_vista", "_conteudo", "_pronta",
+                 "_trava", "_parar", "_thread")
+
+    def __init__(self, caminho_json, banco, intervalo=INTERVALO_VIGIA, preparar=None):
+        self.caminho = Path(caminho_json)
+        self.versao = banco.versao
+        self.intervalo = intervalo
+        self.preparar = preparar  # preparar(banco) -> extras, rodado na thread
+        self._assinatura = self._vista = self._ler_assinatura()
+        self._conteudo = self._ler_conteudo()
+        self._pronta = None
+        self._trava = threading.Lock()
+        self._parar = threading.Event()
+        self._thread = None
+
+    def _ler_assinatura(self):
+        assinatura = []
+        for p in (self.caminho, caminho_binario(self.caminho)):
+            try:
+                st = p.stat()
+                assinatura.append((st.st_mtime_ns, st.st_size))
+            except OSError:
+                assinatura.append(None)
+        return tuple(assinatura)
+
+    def _ler_conteudo(self):
+        h = hashlib.sha1()
+        for p in (self.caminho, caminho_binario(self.caminho)):
+            try:
+                h.update(p.read_bytes())
+            except OSError:
+                pass
+            h.update(b"\0")
+        return h.digest()
+
+    def iniciar(self):
+        self._thread = threading.Thread(target=self._rodar, name="vigia-banco", daemon=True)
+        self._thread.start()
+        return self
+
+    def parar(self):
+        self._parar.set()
+
+    def _rodar(self):
+        while not self._parar.wait(self.intervalo):
+            self.verificar()
+
+    def verificar(self) -> bool:
+        """Uma consulta; True se um banco novo ficou pronto."""
+        assinatura = self._ler_assinatura()
+        if assinatura == self._assinatura or assinatura != self._vista:
+            self._vista = assinatura  # igual ao atual, ou ainda mudando
+            return False
+        self._assinatura = assinatura
+        conteudo = self._ler_conteudo()
+        if conteudo == self._conteudo:
+            return False  # mesmos bytes (regravado ou só tocado)
+        try:
+            novo = abrir_banco(self.caminho)
+            r = Recarga(novo, mapa_chaves(novo), self.preparar(novo) if self.preparar else None)
+        except (OSError, ValueError) as e:
+            print(f"[AVISO] Banco {self.caminho} não recarregado: {e}")
+            return False
+        self._conteudo = conteudo
+        if novo.versao == self.versao:
+            print(f"[AVISO] Banco {self.caminho} mudou sem mudar a versão ({self.versao or '?'}).")
+        print(f"[BANCO] {self.caminho} recarregado: versão {self.versao or '?'} -> {novo.versao or '?'}, "
+              f"{len(novo)} palavras.")
+        self.versao = novo.versao
+        with self._trava:
+            self._pronta = r
+        return True
+
+    def pendente(self):
+        """Recarga pronta (só uma vez) ou None; barato para chamar a cada rodada."""
+        if self._pronta is None:
+            return None
+        with self._trava:
+            r, self._pronta = self._pronta, None
+        return r
+
+
+def trocar(recarga, sorteador, revisao=None, diario=None):
+    """Aplica a recarga ao Sorteador (e à Revisao, que divide o mesmo sorteador) e avisa o Diario."""
+    sorteador.trocar_banco(recarga.banco)
+    if revisao:
+        revisao.trocar_banco(recarga.banco, recarga.chaves)
+    if diario:
+        diario.trocar_banco(recarga.banco.versao)
+    return recarga.banco
@@ -0,0 +1,204 @@
+# -*- coding: utf-8 -*-
+"""
+Modo adaptativo (repetição espaçada) para escolher a próxima palavra.
+
+Cada palavra já jogada vira um "cartão" com a rodada em que deve voltar:
+errou, volta logo (INTERVALO_ERRO rodadas); acertou, o intervalo cresce
+pela facilidade do cartão (que sobe com acertos limpos e cai com erros e
+dicas). Palavras dominadas aparecem cada vez menos.
+
+- Um heap por filtro (tema, nível) e (tema, TODOS) ordenado pela rodada de
+  vencimento: escolher e atualizar custam O(log n). Atualizar só empilha
+  a nova entrada; as antigas são descartadas quando chegam ao topo
+  (remoção preguiçosa) e os heaps são reconstruídos se o lixo crescer.
+- Sem cartão vencido no filtro, entra uma palavra nova pelo Sorteador
+  (sacola sem repetição, com no máximo TENTATIVAS_EVITAR tiradas extras
+  atrás de uma não vista, então a escolha fica em O(log n)); se nenhuma
+  nova aparecer, volta o cartão que vence primeiro.
+- O relógio conta rodadas, não horas: o ritmo acompanha quanto a criança
+  joga.
+
+Os cartões são identificados por (tema, palavra_exibida); o id do registro
+é só um atalho, conferido e recalculado se o banco tiver sido regerado.
+O estado é salvo em JSON (gravação atômica) e os heaps são remontados com
+heapify ao carregar.
+"""
+import heapq
+import json
+import os
+from pathlib import Path
+
+from forca_banco import mapa_chaves
+from forca_sorteio import Sorteador
+
+INTERVALO_ERRO = 2
+INTERVALO_INICIAL = 4
+FACILIDADE_INICIAL = 2.5
+FACILIDADE_MIN = 1.3
+FACILIDADE_MAX = 3.0
+
+
+class Cartao:
+    __slots__ = ("id", "nivel", "vence", "intervalo", "facilidade", "acertos", "erros", "seq")
+
+    def __init__(self, id, nivel, vence=0, intervalo=0, facilidade=FACILIDADE_INICIAL, acertos=0, erros=0, seq=0):
+        self.id = id
+        self.nivel = nivel
+        self.vence = vence
+        self.intervalo = intervalo
+        self.facilidade = facilidade
+        self.acertos = acertos
+        self.erros = erros
+        self.seq = seq
+
+
+class Revisao:
+    """Agenda de revisão sobre um banco (BancoBinario ou Banco)."""
+
+    __slots__ = ("banco", "sorteador", "caminho", "relogio", "_seq", "_cartoes", "_heaps", "_contagem", "_entradas",
+                 "_ids")
+
+    def __init__(self, banco, sorteador=None, caminho=None):
+        self.banco = banco
+        self.sorteador = sorteador or Sorteador(banco)
+        self.caminho = caminho
+        self.relogio = 0  # rodadas jogadas
+        self._seq = 0
+        self._cartoes = {}  # (tema, palavra) -> Cartao
+        self._heaps = {}  # (tema, nivel) -> [(vence, seq, chave)]
+        self._contagem = {}  # (tema, nivel) -> cartões no filtro
+        self._entradas = 0  # total empilhado (vivas + velhas)
+        self._ids = None  # (tema, palavra) -> id, montado só se o banco mudou
+        if caminho:
+            self.carregar(caminho)
+
+    def __len__(self):
+        return len(self._cartoes)
+
+    # ===== escolha =====
+    def proxima(self, tema, nivel="TODOS"):
+        """Id do próximo registro para (tema, nível), ou None se o filtro for vazio."""
+        heap = self._heaps.get((tema, nivel))
+        topo = self._topo(heap)
+        while topo is not None and self._id(topo[2]) is None:
+            self._descartar(topo[2])  # palavra saiu do banco
+            topo = self._topo(heap)
+        if topo is not None and topo[0] <= self.relogio:
+            return self._id(topo[2])
+        if self._contagem.get((tema, nivel), 0) < len(self.banco.indices(tema, nivel)):
+            i = self.sorteador.sortear(tema, nivel, self._visto)
+            if i is not None and not self._visto(i):
+                return i
+        return None if topo is None else self._id(topo[2])
+
+    def _topo(self, heap):
+        while heap:
+            vence, seq, chave = heap[0]
+            c = self._cartoes.get(chave)
+            if c is not None and c.seq == seq:
+                return heap[0]
+            heapq.heappop(heap)
+            self._entradas -= 1
+        return None
+
+    def _visto(self, i):
+        return self.banco.chave(i) in self._cartoes
+
+    def _id(self, chave):
+        c = self._cartoes[chave]
+        if c.id < len(self.banco) and self.banco.chave(c.id) == chave:
+            return c.id
+        if self._ids is None:  # banco regerado: ids mudaram
+            self._ids = mapa_chaves(self.banco)
+        i = self._ids.get(chave)
+        if i is not None:
+            c.id = i
+        return i
+
+    def _descartar(self, chave):
+        c = self._cartoes.pop(chave)
+        for filtro in self._filtros(chave[0], c.nivel):
+            self._contagem[filtro] -= 1
+
+    def trocar_banco(self, novo, chaves=None):
+        """Passa para um banco recarregado; `chaves` (mapa_chaves de `novo`) evita remontar o mapa aqui."""
+        self.banco = novo
+        self._ids = chaves
+
+    # ===== resultado =====
+    def registrar(self, item, venceu, dica=False):
+        """Atualiza o cartão da palavra jogada e avança o relógio."""
+        self.relogio += 1
+        chave = (item["tema"], item["palavra_exibida"])
+        c = self._cartoes.get(chave)
+        if c is None:
+            c = self._cartoes[chave] = Cartao(item["id"], item.get("nivel", "A"))
+            for filtro in self._filtros(chave[0], c.nivel):
+                self._contagem[filtro] = self._contagem.get(filtro, 0) + 1
+        if venceu:
+            c.acertos += 1
+            if dica:
+                c.facilidade = max(FACILIDADE_MIN, c.facilidade - 0.15)
+            else:
+                c.facilidade = min(FACILIDADE_MAX, c.facilidade + 0.1)
+            c.intervalo = INTERVALO_INICIAL if c.intervalo <= INTERVALO_ERRO else round(c.intervalo * c.facilidade)
+        else:
+            c.erros += 1
+            c.facilidade = max(FACILIDADE_MIN, c.facilidade - 0.2)
+            c.intervalo = INTERVALO_ERRO
+        c.vence = self.relogio + c.intervalo
+        self._seq += 1
+        c.seq = self._seq
+        self._empilhar(chave, c)
+        if self._entradas > 4 * len(self._cartoes) + 1024:
+            self._remontar()
+
+    @staticmethod
+    def _filtros(tema, nivel):
+        return ((tema, nivel), (tema, "TODOS"))
+
+    def _empilhar(self, chave, c):
+        for filtro in self._filtros(chave[0], c.nivel):
+            heapq.heappush(self._heaps.setdefault(filtro, []), (c.vence, c.seq, chave))
+            self._entradas += 1
+
+    def _remontar(self):
+        self._heaps, self._contagem = {}, {}
+        for chave, c in self._cartoes.items():
+            for filtro in self._filtros(chave[0], c.nivel):
+                self._heaps.setdefault(filtro, []).append((c.vence, c.seq, chave))
+                self._contagem[filtro] = self._contagem.get(filtro, 0) + 1
+        for heap in self._heaps.values():
+            heapq.heapify(heap)
+        self._entradas = 2 * len(self._cartoes)
+
+    # ===== persistência =====
+    def estado(self) -> dict:
+        return {
+            "relogio": self.relogio,
+            "seq": self._seq,
+            "cartoes": [
+                [t, p, c.id, c.nivel, c.vence, c.intervalo, c.facilidade, c.acertos, c.erros, c.seq]
+                for (t, p), c in self._cartoes.items()
+            ],
+        }
+
+    def restaurar(self, estado: dict):
+        self.relogio = estado["relogio"]
+        self._seq = estado["seq"]
+        self._cartoes = {(t, p): Cartao(*resto) for t, p, *resto in estado["cartoes"]}
+        self._ids = None
+        self._remontar()
+
+    def salvar(self, caminho=None):
+        caminho = Path(caminho or self.caminho)
+        tmp = caminho.with_name(caminho.name + ".tmp")
+        tmp.write_text(json.dumps(self.estado(), ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp, caminho)
+
+    def carregar(self, caminho) -> bool:
+        p = Path(caminho)
+        if not p.exists():
+            return False
+        self.restaurar(json.loads(p.read_text(encoding="utf-8")))
+        return True
@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+"""
+Jogador automático (solver) vetorizado com NumPy.
+
+As formas normalizadas do banco viram uma matriz uint8 (1..26 = A..Z,
+0 = preenchimento), agrupada por comprimento. Filtrar as palavras que
+ainda cabem no tabuleiro e pontuar as letras são operações sobre essa
+matriz, sem laços Python por palavra.
+
+Estratégias:
+- "frequencia": letra presente no maior número de candidatas
+- "informacao": letra que mais divide as candidatas (entropia do padrão
+  de posições reveladas); empate decidido pela frequência
+
+NumPy é dependência opcional: só quem usa o solver precisa dela.
+"""
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - depende do ambiente
+    np = None
+
+ESTRATEGIAS = ("frequencia", "informacao")
+PALAVRA = "palavra"
+LETRA = "letra"
+
+
+def _codigos(txt: str):
+    return np.frombuffer(txt.encode("ascii"), dtype=np.uint8) - 64
+
+
+class Solver:
+    """Escolhe o próximo palpite olhando só para o tabuleiro (padrão + tentadas)."""
+
+    __slots__ = ("estrategia", "_grupos", "_cod_tema")
+
+    def __init__(self, banco, estrategia="informacao", formas=None, temas=None):
+        if np is None:
+            raise RuntimeError("O solver precisa do NumPy (pip install numpy).")
+        if estrategia not in ESTRATEGIAS:
+            raise ValueError(f"Estratégia desconhecida: {estrategia}")
+        self.estrategia = estrategia
+        if formas is None:
+            itens = [banco.item(i) for i in range(len(banco))]
+            formas = [it["forma_normalizada"] for it in itens]
+            temas = [it["tema"] for it in itens]
+
+        # um grupo por comprimento: (ids, matriz k x L, presença k x 27, código do tema)
+        self._cod_tema = {}
+        if temas is not None:
+            temas = [self._cod_tema.setdefault(t, len(self._cod_tema)) for t in temas]
+        por_L = {}
+        for i, f in enumerate(formas):
+            por_L.setdefault(len(f), []).append(i)
+        self._grupos = {}
+        for L, ids in por_L.items():
+            if not L:
+                continue
+            m = np.frombuffer("".join(formas[i] for i in ids).encode("ascii"), dtype=np.uint8)
+            m = (m - 64).reshape(len(ids), L)
+            presenca = np.zeros((len(ids), 27), dtype=bool)
+            presenca[np.arange(len(ids))[:, None], m] = True
+            t = np.array([temas[i] for i in ids], dtype=np.int32) if temas is not None else None
+            self._grupos[L] = (np.array(ids, dtype=np.int64), m, presenca, t)
+
+    def candidatas(self, padrao: str, tentadas=(), tema=None):
+        """Devolve (ids, matriz, presença) das palavras compatíveis com o tabuleiro."""
+        g = self._grupos.get(len(padrao))
+        if g is None:
+            return None
+        ids, m, presenca, temas = g
+        cod = _codigos(padrao.replace("_", "@"))  # "_" -> 0
+        reveladas = cod > 0
+        ok = (m[:, reveladas] == cod[reveladas]).all(axis=1)
+        if tentadas:
+            t = _codigos("".join(tentadas))
+            ok &= ~np.isin(m[:, ~reveladas], t).any(axis=1)
+        if tema is not None and temas is not None:
+            ok &= temas == self._cod_tema.get(tema, -1)
+        return ids[ok], m[ok], presenca[ok]
+
+    def pontuar(self, m, presenca, tentadas=()):
+        """Pontuação por letra (índice 1..26); letras tentadas ficam com -1."""
+        freq = presenca.sum(axis=0).astype(np.float64)
+        freq[0] = -1
+        if tentadas:
+            freq[_codigos("".join(tentadas))] = -1
+        if self.estrategia == "frequencia" or len(m) <= 1:
+            return freq
+        pesos = np.left_shift(np.int64(1), np.arange(m.shape[1], dtype=np.int64))
+        total = len(m)
+        pontos = np.full(27, -1.0)
+        for letra in np.flatnonzero(freq > 0):
+            # padrão de posições onde a letra aparece, um inteiro por candidata
+            chave = (m == letra) @ pesos
+            _, contagem = np.unique(chave, return_counts=True)
+            p = contagem / total
+            # entropia + desempate pela frequência
+            pontos[letra] = -(p * np.log2(p)).sum() + freq[letra] / (total * 1e3)
+        return pontos
+
+    def proxima_jogada(self, padrao: str, tentadas=(), tema=None):
+        """(LETRA, "E") ou (PALAVRA, "GATO") quando só sobra uma candidata."""
+        c = self.candidatas(padrao, tentadas, tema)
+        if c is None or not len(c[0]):
+            if tema is not None:
+                return self.proxima_jogada(padrao, tentadas)  # fora do tema? tenta no banco todo
+            return LETRA, _letra_livre(tentadas)
+        ids, m, presenca = c
+        if len(ids) == 1:
+            return PALAVRA, (m[0] + 64).tobytes().decode("ascii")
+        pontos = self.pontuar(m, presenca, tentadas)
+        melhor = int(pontos.argmax())
+        if pontos[melhor] <= 0:
+            return LETRA, _letra_livre(tentadas)
+        return LETRA, chr(64 + melhor)
+
+
+def _letra_livre(tentadas):
+    for ch in "AEOSRINDMUTCLPVGHQBFZJXKWY":
+        if ch not in tentadas:
+            return ch
+    return "A"
@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+"""
+Sorteio de palavras sem repetição por filtro (tema, nível).
+
+Cada filtro tem uma "sacola" embaralhada aos poucos (Fisher-Yates
+preguiçoso): só as posições já trocadas ficam guardadas num dicionário,
+então encher a sacola e tirar uma palavra custam O(1), não importa o
+tamanho do tema. Quando a sacola esvazia, ela é reembaralhada.
+
+`evitar` (opcional) pula ids que o jogador já viu (forca_progresso): tira
+até TENTATIVAS_EVITAR palavras a mais da sacola atual procurando uma nova,
+e as puladas voltam para a sacola (continuam na rotação). Se nenhuma das
+tiradas for nova, aceita a primeira: com quase todo o filtro visto, um
+sorteio pode repetir uma palavra vista mesmo restando novas, mas custa
+O(TENTATIVAS_EVITAR), e não O(n) com a sacola reembaralhada.
+
+O estado (semente do gerador + sacolas) pode ser salvo em JSON e
+restaurado, para repetir sequências ou continuar a rotação entre execuções.
+
+Com o banco recarregado em execução (forca_recarga), `trocar_banco` só
+anota o banco antigo de cada sacola; ela migra no próximo sorteio do seu
+filtro, pela chave estável (tema, palavra): o que já saiu continua fora e
+palavras novas do filtro entram na sacola.
+"""
+import json
+import random
+from pathlib import Path
+
+TENTATIVAS_EVITAR = 8  # tiradas extras por sorteio atrás de uma palavra não vista
+
+
+class Sorteador:
+    """Sacolas embaralhadas por (tema, nível) sobre os índices do banco."""
+
+    __slots__ = ("banco", "_rng", "_sacolas", "_origem")
+
+    def __init__(self, banco, semente=None):
+        self.banco = banco
+        self._rng = random.Random(semente)
+        self._sacolas = {}  # (tema, nivel) -> [restantes, {posição: posição trocada}]
+        self._origem = {}  # (tema, nivel) -> banco antigo da sacola, até ela migrar
+
+    def sortear(self, tema, nivel="TODOS", evitar=None):
+        """Devolve o id do próximo registro do filtro, ou None se o filtro for vazio."""
+        ids = self.banco.indices(tema, nivel)
+        if not ids:
+            return None
+        p = self._tirar(tema, nivel, ids)
+        if evitar is None or not evitar(ids[p]):
+            return ids[p]
+        # só dentro da sacola atual (sem reembaralhar no meio) e com limite
+        puladas = [p]
+        for _ in range(min(TENTATIVAS_EVITAR, self._sacolas[(tema, nivel)][0])):
+            p = self._tirar(tema, nivel, ids)
+            if not evitar(ids[p]):
+                break
+            puladas.append(p)
+        else:
+            p = puladas.pop(0)  # todas vistas: fica a primeira
+        for q in puladas:
+            self._devolver(tema, nivel, q)
+        return ids[p]
+
+    def _tirar(self, tema, nivel, ids):
+        """Posição (em `ids`) tirada da sacola do filtro."""
+        if self._origem and (tema, nivel) in self._origem:
+            self._migrar(tema, nivel)
+        sacola = self._sacolas.get((tema, nivel))
+        if sacola is None or sacola[0] <= 0:  # vazia: reembaralha
+            sacola = self._sacolas[(tema, nivel)] = [len(ids), {}]
+        n, trocas = sacola
+        j = self._rng.randrange(n)
+        n -= 1
+        escolhido = trocas.get(j, j)
+        ultimo = trocas.pop(n, n)
+        if j != n:
+            trocas[j] = ultimo
+        sacola[0] = n
+        return escolhido
+
+    def _devolver(self, tema, nivel, posicao):
+        """Põe de volta na sacola uma posição recém-tirada (vai para o fim dela)."""
+        sacola = self._sacolas[(tema, nivel)]
+        n, trocas = sacola
+        if posicao != n:
+            trocas[n] = posicao
+        sacola[0] = n + 1
+
+    def restantes(self, tema, nivel="TODOS") -> int:
+        if (tema, nivel) in self._origem:
+            self._migrar(tema, nivel)
+        sacola = self._sacolas.get((tema, nivel))
+        return sacola[0] if sacola else len(self.banco.indices(tema, nivel))
+
+    # ===== troca de banco =====
+    def trocar_banco(self, novo):
+        """Passa a sortear de `novo`; as sacolas migram sob demanda (ver _migrar)."""
+        for filtro in self._sacolas:
+            self._origem.setdefault(filtro, self.banco)
+        self.banco = novo
+
+    def _migrar(self, tema, nivel):
+        antigo = self._origem.pop((tema, nivel))
+        n, trocas = self._sacolas.pop((tema, nivel))
+        velhos = antigo.indices(tema, nivel)
+        restam = {velhos[trocas.get(k, k)] for k in range(n)}
+        sairam = {antigo.chave(i) for i in velhos if i not in restam}
+        ids = self.banco.indices(tema, nivel)
+        fora = [p for p, i in enumerate(ids) if self.banco.chave(i) in sairam]
+        n = len(ids) - len(fora)
+        if not fora or n <= 0:
+            return  # sacola cheia: a próxima é montada do zero
+        # posições 0..n-1 da sacola = todas menos `fora`: cada posição de
+        # `fora` abaixo de n troca com uma livre de n em diante
+        excluidas = set(fora)
+        livres = (p for p in range(n, len(ids)) if p not in excluidas)
+        self._sacolas[(tema, nivel)] = [n, {p: next(livres) for p in fora if p < n}]
+
+    # ===== persistência =====
+    def estado(self) -> dict:
+        for tema, nivel in list(self._origem):
+            self._migrar(tema, nivel)
+        versao, interno, gauss = self._rng.getstate()
+        return {
+            "rng": [versao, list(interno), gauss],
+            "sacolas": [
+                [tema, nivel, n, [[k, v] for k, v in trocas.items()]]
+                for (tema, nivel), (n, trocas) in self._sacolas.items()
+            ],
+        }
+
+    def restaurar(self, estado: dict):
+        versao, interno, gauss = estado["rng"]
+        self._rng.setstate((versao, tuple(interno), gauss))
+        self._sacolas = {}
+        self._origem = {}
+        for tema, nivel, n, trocas in estado.get("sacolas", []):
+            total = len(self.banco.indices(tema, nivel))
+            if n > total or any(k >= total or v >= total for k, v in trocas):
+                continue  # filtro encolheu desde que o estado foi salvo
+            self._sacolas[(tema, nivel)] = [n, {k: v for k, v in trocas}]
+
+    def salvar(self, caminho):
+        Path(caminho).write_text(json.dumps(self.estado()), encoding="utf-8")
+
+    def carregar(self, caminho) -> bool:
+        p = Path(caminho)
+        if not p.exists():
+            return False
+        self.restaurar(json.loads(p.read_text(encoding="utf-8")))
+        return True
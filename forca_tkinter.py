@@ -1,70 +1,201 @@
 # -*- coding: utf-8 -*-
-import json, random, re, unicodedata, sys
-from pathlib import Path
+import argparse, queue, random, sys, threading, time
 import tkinter as tk
 from tkinter import ttk, messagebox, simpledialog
 
-ARQ_BANCO = "banco_palavras.json"
-MAX_ERROS = 6
+from forca_banco import abrir_banco
+from forca_candidatos import IndiceCandidatos
+from forca_dia import dia_de, palavra_do_dia, tema_do_dia
+from forca_eventos import ARQ_EVENTOS, FAIXAS, Diario, LogOcupado, codigo_faixa
+from forca_progresso import ARQ_PROGRESSO, Progresso, evitar_vistas
+from forca_recarga import Vigia, trocar
+from forca_revisao import Revisao
+from forca_sorteio import Sorteador
+from forca_motor import Partida, ACERTO, INVALIDA, REPETIDA, normalizar
 
-def normalizar(txt: str) -> str:
-    nfkd = unicodedata.normalize("NFKD", txt)
-    s = "".join(c for c in nfkd if not unicodedata.combining(c))
-    s = s.upper()
-    s = re.sub(r"[^A-Z]", "", s)  # remove espaço, hífen, pontuação
-    return s
+ARQ_BANCO = "banco_palavras.json"
+INTERVALO_CARGA = 15  # ms entre consultas à fila da thread de carga
 
 class ForcaApp(tk.Tk):
-    def __init__(self):
+    def __init__(self, jogador=None, arq_progresso=ARQ_PROGRESSO, arq_revisao=None, arq_eventos=ARQ_EVENTOS, faixa=0,
+                 medir=False, dia=None, chave_dia=None):
+        # a janela aparece já (em estado "carregando"); banco, índices e
+        # progresso são montados numa thread e entregues pelo after()
+        self.tempos = {"inicio": time.perf_counter()}
+        self.medir = medir
         super().__init__()
-        self.title("Jogo da Forca - versão gráfica (educativo 6+)")
+        self.title("Jogo da Forca - versão gráfica (educativo 6+)"
+                   + (f" - palavra do dia {dia.strftime('%d/%m/%Y')}" if dia else ""))
         self.geometry("900x640")
         self.minsize(860, 600)
 
-        self.banco_por_tema = self._carregar_banco()
-        self.temas = sorted(self.banco_por_tema.keys())
+        self.banco = None
+        self.temas = []
         self.niveis = ["A", "B", "C", "TODOS"]
 
         # estado da partida
-        self.usados = set()  # (tema, palavra_exibida)
+        self.sorteador = self.indice = self.vigia = None
         self.item_atual = None
-        self.alvo = ""
-        self.exibida = ""
-        self.reveladas = []
-        self.tentadas = set()
-        self.erros = 0
-        self.dica_mostrada = False
+        self.partida = None
+
+        self.jogador = jogador
+        self.progresso = self._evitar = self.revisao = self.diario = None
+        self.faixa = faixa
+        self.eventos = None
+        self.dia, self.chave_dia = dia, chave_dia  # modo palavra do dia (forca_dia)
+        self.protocol("WM_DELETE_WINDOW", self._fechar)
+
+        # camada de renderização: mudanças pendentes e o que já está na tela
+        self._pendente = set()
+        self._id_atualizacao = None
+        self._textos = {}
+        self._estado_botoes = {}
+        self._teclado_ativo = False
+        self._letras_usadas = set()
+        self._status = ""
+        self.quadros = {"n": 0, "total": 0.0, "max": 0.0, "ultimo": 0.0}  # tempo de cada atualização (s)
 
         self._montar_ui()
-        self._novo_jogo(auto=True)
+        self._carregando(True)
+        self.bind("<Map>", self._ao_mapear)
+
+        self._fila = queue.Queue()
+        threading.Thread(target=self._carregar_dados, args=(arq_progresso, arq_revisao, arq_eventos),
+                         daemon=True).start()
+        self.after(INTERVALO_CARGA, self._receber_dados)
 
     # ===== dados =====
-    def _carregar_banco(self):
-        p = Path(ARQ_BANCO)
-        if not p.exists():
-            messagebox.showerror("Erro", f"Arquivo {ARQ_BANCO} não encontrado.")
-            self.destroy()
-            sys.exit(1)
-        dados = json.loads(p.read_text(encoding="utf-8"))
-        palavras = dados.get("palavras", [])
-        if not palavras:
-            messagebox.showerror("Erro", "Banco de palavras está vazio.")
+    def _carregar_dados(self, arq_progresso, arq_revisao, arq_eventos):
+        # roda fora da thread do Tk: nada de widgets aqui, só a fila
+        try:
+            banco = abrir_banco(ARQ_BANCO)  # binário indexado (mmap) se existir; senão o JSON
+            d = {"banco": banco, "sorteador": Sorteador(banco), "indice": IndiceCandidatos(banco)}
+            d["indice"].preparar()
+            if self.jogador:
+                # progresso do jogador (opcional): evita palavras já vistas
+                d["progresso"] = Progresso(arq_progresso)
+                d["vistas"] = d["progresso"].vistas(self.jogador)
+            if arq_revisao:
+                # modo adaptativo (repetição espaçada), opcional
+                d["revisao"] = Revisao(banco, d["sorteador"], arq_revisao)
+            if arq_eventos:
+                # log de eventos (forca_eventos): uma RodadaEventos por partida
+                d["diario"] = Diario(arq_eventos, banco.versao)
+            self._fila.put(d)
+        except Exception as e:
+            self._fila.put(e)
+
+    def _receber_dados(self):
+        try:
+            d = self._fila.get_nowait()
+        except queue.Empty:
+            self.after(INTERVALO_CARGA, self._receber_dados)
+            return
+        if isinstance(d, Exception):
+            if isinstance(d, FileNotFoundError):
+                messagebox.showerror("Erro", f"Arquivo {ARQ_BANCO} não encontrado.")
+            elif isinstance(d, LogOcupado):
+                messagebox.showerror("Erro", str(d))
+            elif isinstance(d, ValueError):
+                messagebox.showerror("Erro", "Banco de palavras está vazio.")
+            else:
+                messagebox.showerror("Erro", f"Falha ao carregar o banco: {d}")
             self.destroy()
             sys.exit(1)
-        por_tema = {}
-        for it in palavras:
-            por_tema.setdefault(it["tema"], []).append(it)
-        return por_tema
+        self.banco, self.sorteador, self.indice = d["banco"], d["sorteador"], d["indice"]
+        self.progresso, self.revisao, self.diario = d.get("progresso"), d.get("revisao"), d.get("diario")
+        if self.progresso:
+            self.vistas = d["vistas"]
+            self._evitar = evitar_vistas(self.banco, self.vistas)
+        self.temas = self.banco.temas
+        self.cb_tema.configure(values=self.temas + ["ALEATÓRIO"])
+        self.cb_tema.current(0)
+        self.vigia = Vigia(ARQ_BANCO, self.banco, preparar=lambda b: IndiceCandidatos(b).preparar()).iniciar()
+        self._carregando(False)
+        self._novo_jogo(auto=True)
+        self.after_idle(self._primeira_rodada)
+
+    def _carregando(self, ativo):
+        for b in (self.bt_novo, self.bt_dica, self.bt_chutar):
+            b.configure(state="disabled" if ativo else "normal")
+        for cb in (self.cb_tema, self.cb_nivel):
+            cb.configure(state="disabled" if ativo else "readonly")
+        if ativo:
+            self._habilitar_teclado(False)
+            self._texto(self.lbl_palavra, "…")
+            self._info_status("Carregando banco de palavras…")
+        else:
+            self._info_status("")
+
+    def _ao_mapear(self, _evento):
+        # janela mapeada: a pintura entra na fila de idle antes deste callback
+        self.unbind("<Map>")
+        self.after_idle(self._primeira_pintura)
+
+    def _primeira_pintura(self):
+        self.tempos["pintura"] = time.perf_counter()
+        # o tema visual é opcional: aplicado depois que a janela já apareceu
+        style = ttk.Style(self)
+        try:
+            self.tk.call("source", "sun-valley.tcl")
+            style.theme_use("sun-valley")
+        except Exception:
+            pass
+        self._relatar_tempos()
+
+    def _primeira_rodada(self):
+        self.tempos["jogavel"] = time.perf_counter()
+        self._relatar_tempos()
+
+    def _relatar_tempos(self):
+        # a carga pode terminar antes ou depois da primeira pintura
+        if not self.medir or "pintura" not in self.tempos or "jogavel" not in self.tempos:
+            return
+        t0 = self.tempos["inicio"]
+        print(f"[tempo] primeira pintura: {(self.tempos['pintura'] - t0) * 1e3:.0f} ms; "
+              f"primeira rodada jogável: {(self.tempos['jogavel'] - t0) * 1e3:.0f} ms")
+
+    def _recarregar(self):
+        # banco editado com o jogo aberto: preparado pelo Vigia numa thread,
+        # entra aqui, entre uma partida e outra
+        r = self.vigia.pendente() if self.vigia else None
+        if r is None:
+            return
+        self.banco, self.indice = trocar(r, self.sorteador, self.revisao, self.diario), r.extras
+        if self.progresso:
+            self._evitar = evitar_vistas(self.banco, self.vistas)
+        self.temas = self.banco.temas
+        self.cb_tema.configure(values=self.temas + ["ALEATÓRIO"])
 
     def _filtrar(self, tema, nivel):
-        base = list(self.banco_por_tema.get(tema, []))
-        if nivel != "TODOS":
-            base = [x for x in base if x.get("nivel","A") == nivel]
-        elegiveis = [x for x in base if (x["tema"], x["palavra_exibida"]) not in self.usados]
-        if not elegiveis:  # se esgotar, reinicia rotação daquele filtro
-            self.usados = {(t,p) for (t,p) in self.usados if t != tema}
-            elegiveis = list(base)
-        return elegiveis
+        # id do próximo registro da sacola do filtro (None se o filtro for vazio)
+        if self.dia:
+            return palavra_do_dia(self.banco, tema, nivel, self.dia, self.chave_dia)
+        if self.revisao:
+            return self.revisao.proxima(tema, nivel)
+        return self.sorteador.sortear(tema, nivel, self._evitar)
+
+    def _registrar(self):
+        p = self.partida
+        if self.progresso:
+            self.vistas.add((p.item["tema"], p.exibida))
+            self.progresso.registrar_partida(self.jogador, p)
+        if self.revisao:
+            self.revisao.registrar(p.item, p.resultado is True, p.dica_mostrada)
+            self.revisao.salvar()
+
+    def _fechar(self):
+        if self.medir and self.quadros["n"]:
+            q = self.quadros
+            print(f"[tempo] {q['n']} atualizações de tela: média {q['total'] / q['n'] * 1e3:.2f} ms, "
+                  f"máx {q['max'] * 1e3:.2f} ms")
+        if self.vigia:
+            self.vigia.parar()
+        if self.progresso:
+            self.progresso.fechar()
+        if self.diario:
+            self.diario.fechar()
+        self.destroy()
 
     # ===== UI =====
     def _montar_ui(self):
@@ -74,7 +205,6 @@ class ForcaApp(tk.Tk):
 
         ttk.Label(top, text="Tema:").pack(side="left")
         self.cb_tema = ttk.Combobox(top, values=self.temas + ["ALEATÓRIO"], state="readonly", width=20)
-        self.cb_tema.current(0)
         self.cb_tema.pack(side="left", padx=6)
 
         ttk.Label(top, text="Nível:").pack(side="left")
@@ -98,6 +228,7 @@ class ForcaApp(tk.Tk):
         # Canvas para desenho
         self.canvas = tk.Canvas(main, bg="#FAFAFA", width=420, height=420, highlightthickness=1, highlightbackground="#DDD")
         self.canvas.grid(row=0, column=0, rowspan=2, sticky="nsew", padx=(0,10), pady=(0,10))
+        self._montar_forca()
 
         # Palavra e info
         info = ttk.Frame(main)
@@ -130,6 +261,7 @@ class ForcaApp(tk.Tk):
                 b = ttk.Button(fr, text=ch, width=3, command=lambda c=ch: self._tentar_letra(c))
                 b.pack(side="left", padx=2, pady=2)
                 self.botoes_letra[ch] = b
+        self.bind("<KeyPress>", self._tecla)  # teclado físico também joga
 
         # rodapé
         rodape = ttk.Frame(self, padding=(10,0,10,10))
@@ -143,38 +275,32 @@ class ForcaApp(tk.Tk):
         main.rowconfigure(0, weight=0)
         main.rowconfigure(1, weight=1)
 
-        # estilo
-        style = ttk.Style(self)
-        try:
-            self.tk.call("source", "sun-valley.tcl")
-            style.theme_use("sun-valley")
-        except Exception:
-            pass
-
     # ===== lógica da partida =====
     def _novo_jogo(self, auto=False):
+        if self.banco is None:  # ainda carregando
+            return
+        self._recarregar()
         tema = self.cb_tema.get()
         if tema == "" or tema not in self.temas + ["ALEATÓRIO"]:
             tema = self.temas[0]
         if tema == "ALEATÓRIO":
-            tema = random.choice(self.temas)
+            tema = tema_do_dia(self.banco, self.dia, self.chave_dia) if self.dia else random.choice(self.temas)
         nivel = self.cb_nivel.get() or "TODOS"
 
-        lista = self._filtrar(tema, nivel)
-        if not lista:
+        i = self._filtrar(tema, nivel)
+        if i is None:
             messagebox.showinfo("Atenção", "Não há palavras para esse filtro. Escolha outro tema/nível.")
             return
 
-        self.item_atual = random.choice(lista)
-        self.usados.add((self.item_atual["tema"], self.item_atual["palavra_exibida"]))
+        self.item_atual = self.banco.item(i)
 
-        self.exibida = self.item_atual["palavra_exibida"].upper()
-        self.alvo = normalizar(self.exibida)
-        self.reveladas = ["_" if c.isalpha() else c for c in self.exibida]
-        self.tentadas = set()
-        self.erros = 0
-        self.dica_mostrada = False
+        if self.eventos:
+            self.eventos.abandonar()  # nova palavra com a rodada anterior pela metade
+        self.partida = Partida(self.item_atual)
+        if self.diario:
+            self.eventos = self.diario.rodada(self.partida, self.faixa)
 
+        self._letras_usadas.clear()
         self._habilitar_teclado(True)
         self._atualizar_ui()
 
@@ -182,137 +308,199 @@ class ForcaApp(tk.Tk):
             self._info_status("Nova palavra escolhida. Boa sorte!")
 
     def _tentar_letra(self, ch):
-        letra = normalizar(ch)
-        if not letra or len(letra) != 1:
+        p = self.partida
+        if p is None or p.terminada:
+            return
+        r = p.tentar_letra(ch)
+        if self.eventos:
+            self.eventos.letra(ch, r)
+        if r == INVALIDA:
             return
-        if letra in self.tentadas:
+        if r == REPETIDA:
             self._info_status("Você já tentou essa letra.")
             return
-        self.tentadas.add(letra)
-        self._atualizar_tentadas()
-
-        if letra in self.alvo:
-            # revela preservando acentos
-            for i, c in enumerate(self.exibida):
-                if normalizar(c) == letra:
-                    self.reveladas[i] = c
+        # desabilita botão da letra usada
+        self._letras_usadas.add(normalizar(ch))
+        self._agendar("tentadas", "teclado", "dica")
+
+        if r == ACERTO:
             self._info_status("Boa! Continue assim.")
-            self._atualizar_palavra()
-            if "_" not in self.reveladas:
+            self._agendar("palavra")
+            if p.resultado:
                 self._vitoria()
         else:
-            self.erros += 1
             self._info_status("Não tem essa letra. Tente outra.")
-            self._desenhar_forca()
-            if self.erros >= MAX_ERROS:
+            self._agendar("forca")
+            if p.resultado is False:
                 self._derrota()
 
-        # desabilita botão da letra usada
-        btn = self.botoes_letra.get(letra)
-        if btn:
-            btn.configure(state="disabled")
+    def _tecla(self, evento):
+        if len(evento.char) == 1 and evento.char.isalpha():
+            self._tentar_letra(evento.char)
 
     def _chutar_palavra(self):
-        if not self.item_atual:
+        p = self.partida
+        if p is None or p.terminada:
             return
         chute = simpledialog.askstring("Chutar palavra", "Digite seu palpite:")
         if chute is None:
             return
-        if normalizar(chute) == self.alvo:
+        acertou = p.chutar(chute)
+        if self.eventos:
+            self.eventos.chute(acertou)
+        if acertou:
             self._vitoria()
         else:
-            self.erros += 1
             self._info_status("Quase! Não foi dessa vez.")
-            self._desenhar_forca()
-            if self.erros >= MAX_ERROS:
+            self._agendar("forca", "dica")
+            if p.resultado is False:
                 self._derrota()
 
     def _mostrar_dica(self):
-        self.dica_mostrada = True
-        self._atualizar_dica(force=True)
+        if self.partida is None:
+            return
+        if self.eventos and not self.partida.dica_mostrada:
+            self.eventos.dica()
+        self.partida.pedir_dica()
+        self._agendar("dica")
 
     def _vitoria(self):
+        self._registrar()
         self._habilitar_teclado(False)
-        self._atualizar_palavra(force_full=True)
-        messagebox.showinfo("Parabéns!", f"Você acertou: {self.exibida} 🎉")
+        self._agendar("palavra", "dica")
+        self._aplicar()  # tabuleiro final na tela antes da caixa modal
+        messagebox.showinfo("Parabéns!", f"Você acertou: {self.partida.exibida} 🎉")
         self._info_status("Vitória! Clique em 'Nova palavra' para continuar.")
 
     def _derrota(self):
+        self._registrar()
         self._habilitar_teclado(False)
-        self._atualizar_palavra(force_full=True)
-        messagebox.showinfo("Boa tentativa!", f"A palavra era: {self.exibida}")
+        self._agendar("palavra", "dica")
+        self._aplicar()  # tabuleiro final na tela antes da caixa modal
+        messagebox.showinfo("Boa tentativa!", f"A palavra era: {self.partida.exibida}")
         self._info_status("Fim das chances. Clique em 'Nova palavra' para tentar outra.")
 
     # ===== UI helpers =====
-    def _habilitar_teclado(self, status: bool):
-        for b in self.botoes_letra.values():
-            b.configure(state=("normal" if status else "disabled"))
-        if status:
-            # reabilita todas
+    # As mudanças de tela não são aplicadas na hora: cada handler marca o que
+    # mudou (_agendar) e um único after_idle aplica tudo de uma vez, só nos
+    # widgets cujo texto/estado realmente mudou. Vários cliques ou teclas
+    # seguidos viram uma atualização só.
+    def _agendar(self, *partes):
+        self._pendente.update(partes)
+        if self._id_atualizacao is None:
+            self._id_atualizacao = self.after_idle(self._aplicar)
+
+    def _aplicar(self):
+        if self._id_atualizacao is not None:
+            self.after_cancel(self._id_atualizacao)
+            self._id_atualizacao = None
+        pendente, self._pendente = self._pendente, set()
+        if not pendente:
+            return
+        t0 = time.perf_counter()
+        p = self.partida
+        if "teclado" in pendente:
             for ch, b in self.botoes_letra.items():
-                b.configure(state="normal")
+                estado = "normal" if self._teclado_ativo and ch not in self._letras_usadas else "disabled"
+                if self._estado_botoes.get(ch) != estado:
+                    b.configure(state=estado)
+                    self._estado_botoes[ch] = estado
+        if "status" in pendente:
+            self._texto(self.lbl_status, self._status)
+        if p is not None:
+            if "palavra" in pendente:
+                self._texto(self.lbl_palavra, " ".join(p.exibida if p.terminada else p.reveladas))
+            if "tentadas" in pendente:
+                self._texto(self.lbl_tentadas, f"Letras tentadas: {' '.join(sorted(p.tentadas)) or '—'}")
+            if "dica" in pendente:
+                self._texto(self.lbl_dica, self._texto_dica(p))
+            if "forca" in pendente:
+                self._desenhar_forca()
+        self._contar_quadro(time.perf_counter() - t0)
+
+    def _texto(self, lbl, texto):
+        if self._textos.get(lbl) != texto:
+            lbl.configure(text=texto)
+            self._textos[lbl] = texto
+
+    def _contar_quadro(self, dt):
+        q = self.quadros
+        q["n"] += 1
+        q["total"] += dt
+        q["ultimo"] = dt
+        q["max"] = max(q["max"], dt)
 
-    def _atualizar_ui(self):
-        self._atualizar_palavra()
-        self._atualizar_dica()
-        self._atualizar_tentadas()
-        self._desenhar_forca(reset=True)
-
-    def _atualizar_palavra(self, force_full=False):
-        if force_full:
-            texto = " ".join(list(self.exibida))
-        else:
-            texto = " ".join(self.reveladas)
-        self.lbl_palavra.configure(text=texto)
+    def _habilitar_teclado(self, status: bool):
+        self._teclado_ativo = status
+        self._agendar("teclado")
 
-    def _atualizar_dica(self, force=False):
-        if force or self.dica_mostrada or self.erros >= 2:
-            self.lbl_dica.configure(text=f"Dica: {self.item_atual.get('dica','—')}")
-        else:
-            self.lbl_dica.configure(text="Dica: —")
+    def _atualizar_ui(self):
+        self._agendar("palavra", "dica", "tentadas", "forca", "teclado")
 
-    def _atualizar_tentadas(self):
-        if self.tentadas:
-            s = " ".join(sorted(self.tentadas))
-        else:
-            s = "—"
-        self.lbl_tentadas.configure(text=f"Letras tentadas: {s}")
+    def _texto_dica(self, p):
+        if not p.dica_visivel:
+            return "Dica: —"
+        texto = f"Dica: {p.item.get('dica', '—')}"
+        letra = None if p.terminada else self.indice.sugerir_letra(p.padrao(), p.tentadas, p.item["tema"])
+        if letra:
+            texto += f"  •  Tente a letra {letra}"
+        return texto
 
     def _info_status(self, msg):
-        self.lbl_status.configure(text=msg)
+        self._status = msg
+        self._agendar("status")
 
     # ===== desenho da forca =====
-    def _desenhar_forca(self, reset=False):
+    # Forca e boneco são criados uma vez (tags "base" e "parte1".."parte6");
+    # depois só muda o estado das partes que entraram ou saíram.
+    PARTES = (
+        ("oval", (230, 100, 290, 160)),  # 1 cabeça
+        ("line", (260, 160, 260, 240)),  # 2 tronco
+        ("line", (260, 180, 230, 210)),  # 3 braço esq
+        ("line", (260, 180, 290, 210)),  # 4 braço dir
+        ("line", (260, 240, 235, 290)),  # 5 perna esq
+        ("line", (260, 240, 285, 290)),  # 6 perna dir
+    )
+
+    def _montar_forca(self):
         c = self.canvas
-        c.delete("all")
-        # base da forca
-        c.create_line(40, 380, 200, 380, width=6)
-        c.create_line(90, 380, 90, 60, width=6)
-        c.create_line(90, 60, 260, 60, width=6)
-        c.create_line(260, 60, 260, 100, width=6)  # corda
-        if reset:
+        for coords in ((40, 380, 200, 380), (90, 380, 90, 60), (90, 60, 260, 60), (260, 60, 260, 100)):
+            c.create_line(*coords, width=6, tags=("base",))  # base, poste, travessa e corda
+        for k, (tipo, coords) in enumerate(self.PARTES, 1):
+            criar = c.create_oval if tipo == "oval" else c.create_line
+            criar(*coords, width=4, state="hidden", tags=(f"parte{k}",))
+        self._partes_visiveis = 0
+
+    def _desenhar_forca(self):
+        e = min(self.partida.erros, len(self.PARTES))
+        antes = self._partes_visiveis
+        if e == antes:
             return
-        e = self.erros
-        # 1 cabeça
-        if e >= 1:
-            c.create_oval(230, 100, 290, 160, width=4)  # cabeça
-        # 2 tronco
-        if e >= 2:
-            c.create_line(260, 160, 260, 240, width=4)  # tronco
-        # 3 braço esq
-        if e >= 3:
-            c.create_line(260, 180, 230, 210, width=4)
-        # 4 braço dir
-        if e >= 4:
-            c.create_line(260, 180, 290, 210, width=4)
-        # 5 perna esq
-        if e >= 5:
-            c.create_line(260, 240, 235, 290, width=4)
-        # 6 perna dir
-        if e >= 6:
-            c.create_line(260, 240, 285, 290, width=4)
+        estado = "normal" if e > antes else "hidden"
+        for k in range(min(e, antes) + 1, max(e, antes) + 1):
+            self.canvas.itemconfigure(f"parte{k}", state=estado)
+        self._partes_visiveis = e
 
 if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Jogo da Forca - versão gráfica.")
+    ap.add_argument("--jogador", help="nome do jogador: guarda o progresso e evita palavras já vistas")
+    ap.add_argument("--progresso", default=ARQ_PROGRESSO, help="arquivo SQLite do progresso dos jogadores")
+    ap.add_argument("--revisao", help="modo adaptativo (repetição espaçada); agenda salva neste arquivo JSON")
+    ap.add_argument("--eventos", default=ARQ_EVENTOS, help="log binário de eventos das partidas")
+    ap.add_argument("--sem-eventos", action="store_true", help="não grava o log de eventos")
+    ap.add_argument("--faixa", choices=FAIXAS[1:], help="faixa etária do jogador (vai para o log de eventos)")
+    ap.add_argument("--medir", action="store_true", help="mostra o tempo até a primeira pintura/rodada e o tempo das atualizações de tela")
+    ap.add_argument("--dia", nargs="?", const="", metavar="AAAA-MM-DD",
+                    help="palavra do dia: a mesma para todos em cada tema/nível (sem data: hoje)")
+    ap.add_argument("--chave-dia", help="chave da palavra do dia (padrão: variável FORCA_CHAVE_DIA)")
+    args = ap.parse_args()
     random.seed()
-    app = ForcaApp()
+    try:
+        dia = None if args.dia is None else dia_de(args.dia)
+    except ValueError:
+        print(f"[ERRO] Data inválida: {args.dia} (use AAAA-MM-DD).")
+        sys.exit(1)
+    app = ForcaApp(args.jogador, args.progresso, args.revisao,
+                   None if args.sem_eventos else args.eventos, codigo_faixa(args.faixa), args.medir,
+                   dia, args.chave_dia)
     app.mainloop()
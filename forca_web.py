@@ -1,56 +1,483 @@
-<!DOCTYPE html>
-<html lang="pt-BR">
-<head>
-  <meta charset="utf-8" />
-  <meta name="viewport" content="width=device-width,initial-scale=1" />
-  <title>Jogo da Forca : Versão Web</title>
-  <link rel="stylesheet" href="style.css" />
-</head>
-<body>
-  <header class="topbar">
-    <h1>Jogo da Forca <span class="badge">web</span></h1>
-  </header>
-
-  <main class="container">
-    <section class="controls">
-      <label>
-        Tema:
-        <select id="temaSelect"></select>
-      </label>
-
-      <label>
-        Nível:
-        <select id="nivelSelect">
-          <option value="TODOS">Todos</option>
-          <option value="A">A (fácil)</option>
-          <option value="B">B (médio)</option>
-          <option value="C">C (desafio)</option>
-        </select>
-      </label>
-
-      <button id="novaBtn" class="btn">Nova palavra</button>
-      <button id="dicaBtn" class="btn alt">Dica</button>
-      <button id="chutarBtn" class="btn warn">Chutar palavra</button>
-    </section>
-
-    <section class="game">
-      <canvas id="forcaCanvas" width="360" height="360" aria-label="Desenho da forca"></canvas>
-
-      <div class="panel">
-        <div id="palavra" class="palavra">_ _ _ _</div>
-        <div id="dica" class="dica">Dica: -</div>
-        <div id="tentadas" class="tentadas">Letras tentadas: -</div>
-        <div id="status" class="status"></div>
-
-        <div class="teclado" id="teclado"></div>
-      </div>
-    </section>
-  </main>
-
-  <footer class="foot">
-    <small>Educação Infantil : Funciona no navegador : Feito com carinho</small>
-  </footer>
-
-  <script src="app.js"></script>
-</body>
-</html>
+# -*- coding: utf-8 -*-
+"""
+Servidor do jogo da forca para a versão web (asyncio, só biblioteca padrão).
+
+Mantém milhares de partidas simultâneas em memória, uma por sessão, com
+as mesmas regras de `jogar_partida` (forca_motor.Partida). A palavra fica
+no servidor: o navegador só recebe o tabuleiro e, no fim, a resposta.
+
+API (JSON, POST):
+    /api/rodada  {"tema", "nivel", "sessao"?, "jogador"?, "faixa"?, "dia"?}  -> nova rodada (cria sessão se preciso)
+    /api/letra   {"sessao", "letra"}
+    /api/chute   {"sessao", "palavra"}
+    /api/dica    {"sessao"}
+    GET /api/temas                             -> temas, níveis e os filtros com palavras
+
+Os arquivos de docs/ (index.html, app.js, style.css) são servidos em /.
+Os shards do banco (docs/banco/, com hash no nome) vão com cache longo e,
+se o navegador aceitar, na versão pré-comprimida (.br ou .gz) ao lado: o
+Accept-Encoding é lido com os pesos q (q=0 recusa) e vale a codificação
+de maior peso que existir no disco.
+Sessões paradas por mais de --ttl segundos são descartadas.
+Com "jogador" na rodada, o resultado de cada partida vai para o progresso
+(forca_progresso, SQLite) e as palavras já vistas por ele ficam para depois.
+Cada jogada vai para o log binário de eventos (forca_eventos).
+Com "dia" (true ou "AAAA-MM-DD", no máximo um dia longe da data do
+servidor, por causa dos fusos) a rodada é a palavra do dia (forca_dia):
+réplicas com a mesma --chave-dia e o mesmo banco dão a mesma palavra.
+Se o banco for regerado com o servidor no ar, ele é recarregado
+(forca_recarga) e entra na próxima rodada; as rodadas abertas continuam.
+
+    python forca_web.py --porta 8000
+"""
+import argparse
+import asyncio
+import json
+import mimetypes
+import random
+import re
+import secrets
+import sys
+import time
+from collections import OrderedDict
+from datetime import date
+from functools import lru_cache
+from pathlib import Path
+
+from forca_banco import FILTROS, abrir_banco
+from forca_dia import MARGEM, dia_de, palavra_do_dia, tema_do_dia
+from forca_eventos import ARQ_EVENTOS, Diario, LogOcupado, codigo_faixa
+from forca_motor import ACERTO, ERRO, MAX_ERROS, Partida
+from forca_progresso import ARQ_PROGRESSO, Progresso, evitar_vistas
+from forca_recarga import Vigia, trocar
+from forca_sorteio import Sorteador
+
+BANCO_ARQUIVO = "banco_palavras.json"
+PASTA_ESTATICA = Path(__file__).resolve().parent / "docs"
+TTL_SESSAO = 30 * 60
+LIMITE_CORPO = 16 * 1024
+LIMITE_JOGADOR = 64
+COM_HASH = re.compile(r"\.[0-9a-f]{12}\.json$")  # shards de gera_banco.montar_shard
+CACHE_LONGO = "public, max-age=31536000, immutable"
+COMPRESSOES = (("br", ".br"), ("gzip", ".gz"))
+
+STATUS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 413: "Payload Too Large"}
+
+
+@lru_cache(maxsize=256)
+def codificacoes_aceitas(cabecalho: str) -> dict:
+    """{codificação: q} do Accept-Encoding; q=0 recusa e "*" vale para as não citadas."""
+    pesos = {}
+    for parte in cabecalho.lower().split(","):
+        token, *params = (p.strip() for p in parte.split(";"))
+        if not token:
+            continue
+        q = 1.0
+        for param in params:
+            nome, _, valor = param.partition("=")
+            if nome.strip() == "q":
+                try:
+                    q = float(valor)
+                except ValueError:
+                    q = 0.0
+        pesos[token] = q
+    return pesos
+
+
+def escolher_codificacao(aceita: str, disponiveis):
+    """Codificação de maior peso entre as `disponiveis` (ordem de COMPRESSOES desempata), ou None."""
+    pesos = codificacoes_aceitas(aceita)
+    melhor, peso = None, 0.0
+    for c in disponiveis:
+        q = pesos[c] if c in pesos else pesos.get("*", 0.0)
+        if q > peso:
+            melhor, peso = c, q
+    return melhor
+
+
+class ErroApi(Exception):
+    def __init__(self, status, msg):
+        super().__init__(msg)
+        self.status = status
+
+
+class Sessao:
+    __slots__ = ("partida", "visto", "jogador", "vistas", "eventos")
+
+    def __init__(self):
+        self.partida = None
+        self.visto = time.monotonic()
+        self.jogador = None
+        self.vistas = None  # palavras já vistas pelo jogador (carregadas uma vez por sessão)
+        self.eventos = None  # forca_eventos.RodadaEventos da rodada atual
+
+
+class Sessoes:
+    """Sessões em ordem de último acesso: expirar é tirar do começo."""
+
+    __slots__ = ("ttl", "_dados")
+
+    def __init__(self, ttl=TTL_SESSAO):
+        self.ttl = ttl
+        self._dados = OrderedDict()
+
+    def __len__(self):
+        return len(self._dados)
+
+    def criar(self):
+        sid = secrets.token_urlsafe(12)
+        s = self._dados[sid] = Sessao()
+        return sid, s
+
+    def obter(self, sid):
+        s = self._dados.get(sid) if isinstance(sid, str) else None
+        if s is None:
+            raise ErroApi(404, "Sessão não encontrada (ou expirada).")
+        s.visto = time.monotonic()
+        self._dados.move_to_end(sid)
+        return s
+
+    def expirar(self):
+        limite = time.monotonic() - self.ttl
+        n = 0
+        while self._dados:
+            sid, s = next(iter(self._dados.items()))
+            if s.visto >= limite:
+                break
+            del self._dados[sid]
+            if s.eventos:
+                s.eventos.abandonar()
+            n += 1
+        return n
+
+
+def estado(partida):
+    e = {
+        "tema": partida.item["tema"],
+        "nivel": partida.item.get("nivel", "A"),
+        "reveladas": partida.reveladas,
+        "tentadas": sorted(partida.tentadas),
+        "erros": partida.erros,
+        "max_erros": MAX_ERROS,
+        "dica": partida.dica if partida.dica_visivel else None,
+        "resultado": partida.resultado,
+    }
+    if partida.terminada:
+        e["palavra"] = partida.exibida
+    return e
+
+
+class Jogo:
+    """Regras da API sobre o banco; cada método recebe e devolve dicionários JSON."""
+
+    def __init__(self, banco, ttl=TTL_SESSAO, semente=None, progresso=None, diario=None, vigia=None,
+                 chave_dia=None):
+        self.banco = banco
+        self.chave_dia = chave_dia
+        self.vigia = vigia
+        self.geracao = 0  # bancos trocados pelo vigia
+        self.sessoes = Sessoes(ttl)
+        self.sorteador = Sorteador(banco, semente)
+        self.progresso = progresso
+        self.diario = diario
+        self._rng = random.Random(semente)
+
+    def _recarregar(self):
+        r = self.vigia.pendente() if self.vigia else None
+        if r is not None:
+            self.banco = trocar(r, self.sorteador, diario=self.diario)
+            self.geracao += 1
+
+    def temas(self, dados):
+        self._recarregar()
+        filtros = {t: [n for n in FILTROS if self.banco.indices(t, n)] for t in self.banco.temas}
+        return {"temas": self.banco.temas, "niveis": list(FILTROS), "filtros": filtros, "max_erros": MAX_ERROS}
+
+    def rodada(self, dados):
+        sid = dados.get("sessao")
+        if sid:
+            s = self.sessoes.obter(sid)
+        else:
+            sid, s = self.sessoes.criar()
+        self._recarregar()
+        dia = self._dia(dados.get("dia"))
+        tema = dados.get("tema") or "ALEATORIO"
+        if tema not in self.banco.temas:
+            tema = tema_do_dia(self.banco, dia, self.chave_dia) if dia else self._rng.choice(self.banco.temas)
+        nivel = dados.get("nivel") or "TODOS"
+        if nivel not in FILTROS:
+            raise ErroApi(400, "Nível inválido.")
+        evitar = self._jogador(s, dados.get("jogador"))
+        if dia:
+            i = palavra_do_dia(self.banco, tema, nivel, dia, self.chave_dia)
+        else:
+            i = self.sorteador.sortear(tema, nivel, evitar)
+        if i is None:
+            raise ErroApi(404, "Não há palavras para esse filtro.")
+        if s.eventos:
+            s.eventos.abandonar()  # rodada anterior da sessão ficou pela metade
+        s.partida = Partida(self.banco.item(i))
+        if self.diario:
+            s.eventos = self.diario.rodada(s.partida, codigo_faixa(dados.get("faixa")))
+        return {"sessao": sid, "estado": estado(s.partida)}
+
+    @staticmethod
+    def _dia(valor):
+        if not valor:
+            return None
+        hoje = date.today()
+        if valor is True:
+            return hoje
+        try:
+            dia = dia_de(str(valor))
+        except ValueError:
+            raise ErroApi(400, "Data inválida (use AAAA-MM-DD).")
+        # palavra nova entra só em hoje + MARGEM (gera_banco): os dias aceitos aqui não mudam
+        if abs((dia - hoje).days) >= MARGEM.days:
+            raise ErroApi(400, "Só a palavra de hoje (±1 dia pelo fuso).")
+        return dia
+
+    def _jogador(self, s, jogador):
+        if self.progresso is None or not jogador:
+            return None
+        if not isinstance(jogador, str) or len(jogador) > LIMITE_JOGADOR:
+            raise ErroApi(400, "Jogador inválido.")
+        if jogador != s.jogador:
+            s.jogador, s.vistas = jogador, self.progresso.vistas(jogador)
+        return evitar_vistas(self.banco, s.vistas)
+
+    def _sessao(self, dados):
+        s = self.sessoes.obter(dados.get("sessao"))
+        if s.partida is None:
+            raise ErroApi(400, "Sessão sem rodada; chame /api/rodada.")
+        return s
+
+    def _terminou(self, s):
+        if s.jogador and s.partida.terminada:
+            s.vistas.add((s.partida.item["tema"], s.partida.exibida))
+            self.progresso.registrar_partida(s.jogador, s.partida)
+
+    def letra(self, dados):
+        s = self._sessao(dados)
+        p = s.partida
+        if p.terminada:
+            return {"resultado": "terminada", "estado": estado(p)}
+        palpite = str(dados.get("letra", ""))
+        r = p.tentar_letra(palpite)
+        if s.eventos:
+            s.eventos.letra(palpite, r)
+        self._terminou(s)
+        return {"resultado": r, "estado": estado(p)}
+
+    def chute(self, dados):
+        s = self._sessao(dados)
+        p = s.partida
+        if p.terminada:
+            return {"resultado": "terminada", "estado": estado(p)}
+        acertou = p.chutar(str(dados.get("palavra", "")))
+        if s.eventos:
+            s.eventos.chute(acertou)
+        self._terminou(s)
+        return {"resultado": ACERTO if acertou else ERRO, "estado": estado(p)}
+
+    def dica(self, dados):
+        s = self._sessao(dados)
+        p = s.partida
+        if s.eventos and not p.dica_mostrada and not p.terminada:
+            s.eventos.dica()
+        p.pedir_dica()
+        return {"estado": estado(p)}
+
+
+# ===== HTTP mínimo (HTTP/1.1 com keep-alive) =====
+
+def _resposta(status, corpo: bytes, tipo="application/json; charset=utf-8", fechar=False, extras=None):
+    # extras: linhas de cabeçalho prontas; sem elas, nada vai para cache
+    if extras is None:
+        extras = "Cache-Control: no-store\r\n"
+    cab = (
+        f"HTTP/1.1 {status} {STATUS.get(status, '')}\r\n"
+        f"Content-Type: {tipo}\r\n"
+        f"Content-Length: {len(corpo)}\r\n"
+        f"{extras}"
+        f"Connection: {'close' if fechar else 'keep-alive'}\r\n\r\n"
+    )
+    return cab.encode("latin-1") + corpo
+
+
+def _json(obj):
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class Servidor:
+    def __init__(self, jogo, pasta=PASTA_ESTATICA):
+        self.jogo = jogo
+        self.pasta = Path(pasta).resolve()
+        self.rotas = {
+            ("GET", "/api/temas"): jogo.temas,
+            ("POST", "/api/rodada"): jogo.rodada,
+            ("POST", "/api/letra"): jogo.letra,
+            ("POST", "/api/chute"): jogo.chute,
+            ("POST", "/api/dica"): jogo.dica,
+        }
+        self._arquivos = {}  # caminho -> (arquivo, tipo, cabeçalhos, {codificação: arquivo comprimido})
+        self._estaticos = {}  # (caminho, codificação servida) -> (corpo, tipo, cabeçalhos)
+        self._geracao = jogo.geracao
+
+    def _estatico(self, caminho, aceita=""):
+        if caminho == "/":
+            caminho = "/index.html"
+        if self._geracao != self.jogo.geracao:  # banco recarregado: JSON e manifesto mudaram
+            self._arquivos.clear()
+            self._estaticos.clear()
+            self._geracao = self.jogo.geracao
+        info = self._arquivos.get(caminho)
+        if info is None:
+            arq = (self.pasta / caminho.lstrip("/")).resolve()
+            if self.pasta not in arq.parents or not arq.is_file():
+                raise ErroApi(404, "Arquivo não encontrado.")
+            tipo = mimetypes.guess_type(arq.name)[0] or "application/octet-stream"
+            if tipo.startswith("text/") or tipo.endswith(("javascript", "json")):
+                tipo += "; charset=utf-8"
+            extras = f"Cache-Control: {CACHE_LONGO if COM_HASH.search(arq.name) else 'no-cache'}\r\n"
+            # versões pré-comprimidas ao lado, na ordem de preferência do servidor
+            variantes = {c: arq.with_name(arq.name + ext) for c, ext in COMPRESSOES}
+            variantes = {c: p for c, p in variantes.items() if p.is_file()}
+            if variantes:
+                extras += "Vary: Accept-Encoding\r\n"
+            info = self._arquivos[caminho] = (arq, tipo, extras, variantes)
+        arq, tipo, extras, variantes = info
+        # a chave é a codificação servida, não a pedida: br sem .br no disco cai no .gz ou no original
+        codificacao = escolher_codificacao(aceita, variantes) if variantes else None
+        dados = self._estaticos.get((caminho, codificacao))
+        if dados is None:
+            if codificacao:
+                corpo = variantes[codificacao].read_bytes()
+                extras += f"Content-Encoding: {codificacao}\r\n"
+            else:
+                corpo = arq.read_bytes()
+            dados = self._estaticos[(caminho, codificacao)] = (corpo, tipo, extras)
+        return dados
+
+    def atender(self, metodo, caminho, corpo: bytes, aceita=""):
+        """Devolve (status, corpo, tipo, cabeçalhos extras ou None) para uma requisição."""
+        caminho = caminho.split("?", 1)[0]
+        try:
+            rota = self.rotas.get((metodo, caminho))
+            if rota is None:
+                if caminho.startswith("/api/"):
+                    raise ErroApi(405 if caminho in {c for _, c in self.rotas} else 404, "Rota inválida.")
+                if metodo != "GET":
+                    raise ErroApi(405, "Método não permitido.")
+                return (200, *self._estatico(caminho, aceita))
+            try:
+                dados = json.loads(corpo) if corpo else {}
+            except ValueError:
+                raise ErroApi(400, "JSON inválido.")
+            if not isinstance(dados, dict):
+                raise ErroApi(400, "JSON inválido.")
+            return 200, _json(rota(dados)), "application/json; charset=utf-8", None
+        except ErroApi as e:
+            return e.status, _json({"erro": str(e)}), "application/json; charset=utf-8", None
+
+    async def conexao(self, reader, writer):
+        try:
+            while True:
+                linha = await reader.readline()
+                if not linha:
+                    break
+                try:
+                    metodo, caminho, versao = linha.decode("latin-1").split()
+                except ValueError:
+                    writer.write(_resposta(400, _json({"erro": "Requisição inválida."}), fechar=True))
+                    break
+                tamanho, fechar, aceita = 0, versao == "HTTP/1.0", ""
+                while True:
+                    h = await reader.readline()
+                    if h in (b"\r\n", b"\n", b""):
+                        break
+                    nome, _, valor = h.decode("latin-1").partition(":")
+                    nome = nome.strip().lower()
+                    if nome == "content-length":
+                        tamanho = int(valor.strip() or 0)
+                    elif nome == "connection":
+                        fechar = valor.strip().lower() == "close"
+                    elif nome == "accept-encoding":
+                        aceita = valor.lower()
+                if tamanho > LIMITE_CORPO:
+                    writer.write(_resposta(413, _json({"erro": "Corpo grande demais."}), fechar=True))
+                    break
+                corpo = await reader.readexactly(tamanho) if tamanho else b""
+                status, dados, tipo, extras = self.atender(metodo, caminho, corpo, aceita)
+                writer.write(_resposta(status, dados, tipo, fechar, extras))
+                await writer.drain()
+                if fechar:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def limpar_sessoes(self, intervalo=30):
+        while True:
+            await asyncio.sleep(intervalo)
+            self.jogo.sessoes.expirar()
+            if self.jogo.progresso:
+                self.jogo.progresso.flush()
+            if self.jogo.diario:
+                self.jogo.diario.flush()
+
+
+async def servir(host, porta, jogo, pronto=None):
+    srv = Servidor(jogo)
+    server = await asyncio.start_server(srv.conexao, host, porta, backlog=4096)
+    limpeza = asyncio.create_task(srv.limpar_sessoes())
+    if pronto is not None:
+        pronto(server)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        limpeza.cancel()
+        if jogo.progresso:
+            jogo.progresso.flush()
+        if jogo.diario:
+            jogo.diario.flush()
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Servidor da versão web do jogo da forca.")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--porta", type=int, default=8000)
+    ap.add_argument("--banco", default=BANCO_ARQUIVO)
+    ap.add_argument("--ttl", type=int, default=TTL_SESSAO, help="segundos até uma sessão parada expirar")
+    ap.add_argument("--semente", type=int)
+    ap.add_argument("--progresso", default=ARQ_PROGRESSO, help="arquivo SQLite do progresso dos jogadores")
+    ap.add_argument("--sem-progresso", action="store_true", help="não guarda progresso de jogadores")
+    ap.add_argument("--eventos", default=ARQ_EVENTOS, help="log binário de eventos das partidas")
+    ap.add_argument("--sem-eventos", action="store_true", help="não grava o log de eventos")
+    ap.add_argument("--chave-dia", help="chave da palavra do dia, igual em todas as réplicas "
+                                        "(padrão: variável FORCA_CHAVE_DIA)")
+    args = ap.parse_args(argv)
+
+    banco = abrir_banco(args.banco)
+    progresso = None if args.sem_progresso else Progresso(args.progresso)
+    try:
+        diario = None if args.sem_eventos else Diario(args.eventos, banco.versao)
+    except LogOcupado as e:
+        print(f"[ERRO] {e}")
+        sys.exit(1)
+    vigia = Vigia(args.banco, banco).iniciar()
+    jogo = Jogo(banco, args.ttl, args.semente, progresso, diario, vigia, args.chave_dia)
+    print(f"Jogo da Forca em http://{args.host}:{args.porta}/ ({len(jogo.banco)} palavras)")
+    try:
+        asyncio.run(servir(args.host, args.porta, jogo))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if diario:
+            diario.fechar()  # rodadas ainda abertas ganham ABANDONO
+
+
+if __name__ == "__main__":
+    main()
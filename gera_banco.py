@@ -8,19 +8,56 @@ Campos por item:
 - forma_normalizada (sem acentos/hífens/espaços)
 - nivel (A/B/C)
 - dica (curta e infantil)
+- letras, mascaras, modelo (esquema 2): letras distintas da palavra, a
+  máscara de posições de cada uma sobre palavra_exibida e o tabuleiro
+  inicial ("___ __ ____"), para os front-ends começarem a rodada sem
+  normalizar nada (forca_motor.campos_revelacao)
+
+Além do JSON, grava `banco_palavras.bin` (formato indexado de
+`forca_banco.py`), que os front-ends abrem com mmap quando disponível, e
+os shards da versão web em docs/banco/ (ver montar_shards) e
+`banco_palavras.dia.json`, com a data em que cada palavra e cada tema
+entram na palavra do dia (forca_dia; ver historico_dia).
+
+Com --entrada o banco vem de um corpus externo (txt, csv ou jsonl) lido
+em fluxo, sem o limite de 200 palavras da curadoria, e vai para o arquivo
+de --saida (obrigatório, para não sobrescrever o banco curado).
+
+Com --nivel-por-simulacao o nível vem dos erros esperados sob estratégias
+de referência (ver simular.py) e cada item ganha o campo `dificuldade`.
+
+Com --nivel-por-dados ANALISE.json o nível vem das partidas reais
+(forca_analise.py sobre os logs de eventos) para as palavras com rodadas
+suficientes; as outras mantêm o nível de definir_nivel.
+
+A fonte do nível (simulação ou dados) fica anotada no manifesto do build e
+vale para os builds seguintes sem opção de nível; --nivel-heuristico volta
+para definir_nivel.
 """
+import argparse
+import csv
+import gzip
+import hashlib
+import inspect
 import json
+import os
 import re
-import unicodedata
+import sys
+import textwrap
+from datetime import date
 from pathlib import Path
 
-def normalizar(palavra: str) -> str:
-    # Remove acentos e caracteres não A-Z (ex.: espaços, hífens)
-    nfkd = unicodedata.normalize("NFKD", palavra)
-    s = "".join(c for c in nfkd if not unicodedata.combining(c))
-    s = s.upper()
-    s = re.sub(r"[^A-Z]", "", s)
-    return s
+from forca_banco import ESQUEMA, NIVEIS, caminho_binario, empacotar_binario, juntar_binarios
+from forca_dia import EPOCA, MARGEM, caminho_historico
+from forca_motor import campos_revelacao, mapear_posicoes
+from forca_normalizacao import normalizar, normalizar_lote
+
+try:
+    import brotli
+except ImportError:  # opcional: sem ele os shards saem só em .json e .json.gz
+    brotli = None
+
+PALAVRA_VALIDA = re.compile(r"^[^\W\d_]+(?:[ \-][^\W\d_]+)*$")  # letras, com espaço/hífen entre partes
 
 def tem_acento_ou_composto(palavra: str) -> bool:
     # Se a palavra exibida perder algo ao normalizar OU contém hífen/espaço
@@ -124,7 +161,7 @@ palavras_por_tema = {
 
     # +50 extras (2º lote) com ajustes:
     # - SAPINHO removido (sem reposição dedicada)
-    # - GUAVA -> AMEIXA (pode repetir com a já existente)
+    # - GUAVA -> AMEIXA -> CAQUI (AMEIXA já está no 1º lote; montar_tema não repete palavra)
     # - LIÇÃO -> TAREFA
     # - CARRINHÃO -> CARRINHO-DE-MÃO
     # - ARENITO removido e substituição PEDREGULHO eliminada (ficamos -1 no lote, como combinado)
@@ -132,7 +169,7 @@ palavras_por_tema = {
         "POLVO","CAMARÃO","CANGURU","GALO","BEIJA-FLOR","MOSCA","CARACOL","TATU","PAVÃO", "FOCA"  # 9 itens (SAPINHO removido)
     ],
     "frutas_extra2": [
-        "TANGERINA","GRAVIOLA","CUPUAÇU","PÊSSEGO","DAMASCO","ACEROLA","AMEIXA"  # GUAVA -> AMEIXA
+        "TANGERINA","GRAVIOLA","CUPUAÇU","PÊSSEGO","DAMASCO","ACEROLA","CAQUI"  # GUAVA -> CAQUI
     ],
     "escola_extra2": [
         "APAGADOR","ESTOJO","TAREFA","GIZ DE CERA","LAPISEIRA","LIVRINHO","APONTADOR"  # LIÇÃO -> TAREFA
@@ -163,40 +200,613 @@ mapa_temas = {
     "corpo": ["corpo", "corpo_extra1", "corpo_extra2"],
 }
 
-# Montar lista final preservando exatamente a contagem acordada (inclui possíveis duplicatas intencionais)
-lista_final = []
-for tema_final, chaves in mapa_temas.items():
-    for chave in chaves:
+def montar_tema(tema_final):
+    # (tema, palavra_exibida) identifica a palavra (forca_banco.chave): repetida no tema entra uma vez só
+    registros, vistas = [], set()
+    for chave in mapa_temas[tema_final]:
         for palavra in palavras_por_tema.get(chave, []):
+            if palavra.upper() in vistas:
+                print(f"[AVISO] {tema_final}/{palavra.upper()} repetida em {chave}; mantida só a primeira.")
+                continue
+            vistas.add(palavra.upper())
             registro = {
                 "tema": tema_final,
                 "palavra_exibida": palavra.upper(),
                 "forma_normalizada": normalizar(palavra),
                 "nivel": definir_nivel(palavra),
                 "dica": dica_padrao(tema_final, palavra),
+                **campos_revelacao(palavra.upper()),
             }
-            lista_final.append(registro)
+            registros.append(registro)
+    return registros
+
+def montar_lista():
+    # Montar lista final na ordem dos temas (sem palavras repetidas dentro de um tema)
+    lista_final = []
+    for tema_final in mapa_temas:
+        lista_final.extend(montar_tema(tema_final))
+    return lista_final
+
+# =========================
+# BUILD INCREMENTAL
+# =========================
+# Cada tema vira uma "parte": o bloco do JSON já formatado, um segmento
+# binário (empacotar_binario só dos itens do tema) e o shard web. O
+# manifesto guarda um hash por tema (listas de origem + regras de nível e
+# dica + escritores) e as partes ficam em .cache_banco/ com esse hash no
+# nome. Só os temas cujo hash mudou são remontados; os outros entram como
+# estão: o bloco é colado no texto, o segmento só é deslocado
+# (forca_banco.juntar_binarios) e o shard já está em docs/banco. Assim o
+# tempo de build acompanha o que mudou, sem reler o JSON nem refazer o
+# binário inteiro.
+# Todas as saídas são gravadas juntas e trocadas no fim, e só depois disso
+# o manifesto anota os hashes novos: um build que falha no meio (ex.:
+# contagem errada) deixa os temas pendentes e o próximo os remonta.
+# O build só é pulado se, além dos temas, o hash das saídas (metadados,
+# junção, caminhos; hash_saidas) e o de cada arquivo gravado ainda baterem
+# com os anotados no manifesto.
 
-# Conferências
-total = len(lista_final)
-temas_contagem = {}
-for item in lista_final:
-    temas_contagem[item["tema"]] = temas_contagem.get(item["tema"], 0) + 1
+METADADOS = {"versao": "1.0.0", "esquema": ESQUEMA, "idioma": "pt-BR", "fonte": "curadoria_interna"}
+SAIDAS_JSON = (Path("banco_palavras.json"), Path("docs") / "banco_palavras.json")
+ARQ_MANIFESTO = Path(".cache_banco") / "manifesto.json"
+ARQ_HISTORICO_DIA = caminho_historico(SAIDAS_JSON[0])
 
-print("Total de itens:", total)
-print("Distribuição por tema:", temas_contagem)
+def hash_regras(extra="") -> str:
+    fontes = [inspect.getsource(f) for f in (normalizar, tem_acento_ou_composto, definir_nivel, dica_padrao,
+                                             mapear_posicoes, campos_revelacao)]
+    return hashlib.sha1("\n".join(fontes + [extra]).encode("utf-8")).hexdigest()
 
-assert total == 200, f"Contagem final diferente de 200 (obtido: {total})"
+def hash_escritores() -> str:
+    """Hash do que gera as partes de um tema: escritores (JSON, binário, shard) e formatos."""
+    from forca_banco import FORMATO
+    fontes = [inspect.getsource(f) for f in (bloco_json, empacotar_binario, montar_shard)]
+    config = json.dumps([FORMATO, ESQUEMA, str(PASTA_SHARDS), brotli is not None])
+    return hashlib.sha1("\n".join(fontes + [config]).encode("utf-8")).hexdigest()
 
-# Empacotar com metadados
-banco = {
-    "versao": "1.0.0",
-    "idioma": "pt-BR",
-    "fonte": "curadoria_interna",
-    "palavras": lista_final
-}
+def hash_saidas() -> str:
+    """Hash do que muda os arquivos gerados sem mudar os temas: metadados,
+    junção das partes e caminhos de saída."""
+    fontes = [inspect.getsource(f) for f in (texto_banco, juntar_binarios, manifesto_web, historico_dia)]
+    config = json.dumps([hash_escritores(), METADADOS, [str(p) for p in SAIDAS_JSON], str(ARQ_HISTORICO_DIA)],
+                        ensure_ascii=False)
+    return hashlib.sha1("\n".join(fontes + [config]).encode("utf-8")).hexdigest()
+
+def _sha1_arquivo(caminho):
+    try:
+        return hashlib.sha1(Path(caminho).read_bytes()).hexdigest()
+    except OSError:
+        return None
+
+def ler_manifesto(manifesto=ARQ_MANIFESTO) -> dict:
+    try:
+        return json.loads(manifesto.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+def saidas_atualizadas(manifesto=ARQ_MANIFESTO) -> bool:
+    """True se os escritores não mudaram e cada arquivo gerado ainda é o que foi gravado."""
+    saidas = ler_manifesto(manifesto).get("saidas") or {}
+    arquivos = saidas.get("arquivos") or {}
+    return (saidas.get("hash") == hash_saidas() and bool(arquivos)
+            and all(_sha1_arquivo(p) == h for p, h in arquivos.items()))
+
+def hash_tema(tema_final, regras) -> str:
+    origem = [[chave, palavras_por_tema.get(chave, [])] for chave in mapa_temas[tema_final]]
+    return hashlib.sha1(json.dumps([tema_final, origem, regras], ensure_ascii=False).encode("utf-8")).hexdigest()
+
+def bloco_json(registros) -> str:
+    # itens no mesmo recuo de json.dumps(banco, indent=2)
+    return ",\n".join(textwrap.indent(json.dumps(r, ensure_ascii=False, indent=2), "    ") for r in registros)
+
+def texto_banco(blocos, metadados=METADADOS) -> str:
+    cab = json.dumps({**metadados, "palavras": []}, ensure_ascii=False, indent=2)
+    corpo = ",\n".join(b for b in blocos if b)
+    return cab[:-len("[]\n}")] + "[\n" + corpo + "\n  ]\n}"
+
+def gravar_atomico(arquivos):
+    """Grava todos os arquivos em .tmp e só então troca cada um de uma vez (os.replace)."""
+    tmps = []
+    for caminho, dados in arquivos.items():
+        caminho.parent.mkdir(parents=True, exist_ok=True)
+        tmp = caminho.with_name(caminho.name + ".tmp")
+        tmp.write_bytes(dados)
+        tmps.append((tmp, caminho))
+    for tmp, caminho in tmps:
+        os.replace(tmp, caminho)
+
+# Versão web: em vez do JSON inteiro, um manifesto pequeno (temas, níveis e
+# contagens) e um shard minificado por tema, com as dicas repetidas
+# guardadas uma vez só. O nome do shard leva o hash do conteúdo, então pode
+# ficar em cache para sempre; cada um sai também pré-comprimido em .gz
+# (e .br, se o módulo brotli estiver instalado). Cada palavra do shard é
+# [exibida, nível, índice da dica, forma, letras, máscaras, modelo].
+
+PASTA_SHARDS = Path("docs") / "banco"
+ARQ_MANIFESTO_WEB = PASTA_SHARDS / "manifesto.json"
+
+def _minificar(obj) -> bytes:
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+def montar_shard(tema, registros, pasta=PASTA_SHARDS):
+    """({caminho: bytes} do shard do tema e versões comprimidas, entrada do tema no manifesto web)."""
+    dicas, pos_dica, palavras = [], {}, []
+    for r in registros:
+        d = r.get("dica", "")
+        if d not in pos_dica:
+            pos_dica[d] = len(dicas)
+            dicas.append(d)
+        linha = [r["palavra_exibida"], r.get("nivel", "A"), pos_dica[d]]
+        if "mascaras" in r:
+            linha += [r["forma_normalizada"], r["letras"], r["mascaras"], r["modelo"]]
+        palavras.append(linha)
+    dados = _minificar({"tema": tema, "dicas": dicas, "palavras": palavras})
+    nome = f"{normalizar(tema).lower() or 'tema'}.{hashlib.sha256(dados).hexdigest()[:12]}.json"
+    arquivos = {pasta / nome: dados, pasta / (nome + ".gz"): gzip.compress(dados, 9, mtime=0)}
+    if brotli is not None:
+        arquivos[pasta / (nome + ".br")] = brotli.compress(dados, quality=11)
+    niveis = {n: sum(1 for p in palavras if p[1] == n) for n in NIVEIS}
+    return arquivos, {"arquivo": nome, "total": len(palavras), "niveis": niveis}
+
+def manifesto_web(metadados, temas, historico) -> bytes:
+    """Manifesto da versão web a partir das entradas de montar_shard ({tema: entrada}).
+
+    Do histórico da palavra do dia vão só as datas depois da EPOCA (as
+    outras são o padrão do docs/app.js)."""
+    manifesto = {k: metadados.get(k, "") for k in ("versao", "esquema", "idioma", "fonte")}
+    manifesto.update({"niveis": list(NIVEIS), "temas": {t: temas[t] for t in sorted(temas)},
+                      "dia": {k: {c: d for c, d in v.items() if d > EPOCA.isoformat()}
+                              for k, v in historico.items()}})
+    return _minificar(manifesto)
+
+def limpar_shards(arquivos, pasta=PASTA_SHARDS):
+    """Apaga shards antigos (hash que não está mais no manifesto)."""
+    for p in pasta.glob("*.json*"):
+        if p not in arquivos:
+            p.unlink()
+
+def montar_parte(tema_final, registros) -> dict:
+    """Parte de um tema: bloco do JSON, segmento binário e shard web (bytes novos em `shard`)."""
+    shard, web = montar_shard(tema_final, registros)
+    return {"bloco": bloco_json(registros), "binario": empacotar_binario({"palavras": registros}),
+            "shard": shard, "hashes": {p: hashlib.sha1(d).hexdigest() for p, d in shard.items()}, "web": web,
+            "palavras": [r["palavra_exibida"] for r in registros]}
+
+def _cache_parte(tema_final, h, manifesto=ARQ_MANIFESTO):
+    return (manifesto.parent / f"{tema_final}.{h[:16]}.frag", manifesto.parent / f"{tema_final}.{h[:16]}.bin")
+
+def carregar_parte(tema_final, entrada, manifesto=ARQ_MANIFESTO):
+    """Parte guardada do tema, ou None se falta algum arquivo ou um shard não é mais o gravado."""
+    frag, segmento = _cache_parte(tema_final, entrada["hash"], manifesto)
+    hashes = {Path(p): h for p, h in entrada.get("shard", {}).items()}
+    if not (frag.exists() and segmento.exists() and hashes and "palavras" in entrada) or any(
+            _sha1_arquivo(p) != h for p, h in hashes.items()):
+        return None
+    return {"bloco": frag.read_text(encoding="utf-8"), "binario": segmento.read_bytes(),
+            "shard": {}, "hashes": hashes, "web": entrada["web"], "palavras": entrada["palavras"]}
+
+def build_incremental(regras, forcar=False, manifesto=ARQ_MANIFESTO):
+    """Devolve (partes por tema, temas remontados); nada é gravado aqui (ver registrar_build)."""
+    anterior = {} if forcar else ler_manifesto(manifesto).get("temas", {})
+    partes, remontados = {}, []
+    for tema_final in mapa_temas:
+        h = hash_tema(tema_final, regras)
+        entrada = anterior.get(tema_final)
+        parte = None
+        if isinstance(entrada, dict) and entrada.get("hash") == h:
+            parte = carregar_parte(tema_final, entrada, manifesto)
+        if parte is None:
+            parte = montar_parte(tema_final, montar_tema(tema_final))
+            remontados.append(tema_final)
+        parte["hash"] = h
+        partes[tema_final] = parte
+    return partes, remontados
+
+def registrar_build(regras, partes, saidas, manifesto=ARQ_MANIFESTO, niveis=None):
+    """Depois de gravadas as saídas: guarda as partes novas e anota temas, saídas e a fonte do nível
+    (`niveis`, None = heurística) no manifesto."""
+    manifesto.parent.mkdir(parents=True, exist_ok=True)
+    vivos = {manifesto}
+    for tema_final, parte in partes.items():
+        frag, segmento = _cache_parte(tema_final, parte["hash"], manifesto)
+        if not (frag.exists() and segmento.exists()):
+            frag.write_text(parte["bloco"], encoding="utf-8")
+            segmento.write_bytes(parte["binario"])
+        vivos.update((frag, segmento))
+    for p in manifesto.parent.iterdir():
+        if p not in vivos and p.suffix in (".frag", ".bin"):
+            p.unlink()
+    temas = {t: {"hash": p["hash"], "web": p["web"], "shard": {str(c): h for c, h in p["hashes"].items()},
+                 "palavras": p["palavras"]}
+             for t, p in partes.items()}
+    dados = {"regras": regras, "temas": temas,
+             "saidas": {"hash": hash_saidas(),
+                        "arquivos": {str(p): hashlib.sha1(d).hexdigest() for p, d in saidas.items()}}}
+    if niveis:
+        dados["niveis"] = niveis
+    tmp = manifesto.with_name(manifesto.name + ".tmp")
+    tmp.write_text(json.dumps(dados, indent=2, ensure_ascii=False), encoding="utf-8")
+    os.replace(tmp, manifesto)
+
+def historico_dia(partes, anterior, hoje=None) -> dict:
+    """Data em que cada palavra ("tema|PALAVRA") e cada tema entram na palavra do dia.
+
+    O que já estava no histórico anterior mantém a data; o que é novo entra
+    em hoje + MARGEM, então só conta a partir do próximo ciclo do filtro
+    (forca_dia). Sem histórico anterior tudo vale desde a EPOCA, que é a
+    sequência que os bancos sem histórico já davam.
+    """
+    temas_ant, palavras_ant = anterior.get("temas") or {}, anterior.get("palavras") or {}
+    entra = (EPOCA if not temas_ant else (hoje or date.today()) + MARGEM).isoformat()
+    temas, palavras = {}, {}
+    for tema_final, parte in partes.items():
+        temas[tema_final] = temas_ant.get(tema_final, entra)
+        for w in parte["palavras"]:
+            k = f"{tema_final}|{w}"
+            palavras[k] = palavras_ant.get(k, entra)
+    return {"palavras": palavras, "temas": temas}
+
+# =========================
+# NÍVEL POR SIMULAÇÃO
+# =========================
+# Em vez da heurística de definir_nivel, cada palavra é jogada por algumas
+# estratégias de referência (as mesmas de simular.py) e o nível sai da
+# média de erros esperados. As partidas vão até descobrir a palavra (sem o
+# limite de MAX_ERROS, que achataria tudo em 6). Aleatória é jogada várias
+# vezes por palavra;
+# as outras são determinísticas. O resultado fica em cache por hash da
+# palavra, das palavras do tema (as estratégias só olham candidatas do
+# tema) e do código das estratégias, então regerar o banco só pontua o
+# que é novo ou mudou. A fonte do nível (simulação ou dados) fica no
+# manifesto e os builds seguintes sem opção continuam com ela, até
+# --nivel-heuristico.
+
+ESTRATEGIAS_REFERENCIA = ("aleatoria", "frequencia", "solver")
+REPETICOES_ALEATORIA = 24
+LIMITE_ERROS_PONTUACAO = 26  # dá para errar todas as letras: a partida sempre termina em vitória
+ARQ_CACHE_NIVEIS = ".cache_niveis.json"
+
+_banco_ref = None
+_estrategias_ref = {}
+
+def hash_contexto(lista) -> dict:
+    """Por tema: hash do que a pontuação vê além da palavra (formas do tema, limites e código das estratégias)."""
+    import forca_candidatos
+    import forca_motor
+    import forca_solver
+    import simular
+    codigo = "\n".join(inspect.getsource(m) for m in (simular, forca_candidatos, forca_solver, forca_motor))
+    por_tema = {}
+    for r in lista:
+        por_tema.setdefault(r["tema"], []).append(r["forma_normalizada"])
+    return {t: hashlib.sha1(json.dumps([formas, LIMITE_ERROS_PONTUACAO], ensure_ascii=False).encode("utf-8")
+                            + codigo.encode("utf-8")).hexdigest()
+            for t, formas in por_tema.items()}
+
+def hash_palavra(registro, estrategias, contexto="") -> str:
+    chave = "|".join([registro["tema"], registro["palavra_exibida"], ",".join(estrategias),
+                      str(REPETICOES_ALEATORIA), contexto])
+    return hashlib.sha1(chave.encode("utf-8")).hexdigest()
+
+def _iniciar_pontuacao(palavras):
+    global _banco_ref
+    from forca_banco import Banco
+    _banco_ref = Banco(palavras)
+
+def _pontuar_lote(ids, estrategias):
+    import random
+    from simular import ESTRATEGIAS, jogar_sem_tela
+    resultados = []
+    for i in ids:
+        item = _banco_ref.item(i)
+        erros_por_estrategia = []
+        for nome in estrategias:
+            e = _estrategias_ref.get(nome)
+            if e is None:
+                e = _estrategias_ref[nome] = ESTRATEGIAS[nome](_banco_ref, random.Random(0))
+            reps = REPETICOES_ALEATORIA if nome == "aleatoria" else 1
+            if hasattr(e, "rng"):
+                e.rng = random.Random(i)
+            total = sum(jogar_sem_tela(item, e, LIMITE_ERROS_PONTUACAO)[1] for _ in range(reps))
+            erros_por_estrategia.append(total / reps)
+        resultados.append((i, sum(erros_por_estrategia) / len(erros_por_estrategia)))
+    return resultados
+
+def pontuar_dificuldade(lista, estrategias, workers=None, arq_cache=ARQ_CACHE_NIVEIS, lote=256):
+    """Preenche `dificuldade` (erros esperados) em cada registro; devolve quantos foram pontuados agora."""
+    from concurrent.futures import ProcessPoolExecutor
+
+    cache_path = Path(arq_cache)
+    cache = json.loads(cache_path.read_text(encoding="utf-8")) if cache_path.exists() else {}
+    contexto = hash_contexto(lista)
+    hashes = [hash_palavra(r, estrategias, contexto[r["tema"]]) for r in lista]
+    pendentes = [i for i, h in enumerate(hashes) if h not in cache]
+
+    if pendentes:
+        lotes = [pendentes[k:k + lote] for k in range(0, len(pendentes), lote)]
+        with ProcessPoolExecutor(max_workers=workers, initializer=_iniciar_pontuacao, initargs=(lista,)) as ex:
+            for resultados in ex.map(_pontuar_lote, lotes, [estrategias] * len(lotes)):
+                for i, pontos in resultados:
+                    cache[hashes[i]] = round(pontos, 4)
+        cache_path.write_text(json.dumps(cache), encoding="utf-8")
+
+    for r, h in zip(lista, hashes):
+        r["dificuldade"] = cache[h]
+    return len(pendentes)
+
+def niveis_por_dificuldade(lista, cortes=(1 / 3, 2 / 3)):
+    """A/B/C pelos quantis de `dificuldade` no próprio banco."""
+    valores = sorted(r["dificuldade"] for r in lista)
+    limites = [valores[min(int(q * len(valores)), len(valores) - 1)] for q in cortes]
+    for r in lista:
+        d = r["dificuldade"]
+        r["nivel"] = "A" if d < limites[0] else "B" if d < limites[1] else "C"
+
+def niveis_por_dados(lista, arq_analise, min_rodadas=20, cortes=(1 / 3, 2 / 3)):
+    """A/B/C pelos quantis da dificuldade real (forca_analise) entre as palavras com dados; devolve quantas."""
+    analise = json.loads(Path(arq_analise).read_text(encoding="utf-8"))
+    dificuldade = {(p["tema"], p["palavra"]): p["dificuldade"]
+                   for p in analise["palavras"] if p["rodadas"] >= min_rodadas}
+    com_dados = [r for r in lista if (r["tema"], r["palavra_exibida"]) in dificuldade]
+    if not com_dados:
+        return 0
+    valores = sorted(dificuldade[(r["tema"], r["palavra_exibida"])] for r in com_dados)
+    limites = [valores[min(int(q * len(valores)), len(valores) - 1)] for q in cortes]
+    for r in com_dados:
+        d = dificuldade[(r["tema"], r["palavra_exibida"])]
+        r["nivel"] = "A" if d < limites[0] else "B" if d < limites[1] else "C"
+    return len(com_dados)
+
+# =========================
+# INGESTÃO DE CORPORA GRANDES
+# =========================
+# Pipeline de geradores: ler -> normalizar (opcionalmente em processos) ->
+# deduplicar -> filtrar -> nível/dica -> gravar. Nada acumula o corpus: a
+# memória fica limitada ao conjunto de hashes da deduplicação.
+
+FORMATOS = ("txt", "csv", "jsonl")
+TAMANHO_BLOCO = 20_000
+
+def detectar_formato(caminho) -> str:
+    ext = Path(caminho).suffix.lower().lstrip(".")
+    return ext if ext in FORMATOS else "txt"
+
+def ler_entrada(caminho, formato, tema_padrao):
+    """Gera (tema, palavra, dica ou None) do arquivo, uma linha por vez."""
+    with open(caminho, encoding="utf-8", newline="") as f:
+        if formato == "csv":
+            for linha in csv.DictReader(f):
+                palavra = (linha.get("palavra") or linha.get("palavra_exibida") or "").strip()
+                yield (linha.get("tema") or tema_padrao).strip(), palavra, (linha.get("dica") or None)
+        elif formato == "jsonl":
+            for linha in f:
+                if not linha.strip():
+                    continue
+                obj = json.loads(linha)
+                palavra = (obj.get("palavra") or obj.get("palavra_exibida") or "").strip()
+                yield obj.get("tema") or tema_padrao, palavra, obj.get("dica")
+        else:
+            for linha in f:
+                palavra = linha.strip()
+                if palavra and not palavra.startswith("#"):
+                    yield tema_padrao, palavra, None
+
+def _blocos(it, n):
+    bloco = []
+    for x in it:
+        bloco.append(x)
+        if len(bloco) >= n:
+            yield bloco
+            bloco = []
+    if bloco:
+        yield bloco
+
+def _normalizar_bloco(bloco):
+    formas = normalizar_lote(palavra for _, palavra, _ in bloco)
+    return [(tema, palavra.upper(), forma, dica) for (tema, palavra, dica), forma in zip(bloco, formas)]
+
+def normalizar_fluxo(registros, workers=0):
+    """Acrescenta a forma normalizada; com workers > 0 distribui blocos entre processos,
+    mantendo no máximo 2 blocos por worker em voo (memória limitada)."""
+    blocos = _blocos(registros, TAMANHO_BLOCO)
+    if not workers:
+        for bloco in blocos:
+            yield from _normalizar_bloco(bloco)
+        return
+    from collections import deque
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=workers) as ex:
+        em_voo = deque()
+        for bloco in blocos:
+            em_voo.append(ex.submit(_normalizar_bloco, bloco))
+            if len(em_voo) >= 2 * workers:
+                yield from em_voo.popleft().result()
+        while em_voo:
+            yield from em_voo.popleft().result()
+
+def deduplicar(registros, estatisticas):
+    vistos = set()  # hash de 64 bits de (tema, forma): ~memória do conjunto, não do corpus
+    for r in registros:
+        h = hashlib.blake2b(f"{r[0]}|{r[2]}".encode("utf-8"), digest_size=8).digest()
+        if h in vistos:
+            estatisticas["duplicadas"] += 1
+            continue
+        vistos.add(h)
+        yield r
+
+def filtrar(registros, estatisticas, min_letras=2, max_letras=20):
+    for r in registros:
+        tema, exibida, forma, _ = r
+        if not tema or not (min_letras <= len(forma) <= max_letras) or not PALAVRA_VALIDA.match(exibida):
+            estatisticas["descartadas"] += 1
+            continue
+        yield r
+
+def montar_registros(registros):
+    for tema, exibida, forma, dica in registros:
+        yield {
+            "tema": tema,
+            "palavra_exibida": exibida,
+            "forma_normalizada": forma,
+            "nivel": definir_nivel(exibida),
+            "dica": dica or dica_padrao(tema, exibida),
+            **campos_revelacao(exibida),
+        }
+
+def gravar_fluxo(registros, saida, metadados):
+    """Grava o banco item a item (um por linha) e troca o arquivo no fim."""
+    saida = Path(saida)
+    tmp = saida.with_name(saida.name + ".tmp")
+    n = 0
+    with open(tmp, "w", encoding="utf-8") as f:
+        cab = json.dumps(metadados, ensure_ascii=False)[:-1]
+        f.write(cab + (", " if metadados else "") + '"palavras": [\n')
+        for r in registros:
+            if n:
+                f.write(",\n")
+            f.write(json.dumps(r, ensure_ascii=False))
+            n += 1
+        f.write("\n]}\n")
+    tmp.replace(saida)
+    return n
+
+def ingerir(entrada, saida, formato=None, tema_padrao="geral", workers=0, min_letras=2, max_letras=20):
+    estatisticas = {"duplicadas": 0, "descartadas": 0}
+    formato = formato or detectar_formato(entrada)
+    fluxo = ler_entrada(entrada, formato, tema_padrao)
+    fluxo = normalizar_fluxo(fluxo, workers)
+    fluxo = deduplicar(fluxo, estatisticas)
+    fluxo = filtrar(fluxo, estatisticas, min_letras, max_letras)
+    fluxo = montar_registros(fluxo)
+    meta = {"versao": "1.0.0", "esquema": ESQUEMA, "idioma": "pt-BR", "fonte": Path(entrada).name}
+    estatisticas["gravadas"] = gravar_fluxo(fluxo, saida, meta)
+    return estatisticas
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Gera o banco de palavras do jogo da forca.")
+    ap.add_argument("--nivel-por-simulacao", action="store_true",
+                    help="define o nível pelos erros esperados das estratégias de referência")
+    ap.add_argument("--estrategias", default=",".join(ESTRATEGIAS_REFERENCIA),
+                    help="estratégias de referência, separadas por vírgula")
+    ap.add_argument("--workers", type=int, help="processos para a pontuação (padrão: todos os núcleos)")
+    ap.add_argument("--cache", default=ARQ_CACHE_NIVEIS, help="cache de pontuação por hash de palavra")
+    ap.add_argument("--nivel-por-dados", metavar="ANALISE",
+                    help="define o nível pelas partidas reais (JSON de forca_analise.py --saida)")
+    ap.add_argument("--min-rodadas", type=int, default=20,
+                    help="rodadas terminadas para uma palavra usar o nível por dados")
+    ap.add_argument("--nivel-heuristico", action="store_true",
+                    help="volta ao nível pela heurística (esquece a fonte de nível dos builds anteriores)")
+    ap.add_argument("--entrada", help="gera o banco a partir de um corpus (txt, csv ou jsonl) em fluxo")
+    ap.add_argument("--formato", choices=FORMATOS, help="formato da --entrada (padrão: pela extensão)")
+    ap.add_argument("--tema", default="geral", help="tema para linhas sem tema na --entrada")
+    ap.add_argument("--saida", help="arquivo gerado no modo --entrada (obrigatório com --entrada)")
+    ap.add_argument("--min-letras", type=int, default=2)
+    ap.add_argument("--max-letras", type=int, default=20)
+    ap.add_argument("--completo", action="store_true", help="ignora o cache e remonta todos os temas")
+    args = ap.parse_args(argv)
+
+    if args.saida and not args.entrada:
+        print("[ERRO] --saida só vale com --entrada.")
+        sys.exit(1)
+    if args.entrada:
+        # sem padrão: um corpus externo nunca sobrescreve o banco curado por engano
+        if not args.saida:
+            print("[ERRO] Com --entrada, informe o arquivo gerado com --saida.")
+            sys.exit(1)
+        if Path(args.saida).resolve() == Path(args.entrada).resolve():
+            print("[ERRO] --saida não pode ser o próprio arquivo de --entrada.")
+            sys.exit(1)
+        est = ingerir(args.entrada, args.saida, args.formato, args.tema, args.workers or 0,
+                      args.min_letras, args.max_letras)
+        print(f"{est['gravadas']} palavra(s) gravada(s) em {args.saida} "
+              f"({est['duplicadas']} duplicada(s), {est['descartadas']} descartada(s)).")
+        return
+
+    if args.nivel_por_simulacao + bool(args.nivel_por_dados) + args.nivel_heuristico > 1:
+        print("[ERRO] Use só uma entre --nivel-por-simulacao, --nivel-por-dados e --nivel-heuristico.")
+        sys.exit(1)
+    if args.nivel_por_simulacao:
+        niveis = {"fonte": "simulacao", "estrategias": [e for e in args.estrategias.split(",") if e],
+                  "cache": args.cache}
+    elif args.nivel_por_dados:
+        niveis = {"fonte": "dados", "analise": args.nivel_por_dados, "min_rodadas": args.min_rodadas}
+    elif args.nivel_heuristico:
+        niveis = None
+    else:
+        niveis = ler_manifesto().get("niveis")  # a fonte do último build continua valendo
+        if niveis:
+            print(f"Nível por {niveis['fonte']}, como no último build (--nivel-heuristico para voltar).")
+    regras = hash_regras(hash_escritores())
+    if niveis:
+        # o nível depende do banco inteiro (quantis): sem reaproveitar partes
+        lista_final = montar_lista()
+        remontados = list(mapa_temas)
+    else:
+        partes, remontados = build_incremental(regras, args.completo)
+        if not remontados and saidas_atualizadas():
+            print("Nenhum tema mudou; saídas já atualizadas.")
+            return
+        lista_final = None
+
+    # Conferências
+    if lista_final is not None:
+        temas_contagem = {}
+        for item in lista_final:
+            temas_contagem[item["tema"]] = temas_contagem.get(item["tema"], 0) + 1
+    else:
+        temas_contagem = {t: p["web"]["total"] for t, p in partes.items()}
+    total = sum(temas_contagem.values())
+
+    print("Total de itens:", total)
+    print("Distribuição por tema:", temas_contagem)
+    print("Temas remontados:", ", ".join(remontados) or "nenhum")
+
+    assert total == 200, f"Contagem final diferente de 200 (obtido: {total})"
+
+    if niveis and niveis["fonte"] == "simulacao":
+        estrategias = list(niveis["estrategias"])
+        if "solver" in estrategias:
+            from forca_solver import np
+            if np is None:
+                print("NumPy indisponível: estratégia 'solver' ignorada.")
+                estrategias.remove("solver")
+        novas = pontuar_dificuldade(lista_final, estrategias, args.workers, niveis["cache"])
+        niveis_por_dificuldade(lista_final)
+        print(f"Níveis por simulação ({', '.join(estrategias)}): {novas} palavra(s) pontuada(s), "
+              f"{total - novas} do cache.")
+    elif niveis:
+        try:
+            com_dados = niveis_por_dados(lista_final, niveis["analise"], niveis["min_rodadas"])
+        except (OSError, ValueError, KeyError) as e:
+            print(f"[ERRO] Análise inválida em {niveis['analise']}: {e}")
+            sys.exit(1)
+        print(f"Níveis por dados reais: {com_dados} palavra(s) com pelo menos {niveis['min_rodadas']} rodada(s); "
+              f"{total - com_dados} pela heurística.")
+    if lista_final is not None:
+        por_tema = {}
+        for item in lista_final:
+            por_tema.setdefault(item["tema"], []).append(item)
+        partes = {t: montar_parte(t, regs) for t, regs in por_tema.items()}
+
+    # Salvar: JSON da raiz, cópia em docs/, binário e versão web, trocados juntos no fim
+    dados_json = texto_banco(p["bloco"] for p in partes.values()).encode("utf-8")
+    saidas = {p: dados_json for p in SAIDAS_JSON}
+    saidas[caminho_binario(SAIDAS_JSON[0])] = juntar_binarios([p["binario"] for p in partes.values()], METADADOS)
+    historico = historico_dia(partes, ler_manifesto(ARQ_HISTORICO_DIA))
+    saidas[ARQ_HISTORICO_DIA] = json.dumps(historico, indent=2, ensure_ascii=False).encode("utf-8")
+    saidas[ARQ_MANIFESTO_WEB] = manifesto_web(METADADOS, {t: p["web"] for t, p in partes.items()}, historico)
+    shards = {c: d for p in partes.values() for c, d in p["shard"].items()}
+    gravar_atomico({**saidas, **shards})
+    limpar_shards({ARQ_MANIFESTO_WEB} | {c for p in partes.values() for c in p["hashes"]})
+    if lista_final is None:  # build incremental: anota os temas só com as saídas já trocadas
+        registrar_build(regras, partes, saidas)
+    else:
+        # partes com o nível de fora não servem ao build heurístico: só a fonte do nível fica
+        registrar_build(regras, {}, saidas, niveis=niveis)
+    for p in SAIDAS_JSON + (caminho_binario(SAIDAS_JSON[0]), ARQ_HISTORICO_DIA):
+        print(f"Arquivo salvo em: {p.resolve()}")
+    web = sum(len(d) for c, d in shards.items() if c.suffix == ".json") + len(saidas[ARQ_MANIFESTO_WEB])
+    print(f"Versão web: {len(shards) + 1} arquivo(s) novo(s) em {PASTA_SHARDS.resolve()} "
+          f"({web} bytes sem compressão)" + ("" if brotli else "; sem brotli, só .gz"))
 
-# Salvar
-saida = Path("banco_palavras.json")
-saida.write_text(json.dumps(banco, ensure_ascii=False, indent=2), encoding="utf-8")
-print(f"Arquivo salvo em: {saida.resolve()}")
+if __name__ == "__main__":
+    main()
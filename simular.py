@@ -0,0 +1,245 @@
+# -*- coding: utf-8 -*-
+"""
+Simulador Monte-Carlo de partidas de forca, sem tela.
+
+Joga muitas partidas com as mesmas regras de `jogar_partida` (via
+`forca_motor.Partida`: MAX_ERROS, erro ao errar o chute com '!', dica
+automática após 2 erros) usando estratégias de palpite plugáveis, em
+paralelo com ProcessPoolExecutor.
+
+Relata taxa de vitória e distribuição de erros por tema/nível, partidas por
+segundo e, com --escala, como o desempenho cresce com o número de workers.
+
+Exemplos:
+    python simular.py --jogos 1000000 --estrategia frequencia
+    python simular.py --jogos 200000 --escala --json resultado.json
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from forca_banco import abrir_banco
+from forca_candidatos import LETRAS, IndiceCandidatos
+from forca_motor import MAX_ERROS, Partida
+
+BANCO_ARQUIVO = "banco_palavras.json"
+TAMANHO_LOTE = 5000
+
+
+# ===== estratégias =====
+# Uma estratégia recebe a partida em andamento e devolve uma letra,
+# ("!", palavra) para chutar a palavra inteira ou None quando já tentou
+# todas as letras (a rodada fica esgotada, sem resultado).
+
+class Aleatoria:
+    def __init__(self, banco, rng):
+        self.rng = rng
+
+    def __call__(self, partida):
+        livres = [l for l in LETRAS if l not in partida.tentadas]
+        return self.rng.choice(livres) if livres else None
+
+
+class Frequencia:
+    """Letra mais comum entre as palavras do tema que cabem no tabuleiro (sem NumPy)."""
+
+    def __init__(self, banco, rng):
+        self.banco = banco
+        self.indice = IndiceCandidatos(banco)
+
+    def __call__(self, partida):
+        c = self.indice.consultar(partida.padrao(), partida.tentadas, partida.item["tema"])
+        if c.total == 1:
+            return ("!", self.banco.item(next(c.ids()))["forma_normalizada"])
+        letra = c.melhor_letra()
+        if letra is None:
+            letra = next((l for l in LETRAS if l not in partida.tentadas), None)
+        return letra
+
+
+class SolverNumpy:
+    """Solver vetorizado de `forca_solver` (estratégia de informação)."""
+
+    def __init__(self, banco, rng, estrategia="informacao"):
+        from forca_solver import PALAVRA, Solver
+        self.solver = Solver(banco, estrategia)
+        self._palavra = PALAVRA
+
+    def __call__(self, partida):
+        tipo, valor = self.solver.proxima_jogada(partida.padrao(), partida.tentadas, partida.item["tema"])
+        return ("!", valor) if tipo == self._palavra else valor
+
+
+ESTRATEGIAS = {
+    "aleatoria": Aleatoria,
+    "frequencia": Frequencia,
+    "solver": SolverNumpy,
+}
+
+
+def jogar_sem_tela(item, estrategia, max_erros=MAX_ERROS):
+    """Joga uma partida até o fim; devolve (venceu, erros, dica_apareceu).
+
+    `venceu` é None se a estratégia ficou sem letras antes do fim (esgotada).
+    """
+    partida = Partida(item, max_erros)
+    while not partida.terminada:
+        palpite = estrategia(partida)
+        if palpite is None:
+            break
+        if isinstance(palpite, tuple):
+            partida.chutar(palpite[1])
+        else:
+            partida.tentar_letra(palpite)
+    return partida.resultado, partida.erros, partida.dica_visivel
+
+
+# ===== workers =====
+_banco = None
+_estrategias = {}
+
+
+def _iniciar_worker(caminho):
+    global _banco
+    _banco = abrir_banco(caminho)
+
+
+def _simular_lote(nome, jogos, semente, tema, nivel):
+    rng = random.Random(semente)
+    estrategia = _estrategias.get(nome)
+    if estrategia is None:
+        estrategia = _estrategias[nome] = ESTRATEGIAS[nome](_banco, rng)
+    if hasattr(estrategia, "rng"):
+        estrategia.rng = rng
+
+    if tema:
+        ids = list(_banco.indices(tema, nivel))
+    else:
+        ids = None
+    n = len(_banco)
+    stats = {}
+    for _ in range(jogos):
+        i = rng.choice(ids) if ids is not None else rng.randrange(n)
+        item = _banco.item(i)
+        venceu, erros, dica = jogar_sem_tela(item, estrategia)
+        chave = f"{item['tema']}/{item['nivel']}"
+        s = stats.get(chave)
+        if s is None:
+            s = stats[chave] = {"jogos": 0, "vitorias": 0, "esgotadas": 0, "dicas": 0,
+                                "erros": [0] * (MAX_ERROS + 1)}
+        s["jogos"] += 1
+        s["vitorias"] += bool(venceu)
+        s["esgotadas"] += venceu is None
+        s["dicas"] += dica
+        s["erros"][erros] += 1
+    return stats
+
+
+def _somar(total, parcial):
+    for chave, s in parcial.items():
+        t = total.get(chave)
+        if t is None:
+            total[chave] = s
+            continue
+        for campo in ("jogos", "vitorias", "esgotadas", "dicas"):
+            t[campo] += s[campo]
+        t["erros"] = [a + b for a, b in zip(t["erros"], s["erros"])]
+
+
+def simular(caminho, estrategia, jogos, workers, semente=0, tema=None, nivel="TODOS"):
+    """Roda `jogos` partidas em `workers` processos; devolve (stats, segundos)."""
+    lotes = []
+    resto = jogos
+    while resto > 0:
+        lotes.append(min(TAMANHO_LOTE, resto))
+        resto -= lotes[-1]
+
+    stats = {}
+    inicio = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_iniciar_worker, initargs=(caminho,)) as ex:
+        futuros = [
+            ex.submit(_simular_lote, estrategia, n, semente * 1_000_003 + k, tema, nivel)
+            for k, n in enumerate(lotes)
+        ]
+        for f in futuros:
+            _somar(stats, f.result())
+    return stats, time.perf_counter() - inicio
+
+
+def relatorio(stats, segundos, jogos):
+    print(f"{'tema/nivel':<22} {'jogos':>9} {'vitória':>8} {'erros médios':>13} {'dica':>6}  erros 0..{MAX_ERROS}")
+    for chave in sorted(stats):
+        s = stats[chave]
+        media = sum(k * v for k, v in enumerate(s["erros"])) / s["jogos"]
+        dist = " ".join(f"{v / s['jogos']:.2f}" for v in s["erros"])
+        print(f"{chave:<22} {s['jogos']:>9} {s['vitorias'] / s['jogos']:>8.1%} {media:>13.2f} "
+              f"{s['dicas'] / s['jogos']:>6.1%}  {dist}")
+    esgotadas = sum(s["esgotadas"] for s in stats.values())
+    if esgotadas:
+        print(f"\n[AVISO] {esgotadas} partida(s) esgotada(s): a estratégia tentou todas as letras sem terminar.")
+    print(f"\n{jogos} partidas em {segundos:.2f}s = {jogos / segundos:,.0f} partidas/s")
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Simulador Monte-Carlo do jogo da forca.")
+    ap.add_argument("--banco", default=BANCO_ARQUIVO)
+    ap.add_argument("--jogos", type=int, default=100_000)
+    ap.add_argument("--estrategia", choices=sorted(ESTRATEGIAS), default="frequencia")
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    ap.add_argument("--semente", type=int, default=0)
+    ap.add_argument("--tema", help="restringe o sorteio a um tema")
+    ap.add_argument("--nivel", default="TODOS", choices=["A", "B", "C", "TODOS"])
+    ap.add_argument("--escala", action="store_true",
+                    help="repete com 1, 2, 4, ... workers e mostra partidas/s de cada")
+    ap.add_argument("--json", help="grava os resultados neste arquivo")
+    args = ap.parse_args(argv)
+
+    if args.estrategia == "solver":
+        from forca_solver import np
+        if np is None:
+            print("[ERRO] A estratégia 'solver' precisa do NumPy (pip install numpy).")
+            sys.exit(1)
+
+    if args.tema:
+        try:
+            banco = abrir_banco(args.banco)
+        except (OSError, ValueError) as e:
+            print(f"[ERRO] {e}")
+            sys.exit(1)
+        if args.tema not in banco.temas:
+            print(f"[ERRO] Tema {args.tema!r} não existe no banco (temas: {', '.join(banco.temas)}).")
+            sys.exit(1)
+        if not banco.indices(args.tema, args.nivel):
+            print(f"[ERRO] Não há palavras de nível {args.nivel} no tema {args.tema!r}.")
+            sys.exit(1)
+
+    saida = {"estrategia": args.estrategia, "jogos": args.jogos}
+    stats, segundos = simular(args.banco, args.estrategia, args.jogos, args.workers,
+                              args.semente, args.tema, args.nivel)
+    relatorio(stats, segundos, args.jogos)
+    saida.update(workers=args.workers, segundos=segundos, por_tema_nivel=stats)
+
+    if args.escala:
+        print("\nworkers  partidas/s  ganho")
+        escala = []
+        w, base = 1, None
+        while w <= args.workers:
+            _, seg = simular(args.banco, args.estrategia, args.jogos, w, args.semente, args.tema, args.nivel)
+            taxa = args.jogos / seg
+            base = base or taxa
+            escala.append({"workers": w, "partidas_por_s": taxa, "ganho": taxa / base})
+            print(f"{w:>7}  {taxa:>10,.0f}  {taxa / base:>5.2f}x")
+            w = w * 2 if w * 2 <= args.workers or w == args.workers else args.workers
+        saida["escala"] = escala
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(saida, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,6 @@
+# -*- coding: utf-8 -*-
+import sys
+from pathlib import Path
+
+# os módulos do jogo ficam na raiz do repositório
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+"""Formato binário de forca_banco: ida e volta, índices e escolha do arquivo."""
+import json
+import os
+
+import pytest
+
+from forca_banco import (FILTROS, Banco, BancoBinario, abrir_banco, caminho_binario, escrever_binario,
+                         juntar_binarios, empacotar_binario, mapa_chaves)
+from forca_motor import campos_revelacao
+from forca_normalizacao import normalizar
+
+
+def _reg(tema, exibida, nivel="A", dica="dica", esquema=2):
+    r = {"tema": tema, "palavra_exibida": exibida, "forma_normalizada": normalizar(exibida), "nivel": nivel,
+         "dica": dica}
+    if esquema == 2:
+        r.update(campos_revelacao(exibida))
+    return r
+
+
+BANCO = {
+    "versao": "9.9.9", "esquema": 2, "idioma": "pt-BR", "fonte": "teste",
+    "palavras": [
+        _reg("frutas", "MAÇÃ"), _reg("frutas", "KIWI", "B"), _reg("animais", "CAVALO-MARINHO", "C", "no mar"),
+        _reg("animais", "GATO"), _reg("escola", "GIZ DE CERA", "B", esquema=1),
+    ],
+}
+
+
+@pytest.fixture
+def binario(tmp_path):
+    caminho = tmp_path / "banco.bin"
+    escrever_binario(BANCO, caminho)
+    return BancoBinario(caminho)
+
+
+def test_ida_e_volta(binario):
+    assert (binario.versao, binario.idioma, binario.fonte) == ("9.9.9", "pt-BR", "teste")
+    assert len(binario) == len(BANCO["palavras"])
+    assert binario.temas == ["animais", "escola", "frutas"]
+    for i, it in enumerate(BANCO["palavras"]):
+        assert binario.item(i) == {**it, "id": i}
+        assert binario.chave(i) == (it["tema"], it["palavra_exibida"])
+
+
+def test_indices_por_filtro(binario):
+    for tema in binario.temas:
+        for f in FILTROS:
+            esperado = [i for i, it in enumerate(BANCO["palavras"])
+                        if it["tema"] == tema and f in ("TODOS", it["nivel"])]
+            assert list(binario.indices(tema, f)) == esperado
+    assert binario.indices("nenhum") == ()
+
+
+def test_mesma_interface_que_o_banco_em_memoria(binario):
+    memoria = Banco(BANCO["palavras"], BANCO["versao"])
+    assert memoria.temas == binario.temas
+    assert [memoria.item(i) for i in range(len(memoria))] == [binario.item(i) for i in range(len(binario))]
+    assert mapa_chaves(memoria) == mapa_chaves(binario)
+
+
+def test_campos_editados_a_mao_ficam_de_fora(tmp_path):
+    velho = _reg("frutas", "PERA")
+    editado = {**velho, "palavra_exibida": "PERU", "forma_normalizada": "PERU"}  # máscaras ainda de PERA
+    caminho = tmp_path / "b.bin"
+    escrever_binario({"palavras": [editado]}, caminho)
+    item = BancoBinario(caminho).item(0)
+    assert "mascaras" not in item and item["palavra_exibida"] == "PERU"
+
+
+def test_juntar_binarios_equivale_ao_banco_inteiro(tmp_path):
+    por_tema = {}
+    for it in BANCO["palavras"]:
+        por_tema.setdefault(it["tema"], []).append(it)
+    ordem = [it for regs in por_tema.values() for it in regs]
+    (tmp_path / "junto.bin").write_bytes(
+        juntar_binarios([empacotar_binario({"palavras": regs}) for regs in por_tema.values()], BANCO))
+    (tmp_path / "inteiro.bin").write_bytes(empacotar_binario({**BANCO, "palavras": ordem}))
+    junto, inteiro = BancoBinario(tmp_path / "junto.bin"), BancoBinario(tmp_path / "inteiro.bin")
+    assert junto.versao == inteiro.versao and junto.temas == inteiro.temas
+    assert [junto.item(i) for i in range(len(junto))] == [inteiro.item(i) for i in range(len(inteiro))]
+    assert all(list(junto.indices(t, f)) == list(inteiro.indices(t, f)) for t in junto.temas for f in FILTROS)
+
+
+def test_juntar_binarios_recusa_segmento_com_varios_temas():
+    with pytest.raises(ValueError):
+        juntar_binarios([empacotar_binario(BANCO)], BANCO)
+
+
+def test_formato_desconhecido(tmp_path):
+    caminho = tmp_path / "x.bin"
+    caminho.write_bytes(b"NAOEBANCO" + bytes(64))
+    with pytest.raises(ValueError):
+        BancoBinario(caminho)
+
+
+def test_abrir_banco_prefere_o_binario_atualizado(tmp_path):
+    caminho_json = tmp_path / "banco.json"
+    caminho_json.write_text(json.dumps(BANCO, ensure_ascii=False), encoding="utf-8")
+    assert isinstance(abrir_banco(caminho_json), Banco)
+
+    escrever_binario(BANCO, caminho_binario(caminho_json))
+    assert isinstance(abrir_banco(caminho_json), BancoBinario)
+
+    st = caminho_binario(caminho_json).stat()
+    os.utime(caminho_json, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))  # JSON editado depois
+    assert isinstance(abrir_banco(caminho_json), Banco)
+
+
+def test_abrir_banco_vazio_ou_ausente(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        abrir_banco(tmp_path / "nada.json")
+    vazio = tmp_path / "vazio.json"
+    vazio.write_text('{"palavras": []}', encoding="utf-8")
+    with pytest.raises(ValueError):
+        abrir_banco(vazio)
+
+
+def test_nivel_invalido_aponta_tema_e_palavra(tmp_path):
+    palavras = BANCO["palavras"] + [_reg("frutas", "UVA", "D")]
+    for montar in (lambda: Banco(palavras), lambda: empacotar_binario({"palavras": palavras})):
+        with pytest.raises(ValueError, match="'D' inválido em frutas/UVA"):
+            montar()
+    caminho = tmp_path / "banco.json"
+    caminho.write_text(json.dumps({"palavras": palavras}), encoding="utf-8")
+    with pytest.raises(ValueError, match="frutas/UVA"):
+        abrir_banco(caminho)
@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+"""Palavra do dia: permutação de Feistel, ciclos sem repetição e crescimento do banco."""
+import json
+import os
+from datetime import date, timedelta
+
+import pytest
+
+from forca_banco import Banco
+from forca_dia import (EPOCA, _permutar, caminho_historico, chave_do_dia, historico_do_banco, indice_do_dia,
+                       palavra_do_dia, tema_do_dia)
+
+HOJE = date(2026, 10, 18)
+
+
+def _banco(n, tema="t", caminho=None):
+    return Banco([{"tema": tema, "palavra_exibida": f"P{i:03d}"} for i in range(n)], caminho=caminho)
+
+
+def _historico(palavras=None, temas=None):
+    return {"palavras": palavras or {}, "temas": temas or {}}
+
+
+def _dias(inicio, n):
+    return [inicio + timedelta(days=k) for k in range(n)]
+
+
+@pytest.mark.parametrize("n", [1, 2, 3, 7, 16, 17, 100])
+def test_permutacao_e_bijecao(n):
+    chave = chave_do_dia()
+    assert sorted(_permutar(x, n, chave, "t|TODOS|0|n") for x in range(n)) == list(range(n))
+
+
+def test_sem_historico_segue_a_sequencia_de_tamanho_fixo():
+    banco = _banco(13)
+    for dia in _dias(HOJE, 30):
+        assert palavra_do_dia(banco, "t", dia=dia) == indice_do_dia(13, dia, "t", "TODOS")
+
+
+def test_nenhuma_palavra_repete_dentro_do_ciclo():
+    banco = _banco(11)
+    inicio = EPOCA + timedelta(days=11 * 90)  # início de um ciclo
+    for ciclo in range(3):
+        dias = _dias(inicio + timedelta(days=11 * ciclo), 11)
+        assert sorted(palavra_do_dia(banco, "t", dia=d) for d in dias) == list(range(11))
+
+
+def test_chave_e_dia_mudam_a_sequencia():
+    banco = _banco(50)
+    dias = _dias(HOJE, 10)
+    assert ([palavra_do_dia(banco, "t", dia=d) for d in dias]
+            != [palavra_do_dia(banco, "t", dia=d, chave="outra") for d in dias])
+
+
+def test_palavra_nova_so_entra_no_proximo_ciclo():
+    n = 10
+    antigo, novo = _banco(n), _banco(n + 1)
+    entra = HOJE + timedelta(days=2)
+    historico = _historico({"t|P010": entra})
+    # ciclo que contém `entra`
+    inicio = EPOCA + timedelta(days=(entra - EPOCA).days // n * n)
+    fim = inicio + timedelta(days=n)
+
+    for dia in _dias(inicio - timedelta(days=3 * n), 4 * n):  # passado e ciclo corrente
+        assert palavra_do_dia(novo, "t", dia=dia, historico=historico) == palavra_do_dia(antigo, "t", dia=dia)
+    depois = [palavra_do_dia(novo, "t", dia=d, historico=historico) for d in _dias(fim, n + 1)]
+    assert sorted(depois) == list(range(n + 1))  # o ciclo seguinte tem n + 1 dias e inclui a nova
+
+
+def test_filtro_sem_palavras_validas_ainda():
+    banco = _banco(3)
+    entra = HOJE + timedelta(days=2)
+    historico = _historico({f"t|P{i:03d}": entra for i in range(3)})
+    assert palavra_do_dia(banco, "t", dia=HOJE, historico=historico) is None
+    assert palavra_do_dia(banco, "t", dia=entra, historico=historico) is not None
+    assert palavra_do_dia(_banco(0), "t", dia=HOJE) is None
+
+
+def test_tema_novo_so_entra_no_proximo_ciclo():
+    banco = Banco([{"tema": t, "palavra_exibida": "X"} for t in ("a", "b", "c", "d")])
+    antes = Banco([{"tema": t, "palavra_exibida": "X"} for t in ("a", "c", "d")])
+    historico = _historico(temas={"b": HOJE + timedelta(days=2)})
+    for dia in _dias(HOJE - timedelta(days=9), 12):
+        assert tema_do_dia(banco, dia, historico=historico) == tema_do_dia(antes, dia)
+    assert tema_do_dia(Banco([]), HOJE) is None
+
+
+def test_historico_do_banco_le_o_arquivo_ao_lado_e_relê_quando_muda(tmp_path):
+    caminho = tmp_path / "banco.json"
+    banco = _banco(5, caminho=caminho)
+    assert historico_do_banco(banco) == _historico()
+    arquivo = caminho_historico(caminho)
+    arquivo.write_text(json.dumps({"palavras": {"t|P004": "2026-10-20"}, "temas": {}}), encoding="utf-8")
+    assert historico_do_banco(banco)["palavras"] == {"t|P004": date(2026, 10, 20)}
+    arquivo.write_text(json.dumps({"palavras": {}, "temas": {"t": "2026-10-21"}}), encoding="utf-8")
+    os.utime(arquivo, ns=(0, 1))  # mtime diferente mesmo num sistema de arquivos de resolução baixa
+    assert historico_do_banco(banco) == _historico(temas={"t": date(2026, 10, 21)})
@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+"""Log de eventos: gravação, replay pelo índice, abandono, trava e recuperação."""
+import pytest
+
+from forca_banco import Banco
+from forca_eventos import (ABANDONO, CABECALHO, FIM, INICIO, LETRA, REGISTRO, Diario, LogOcupado, caminho_indice,
+                           eventos_da_rodada, ler_cabecalho, ler_chaves, reproduzir, resumo)
+from forca_motor import Partida
+
+PALAVRAS = [{"tema": "frutas", "palavra_exibida": p, "nivel": "A", "dica": "fruta"}
+            for p in ("UVA", "KIWI", "MAÇÃ", "PERA")]
+
+
+@pytest.fixture
+def banco():
+    return Banco(PALAVRAS, "1.0.0")
+
+
+@pytest.fixture
+def log(tmp_path):
+    return tmp_path / "eventos.bin"
+
+
+def _jogar(diario, banco, i, letras):
+    p = Partida(banco.item(i))
+    r = diario.rodada(p)
+    for c in letras:
+        r.letra(c, p.tentar_letra(c))
+    return r, p
+
+
+def test_replay_refaz_a_partida(log, banco):
+    with Diario(log, banco.versao) as d:
+        _, partida = _jogar(d, banco, 2, "XAMÇ")
+    eventos = eventos_da_rodada(log, 1)
+    assert [e[3] for e in eventos] == [INICIO, LETRA, LETRA, LETRA, LETRA, FIM]
+    *_, (_, refeita) = reproduzir(banco, eventos, ler_chaves(log))
+    assert refeita.reveladas == partida.reveladas and refeita.resultado is True and refeita.erros == 1
+    assert ler_cabecalho(log) == "1.0.0"
+    assert resumo(log) == (6, 1)
+
+
+def test_rodadas_intercaladas(log, banco):
+    with Diario(log) as d:
+        a, pa = _jogar(d, banco, 0, "U")
+        b, pb = _jogar(d, banco, 1, "K")
+        for c in "VA":
+            a.letra(c, pa.tentar_letra(c))
+        for c in "IW":
+            b.letra(c, pb.tentar_letra(c))
+    assert [e[3] for e in eventos_da_rodada(log, 1)] == [INICIO, LETRA, LETRA, LETRA, FIM]
+    assert {e[0] for e in eventos_da_rodada(log, 2)} == {2}
+    with pytest.raises(KeyError):
+        eventos_da_rodada(log, 3)
+
+
+def test_rodada_largada_termina_em_abandono(log, banco):
+    with Diario(log) as d:
+        r, _ = _jogar(d, banco, 0, "X")
+        r.abandonar()
+        r.abandonar()  # só uma vez
+        _jogar(d, banco, 1, "KIW")
+        aberta, _ = _jogar(d, banco, 3, "P")  # sem fim: o fechar() abandona
+    assert [e[3] for e in eventos_da_rodada(log, 1)] == [INICIO, LETRA, ABANDONO]
+    assert eventos_da_rodada(log, 3)[-1][3] == ABANDONO
+    # rodada terminada não ganha abandono
+    assert [e[3] for e in eventos_da_rodada(log, 2)][-1] == FIM
+
+
+def test_um_escritor_por_log(log, banco):
+    with Diario(log):
+        with pytest.raises(LogOcupado):
+            Diario(log)
+    with Diario(log):  # fechado, o log volta a ficar livre
+        pass
+
+
+def test_reabrir_continua_a_numeracao_e_descarta_registro_pela_metade(log, banco):
+    with Diario(log) as d:
+        _jogar(d, banco, 0, "UVA")
+    with open(log, "ab") as f:
+        f.write(b"\x01\x02\x03")  # queda no meio de um registro
+    caminho_indice(log).write_bytes(b"")  # índice perdido
+    with Diario(log) as d:
+        r, _ = _jogar(d, banco, 1, "KIW")
+        assert r.id == 2
+    assert (log.stat().st_size - CABECALHO.size) % REGISTRO.size == 0
+    assert eventos_da_rodada(log, 1)[-1][3] == FIM
+    assert eventos_da_rodada(log, 2)[0][1] == 1  # código da segunda palavra do log
+
+
+def test_replay_com_banco_regerado_usa_a_chave(log, banco):
+    with Diario(log) as d:
+        _jogar(d, banco, 2, "MAÇ")
+    regerado = Banco(list(reversed(PALAVRAS)) + [{"tema": "frutas", "palavra_exibida": "FIGO"}])
+    *_, (_, p) = reproduzir(regerado, eventos_da_rodada(log, 1), ler_chaves(log))
+    assert p.exibida == "MAÇÃ" and p.resultado is True
+    sem_maca = Banco([it for it in PALAVRAS if it["palavra_exibida"] != "MAÇÃ"])
+    with pytest.raises(ValueError):
+        list(reproduzir(sem_maca, eventos_da_rodada(log, 1), ler_chaves(log)))
+
+
+def test_troca_de_banco_anota_a_versao(log, banco):
+    with Diario(log, "1.0.0") as d:
+        _jogar(d, banco, 0, "U")
+        d.trocar_banco("1.1.0")
+        assert ler_cabecalho(log) == "1.1.0"
+        assert resumo(log)[0] == 2  # o buffer desceu antes da troca
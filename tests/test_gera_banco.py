@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+"""Build incremental de gera_banco (rodado numa pasta temporária)."""
+import json
+from datetime import date
+
+import pytest
+
+import gera_banco
+from forca_banco import BancoBinario, FILTROS
+from forca_dia import EPOCA, MARGEM
+
+
+@pytest.fixture
+def pasta(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    gera_banco.main(["--completo"])
+    return tmp_path
+
+
+def _trocar_cores(monkeypatch, palavras):
+    monkeypatch.setitem(gera_banco.palavras_por_tema, "cores", palavras)
+
+
+def _saidas(pasta):
+    return {p: (pasta / p).read_bytes()
+            for p in ("banco_palavras.json", "banco_palavras.bin", "docs/banco/manifesto.json")}
+
+
+def test_sem_mudancas_pula_o_build(pasta, capsys):
+    capsys.readouterr()
+    gera_banco.main([])
+    assert "Nenhum tema mudou" in capsys.readouterr().out
+
+
+def test_build_que_falha_nao_marca_o_tema_como_pronto(pasta, monkeypatch, capsys):
+    _trocar_cores(monkeypatch, gera_banco.palavras_por_tema["cores"] + ["ROXO"])
+    for _ in range(2):  # o segundo build tem que tentar de novo, não pular
+        with pytest.raises(AssertionError):
+            gera_banco.main([])
+    assert "ROXO" not in (pasta / "banco_palavras.json").read_text(encoding="utf-8")
+
+    _trocar_cores(monkeypatch, ["AZUL", "VERMELHO", "VERDE", "AMARELO", "ROXO"])
+    capsys.readouterr()
+    gera_banco.main([])
+    assert "Temas remontados: cores" in capsys.readouterr().out
+    dados = json.loads((pasta / "banco_palavras.json").read_text(encoding="utf-8"))
+    assert "ROXO" in {p["palavra_exibida"] for p in dados["palavras"]}
+
+
+def test_incremental_so_remonta_o_que_mudou_e_bate_com_o_completo(pasta, monkeypatch):
+    _trocar_cores(monkeypatch, ["AZUL", "VERMELHO", "VERDE", "AMARELO", "ROXO"])
+    montados = []
+    original = gera_banco.montar_tema
+    monkeypatch.setattr(gera_banco, "montar_tema", lambda t: montados.append(t) or original(t))
+    gera_banco.main([])
+    assert montados == ["cores"]
+    incremental = _saidas(pasta)
+
+    gera_banco.main(["--completo"])
+    assert _saidas(pasta) == incremental
+
+
+def test_saida_editada_e_regravada(pasta, capsys):
+    json_ = pasta / "banco_palavras.json"
+    original = json_.read_bytes()
+    json_.write_bytes(original.replace(b"GATO", b"GATA"))
+    gera_banco.main([])
+    assert json_.read_bytes() == original
+
+
+def test_binario_juntado_bate_com_o_json(pasta):
+    dados = json.loads((pasta / "banco_palavras.json").read_text(encoding="utf-8"))
+    banco = BancoBinario(pasta / "banco_palavras.bin")
+    assert banco.versao == dados["versao"] and len(banco) == len(dados["palavras"])
+    for i, item in enumerate(dados["palavras"]):
+        assert banco.item(i) == {**item, "id": i}
+    for tema in banco.temas:
+        for f in FILTROS:
+            esperado = [i for i, it in enumerate(dados["palavras"])
+                        if it["tema"] == tema and f in ("TODOS", it["nivel"])]
+            assert list(banco.indices(tema, f)) == esperado
+
+
+def test_historico_do_dia_mantem_as_datas_e_data_as_novas(pasta, monkeypatch):
+    arquivo = pasta / "banco_palavras.dia.json"
+    primeiro = json.loads(arquivo.read_text(encoding="utf-8"))
+    assert set(primeiro["palavras"].values()) == set(primeiro["temas"].values()) == {EPOCA.isoformat()}
+
+    _trocar_cores(monkeypatch, ["AZUL", "VERMELHO", "VERDE", "AMARELO", "ROXO"])
+    gera_banco.main([])
+    historico = json.loads(arquivo.read_text(encoding="utf-8"))
+    novas = {k: d for k, d in historico["palavras"].items() if k not in primeiro["palavras"]}
+    assert novas == {"cores|ROXO": (date.today() + MARGEM).isoformat()}
+    assert all(historico["palavras"].get(k, d) == d for k, d in primeiro["palavras"].items())
+    web = json.loads((pasta / "docs/banco/manifesto.json").read_text(encoding="utf-8"))
+    assert web["dia"] == {"palavras": novas, "temas": {}}
+
+
+def _niveis(pasta):
+    dados = json.loads((pasta / "banco_palavras.json").read_text(encoding="utf-8"))
+    return {(p["tema"], p["palavra_exibida"]): p["nivel"] for p in dados["palavras"]}
+
+
+def test_fonte_do_nivel_vale_para_os_builds_seguintes(pasta):
+    heuristico = _niveis(pasta)
+    gera_banco.main(["--nivel-por-simulacao", "--estrategias", "frequencia", "--workers", "1"])
+    simulado = _niveis(pasta)
+    assert simulado != heuristico
+
+    gera_banco.main([])  # sem opção: continua pela simulação, com as pontuações do cache
+    assert _niveis(pasta) == simulado
+    gera_banco.main(["--nivel-heuristico"])
+    assert _niveis(pasta) == heuristico
+
+
+def test_cache_de_pontuacao_depende_das_palavras_do_tema():
+    lista = [{"tema": "t", "palavra_exibida": p, "forma_normalizada": p} for p in ("GATO", "PATO")]
+    antes = gera_banco.hash_contexto(lista)
+    depois = gera_banco.hash_contexto(lista + [{"tema": "t", "palavra_exibida": "RATO", "forma_normalizada": "RATO"}])
+    outro = gera_banco.hash_contexto(lista + [{"tema": "u", "palavra_exibida": "RATO", "forma_normalizada": "RATO"}])
+    assert antes["t"] != depois["t"] and antes["t"] == outro["t"]
+    r = lista[0]
+    assert (gera_banco.hash_palavra(r, ["frequencia"], antes["t"])
+            != gera_banco.hash_palavra(r, ["frequencia"], depois["t"]))
+
+
+def test_palavra_repetida_no_tema_entra_uma_vez(pasta, monkeypatch, capsys):
+    monkeypatch.setitem(gera_banco.palavras_por_tema, "cores", ["AZUL", "VERMELHO", "VERDE", "AMARELO", "Azul"])
+    registros = gera_banco.montar_tema("cores")
+    assert [r["palavra_exibida"] for r in registros] == ["AZUL", "VERMELHO", "VERDE", "AMARELO"]
+    assert "cores/AZUL repetida" in capsys.readouterr().out
+
+
+def test_banco_gerado_nao_repete_chave(pasta):
+    banco = BancoBinario(pasta / "banco_palavras.bin")
+    chaves = [banco.chave(i) for i in range(len(banco))]
+    assert len(chaves) == len(set(chaves)) == 200
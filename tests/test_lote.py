@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+"""Modo lote do forca_prototipo: roteiros, palavra do dia e opções recusadas."""
+import io
+import json
+import subprocess
+import sys
+from datetime import date
+from pathlib import Path
+
+import pytest
+
+import forca_prototipo
+from forca_dia import palavra_do_dia
+
+RAIZ = Path(__file__).resolve().parent.parent
+DIA = date(2026, 10, 18)
+
+
+@pytest.fixture(autouse=True)
+def na_raiz(monkeypatch):
+    monkeypatch.chdir(RAIZ)  # carregar_banco lê banco_palavras.json da pasta atual
+
+
+def _lote(texto, **kw):
+    saida = io.StringIO()
+    forca_prototipo.modo_lote(io.StringIO(texto), saida, semente=1, **kw)
+    return [json.loads(linha) for linha in saida.getvalue().splitlines()]
+
+
+def test_roteiro_com_palavra_fixa_e_linha_invalida():
+    linhas = _lote('{"tema": "animais", "palpites": ["g", "a", "t", "o"], "palavra": "gato"}\nanimais\n')
+    assert linhas[0]["palavra"] == "GATO" and linhas[0]["resultado"] is True
+    assert linhas[1]["linha"] == 2 and "erro" in linhas[1]
+
+
+def test_lote_com_dia_usa_a_palavra_do_dia():
+    banco = forca_prototipo.carregar_banco()
+    esperado = banco.item(palavra_do_dia(banco, "animais", "A", DIA))["palavra_exibida"]
+    assert [r["palavra"] for r in _lote("animais A\nanimais A\n", dia=DIA)] == [esperado, esperado]
+
+
+def test_lote_recusa_opcoes_que_ignoraria():
+    r = subprocess.run([sys.executable, "forca_prototipo.py", "--lote", "-", "--jogador", "ana"],
+                       cwd=RAIZ, input="", capture_output=True, text=True)
+    assert r.returncode == 1 and "--jogador" in r.stdout
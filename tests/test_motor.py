@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+"""Partida (forca_motor): mesmas regras com e sem os campos do esquema 2."""
+import pytest
+
+from forca_motor import (ACERTO, ERRO, ERROS_PARA_DICA, INVALIDA, MAX_ERROS, REPETIDA, Partida,
+                         campos_revelacao, mapear_posicoes)
+from forca_normalizacao import normalizar
+
+
+def _item(exibida, esquema=2, **extra):
+    it = {"tema": "t", "palavra_exibida": exibida, "dica": "uma dica", **extra}
+    if esquema == 2:
+        it.update(forma_normalizada=normalizar(exibida),
+                  **campos_revelacao(exibida))
+    return it
+
+
+@pytest.fixture(params=[1, 2], ids=["esquema1", "esquema2"])
+def esquema(request):
+    return request.param
+
+
+def test_tabuleiro_inicial_revela_espaco_e_hifen(esquema):
+    p = Partida(_item("GIZ DE CERA", esquema))
+    assert "".join(p.reveladas) == "___ __ ____"
+    p = Partida(_item("CARRINHO-DE-MÃO", esquema))
+    assert "".join(p.reveladas) == "________-__-___"
+    assert p.alvo == "CARRINHODEMAO"
+
+
+def test_letra_sem_acento_revela_as_posicoes_acentuadas(esquema):
+    p = Partida(_item("MAÇÃ", esquema))
+    assert p.tentar_letra("a") == ACERTO
+    assert "".join(p.reveladas) == "_A_Ã"
+    assert p.tentar_letra("ç") == ACERTO
+    assert "".join(p.reveladas) == "_AÇÃ"
+    assert p.padrao() == "_ACA"
+
+
+def test_invalida_repetida_e_erro(esquema):
+    p = Partida(_item("GATO", esquema))
+    assert p.tentar_letra("1") == INVALIDA
+    assert p.tentar_letra("ab") == INVALIDA
+    assert p.tentar_letra("") == INVALIDA
+    assert p.tentar_letra("X") == ERRO
+    assert p.tentar_letra("x") == REPETIDA
+    assert p.erros == 1 and p.tentadas == {"X"}
+
+
+def test_vitoria_ao_revelar_tudo(esquema):
+    p = Partida(_item("QUEBRA-CABEÇA", esquema))
+    for letra in "QUEBRAC":  # C revela o Ç
+        assert not p.terminada
+        p.tentar_letra(letra)
+    assert p.resultado is True
+    assert "".join(p.reveladas) == "QUEBRA-CABEÇA"
+
+
+def test_derrota_no_limite_de_erros(esquema):
+    p = Partida(_item("SOL", esquema))
+    for letra in "ABCDEF"[:MAX_ERROS]:
+        assert p.tentar_letra(letra) == ERRO
+    assert p.resultado is False and p.erros == MAX_ERROS
+
+
+def test_limite_de_erros_configuravel(esquema):
+    p = Partida(_item("SOL", esquema), max_erros=2)
+    p.tentar_letra("A")
+    p.tentar_letra("B")
+    assert p.resultado is False
+
+
+def test_chute(esquema):
+    p = Partida(_item("LEÃO", esquema))
+    assert p.chutar("leao") is True and p.resultado is True
+    p = Partida(_item("LEÃO", esquema))
+    assert p.chutar("LEOA") is False and p.erros == 1 and not p.terminada
+
+
+def test_dica_aparece_sozinha_depois_de_alguns_erros(esquema):
+    p = Partida(_item("UVA", esquema))
+    assert not p.dica_visivel
+    for letra in "BCDEFG"[:ERROS_PARA_DICA]:
+        p.tentar_letra(letra)
+    assert p.dica_visivel and p.dica == "uma dica"
+    p = Partida(_item("UVA", esquema))
+    p.pedir_dica()
+    assert p.dica_visivel
+
+
+def test_campos_revelacao_batem_com_o_mapa():
+    campos = campos_revelacao("PÊSSEGO")
+    posicoes, alvo, normas = mapear_posicoes("PÊSSEGO")
+    assert campos["letras"] == "EGOPS"
+    assert dict(zip(campos["letras"], campos["mascaras"])) == posicoes
+    assert campos["modelo"] == "_______"
+    assert alvo == (1 << 7) - 1 and "".join(normas) == "PESSEGO"
+
+
+def test_mesma_sequencia_mesmo_estado_nos_dois_esquemas():
+    palpites = "EAOSRXZTUIÇ"
+    estados = []
+    for esquema in (1, 2):
+        p = Partida(_item("CORAÇÃO", esquema))
+        estados.append([(p.tentar_letra(c), "".join(p.reveladas), p.erros, p.resultado) for c in palpites])
+    assert estados[0] == estados[1]
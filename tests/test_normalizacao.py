@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+"""Paridade de forca_normalizacao com a normalização NFKD original."""
+import json
+import random
+import unicodedata
+from pathlib import Path
+
+import pytest
+
+from forca_normalizacao import LIMITE_TABELA, normalizar, normalizar_lote, normalizar_nfkd, _normalizar
+
+BANCO = Path(__file__).resolve().parent.parent / "banco_palavras.json"
+
+LATIN1 = [chr(cp) for cp in range(0x100)]
+TABELA = [chr(cp) for cp in range(LIMITE_TABELA)]
+MARCAS = [chr(cp) for cp in range(0x300, 0x370)] + ["᪰", "᷀", "⃐", "︠"]
+LIGADURAS = ["ﬀ", "ﬁ", "ﬂ", "ﬃ", "ﬄ", "ﬅ", "ﬆ", "Æ", "æ", "Œ", "œ", "ß", "Ĳ", "ĳ", "Ǆ", "ǅ", "ǆ", "Ǉ", "ǌ",
+             "ŉ", "ſ", "ẞ", "™", "№", "Ⅻ", "ⅻ", "½", "²", "ª", "º", "ｆｕｌｌ"]
+
+
+def _banco():
+    return [it["palavra_exibida"] for it in json.loads(BANCO.read_text(encoding="utf-8"))["palavras"]]
+
+
+def _todos_os_caracteres():
+    return [chr(cp) for cp in range(0x110000) if not 0xD800 <= cp <= 0xDFFF]
+
+
+def test_latin1_e_tabela_caractere_a_caractere():
+    for ch in TABELA:
+        assert normalizar(ch) == normalizar_nfkd(ch), hex(ord(ch))
+
+
+def test_todo_o_unicode_caractere_a_caractere():
+    divergentes = [hex(ord(ch)) for ch in _todos_os_caracteres() if _normalizar(ch) != normalizar_nfkd(ch)]
+    assert divergentes == []
+
+
+@pytest.mark.parametrize("marca", MARCAS)
+def test_marcas_combinantes_soltas_e_depois_de_letras(marca):
+    for texto in (marca, "A" + marca, "c" + marca + "ao", "Ç" + marca + marca, "É" + marca + "-" + marca):
+        assert normalizar(texto) == normalizar_nfkd(texto)
+        assert normalizar_lote([texto, texto]) == [normalizar_nfkd(texto)] * 2
+
+
+@pytest.mark.parametrize("ligadura", LIGADURAS)
+def test_ligaduras_e_compatibilidade(ligadura):
+    for texto in (ligadura, "X" + ligadura + "Y", ligadura.lower()):
+        assert normalizar(texto) == normalizar_nfkd(texto)
+        assert normalizar_lote([texto]) == [normalizar_nfkd(texto)]
+
+
+def test_palavras_do_banco():
+    palavras = _banco()
+    esperado = [normalizar_nfkd(p) for p in palavras]
+    assert [normalizar(p) for p in palavras] == esperado
+    assert normalizar_lote(palavras) == esperado
+    assert normalizar_lote(iter(palavras)) == esperado  # fluxo, não só lista
+
+
+def test_caminho_do_lru_devolve_o_mesmo_resultado():
+    palavras = _banco() + LIGADURAS + ["GIZ DE CERA", "carrinho-de-mão"]
+    normalizar.cache_clear()
+    frio = [normalizar(p) for p in palavras]
+    antes = normalizar.cache_info().hits
+    quente = [normalizar(p) for p in palavras]
+    assert normalizar.cache_info().hits - antes == len(palavras)
+    assert frio == quente == [normalizar_nfkd(p) for p in palavras]
+
+
+def test_lote_com_o_separador_dentro_da_palavra():
+    palavras = ["A\x00B", "MAÇÃ", "", "\x00"]
+    assert normalizar_lote(palavras) == [normalizar_nfkd(p) for p in palavras]
+    assert normalizar_lote([]) == []
+
+
+def test_textos_aleatorios():
+    rng = random.Random(0)
+    todos = _todos_os_caracteres()
+    fontes = (TABELA + MARCAS + [" ", "-"], todos)
+    textos = ["".join(rng.choice(fontes[rng.random() < 0.2]) for _ in range(rng.randint(0, 12)))
+              for _ in range(20_000)]
+    esperado = [normalizar_nfkd(t) for t in textos]
+    assert [normalizar(t) for t in textos] == esperado
+    assert normalizar_lote(textos) == esperado
+
+
+def test_referencia_e_a_nfkd_original():
+    # guarda a própria referência: NFKD, sem marcas, upper, só A-Z
+    for texto in ("Pêssego", "ﬁm", "Ærø", "Straße", "GIZ DE CERA"):
+        nfkd = "".join(c for c in unicodedata.normalize("NFKD", texto) if not unicodedata.combining(c))
+        assert normalizar_nfkd(texto) == "".join(c for c in nfkd.upper() if "A" <= c <= "Z")
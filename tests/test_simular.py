@@ -0,0 +1,35 @@
+# -*- coding: utf-8 -*-
+"""Estratégias do simulador quando não sobra letra para tentar."""
+import random
+from types import SimpleNamespace
+
+from forca_banco import Banco
+from forca_candidatos import LETRAS
+from simular import Aleatoria, Frequencia, _somar, jogar_sem_tela
+
+ITEM = {"tema": "t", "palavra_exibida": "GATO", "forma_normalizada": "GATO", "nivel": "A", "dica": ""}
+
+
+def test_estrategias_sem_letras_devolvem_none():
+    banco = Banco([ITEM])
+    partida = SimpleNamespace(tentadas=set(LETRAS), item=ITEM, padrao=lambda: "____")
+    assert Aleatoria(banco, random.Random(0))(partida) is None
+    assert Frequencia(banco, random.Random(0))(partida) is None
+
+
+def test_partida_esgotada_termina_sem_resultado():
+    palpites = iter("XYZ")
+    venceu, erros, _ = jogar_sem_tela(ITEM, lambda partida: next(palpites, None), max_erros=26)
+    assert venceu is None and erros == 3
+
+
+def test_aleatoria_com_limite_alto_sempre_termina():
+    estrategia = Aleatoria(Banco([ITEM]), random.Random(0))
+    for _ in range(50):
+        assert jogar_sem_tela(ITEM, estrategia, max_erros=len(LETRAS))[0] is True
+
+
+def test_somar_acumula_esgotadas():
+    total = {"t/A": {"jogos": 1, "vitorias": 0, "esgotadas": 1, "dicas": 0, "erros": [1, 0]}}
+    _somar(total, {"t/A": {"jogos": 2, "vitorias": 1, "esgotadas": 1, "dicas": 1, "erros": [1, 1]}})
+    assert total["t/A"] == {"jogos": 3, "vitorias": 1, "esgotadas": 2, "dicas": 1, "erros": [2, 1]}
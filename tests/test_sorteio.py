@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+"""Sorteador: sacolas sem repetição por filtro, evitar, estado e troca de banco."""
+from forca_banco import Banco
+from forca_sorteio import TENTATIVAS_EVITAR, Sorteador
+
+
+def _banco(n=30, tema="t", extra=()):
+    palavras = [{"tema": tema, "palavra_exibida": f"P{i:03d}", "nivel": "ABC"[i % 3]} for i in range(n)]
+    return Banco(palavras + list(extra))
+
+
+def test_nao_repete_ate_esvaziar_a_sacola():
+    banco = _banco()
+    s = Sorteador(banco, semente=1)
+    for _ in range(3):  # três ciclos seguidos
+        ciclo = [s.sortear("t") for _ in range(len(banco))]
+        assert sorted(ciclo) == list(range(len(banco)))
+
+
+def test_filtro_por_nivel_e_filtro_vazio():
+    banco = _banco()
+    s = Sorteador(banco, semente=2)
+    ids = [s.sortear("t", "B") for _ in range(10)]
+    assert sorted(ids) == sorted(banco.indices("t", "B"))
+    assert s.sortear("t", "X") is None and s.sortear("outro") is None
+
+
+def test_restantes_acompanha_a_sacola():
+    s = Sorteador(_banco(), semente=3)
+    assert s.restantes("t") == 30
+    s.sortear("t")
+    s.sortear("t")
+    assert s.restantes("t") == 28
+
+
+def test_evitar_prefere_nao_vistas_e_devolve_as_puladas():
+    banco = _banco()
+    vistas = set(range(0, 30, 2))  # metade vista
+    s = Sorteador(banco, semente=4)
+    escolhidos = [s.sortear("t", evitar=vistas.__contains__) for _ in range(15)]
+    assert sum(i in vistas for i in escolhidos) <= 1  # 8 tiradas extras: quase sempre acha uma nova
+    # as puladas continuam na sacola: o ciclo ainda fecha sem repetir
+    resto = [s.sortear("t") for _ in range(s.restantes("t"))]
+    assert sorted(escolhidos + resto) == list(range(30))
+
+
+def test_evitar_tudo_visto_e_limitado():
+    chamadas = []
+
+    def evitar(i):
+        chamadas.append(i)
+        return True
+
+    s = Sorteador(_banco(), semente=5)
+    assert s.sortear("t", evitar=evitar) is not None
+    assert len(chamadas) == TENTATIVAS_EVITAR + 1
+    assert s.restantes("t") == 29  # só a escolhida saiu
+
+
+def test_estado_salvo_repete_a_sequencia(tmp_path):
+    banco = _banco()
+    s = Sorteador(banco, semente=6)
+    [s.sortear("t") for _ in range(7)]
+    s.salvar(tmp_path / "s.json")
+    seguintes = [s.sortear("t") for _ in range(40)]
+    outro = Sorteador(banco)
+    assert outro.carregar(tmp_path / "s.json")
+    assert [outro.sortear("t") for _ in range(40)] == seguintes
+    assert not Sorteador(banco).carregar(tmp_path / "nada.json")
+
+
+def test_troca_de_banco_mantem_fora_o_que_ja_saiu():
+    antigo = _banco(10)
+    s = Sorteador(antigo, semente=7)
+    sairam = {antigo.chave(s.sortear("t")) for _ in range(4)}
+    # banco regerado: outra ordem, duas palavras novas
+    novas = [{"tema": "t", "palavra_exibida": f"N{i}", "nivel": "A"} for i in range(2)]
+    novo = Banco(novas + [antigo.item(i) for i in reversed(range(10))])
+    s.trocar_banco(novo)
+    resto = {novo.chave(s.sortear("t")) for _ in range(s.restantes("t"))}
+    assert len(resto) == 8
+    assert not resto & sairam
+    assert {("t", "N0"), ("t", "N1")} <= resto
@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+"""Arquivos estáticos de forca_web: negociação do Accept-Encoding e cache."""
+import gzip
+
+import pytest
+
+from forca_banco import Banco
+from forca_web import Jogo, Servidor, codificacoes_aceitas, escolher_codificacao
+
+CORPO = b'{"tema":"frutas"}'
+
+
+@pytest.fixture
+def servidor(tmp_path):
+    pasta = tmp_path / "docs"
+    (pasta / "banco").mkdir(parents=True)
+    shard = pasta / "banco" / "frutas.0123456789ab.json"
+    shard.write_bytes(CORPO)
+    shard.with_name(shard.name + ".gz").write_bytes(gzip.compress(CORPO))
+    (pasta / "index.html").write_text("<html></html>", encoding="utf-8")
+    jogo = Jogo(Banco([{"tema": "frutas", "palavra_exibida": "UVA"}]))
+    return Servidor(jogo, pasta)
+
+
+def _get(servidor, aceita, caminho="/banco/frutas.0123456789ab.json"):
+    status, corpo, tipo, extras = servidor.atender("GET", caminho, b"", aceita)
+    assert status == 200
+    codificacao = next((l.split(": ", 1)[1] for l in extras.splitlines() if l.startswith("Content-Encoding")),
+                       None)
+    return corpo, codificacao
+
+
+def test_pesos_do_accept_encoding():
+    assert codificacoes_aceitas("gzip, br;q=0.5, deflate;q=0") == {"gzip": 1.0, "br": 0.5, "deflate": 0.0}
+    assert escolher_codificacao("br;q=0.5, gzip", ("br", "gzip")) == "gzip"
+    assert escolher_codificacao("br, gzip", ("br", "gzip")) == "br"
+    assert escolher_codificacao("gzip;q=0, *", ("br", "gzip")) == "br"
+    assert escolher_codificacao("*;q=0", ("gzip",)) is None
+    assert escolher_codificacao("xgzip", ("gzip",)) is None  # não é substring
+
+
+def test_codificacao_servida_e_a_que_existe(servidor):
+    # sem .br no disco: cliente "br, gzip" recebe gzip, marcado como gzip
+    assert _get(servidor, "br, gzip") == (gzip.compress(CORPO), "gzip")
+    # e o cache não entrega esse corpo como br a quem só aceita br
+    assert _get(servidor, "br") == (CORPO, None)
+    assert _get(servidor, "gzip") == (gzip.compress(CORPO), "gzip")
+
+
+def test_q_zero_recusa(servidor):
+    assert _get(servidor, "gzip;q=0") == (CORPO, None)
+    assert _get(servidor, "gzip;q=0.0, br") == (CORPO, None)
+    assert _get(servidor, "") == (CORPO, None)
+
+
+def test_cabecalhos_de_cache(servidor):
+    _, _, _, extras = servidor.atender("GET", "/banco/frutas.0123456789ab.json", b"", "")
+    assert "immutable" in extras and "Vary: Accept-Encoding" in extras
+    _, _, _, extras = servidor.atender("GET", "/", b"", "gzip")
+    assert "no-cache" in extras and "Content-Encoding" not in extras and "Vary" not in extras
+
+
+def test_fora_da_pasta(servidor):
+    status, *_ = servidor.atender("GET", "/../segredo.txt", b"", "")
+    assert status == 404